@@ -4,4 +4,6 @@ API客户端模块
 
 # API模块已简化，直接使用config中的配置
 
-__all__ = []
+from .http import get_session
+
+__all__ = ['get_session']
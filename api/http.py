@@ -0,0 +1,34 @@
+"""
+HTTP 会话
+所有 API 调用共用一个带连接池的 requests 会话，复用 TCP/TLS 连接
+"""
+
+import threading
+from typing import Optional
+import requests
+from requests.adapters import HTTPAdapter
+
+# 连接池大小（同一主机保持的长连接数）
+POOL_MAXSIZE = 4
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """
+    获取共享的 HTTP 会话（首次调用时创建）
+    
+    Returns:
+        requests 会话
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=POOL_MAXSIZE, pool_maxsize=POOL_MAXSIZE)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                _session = session
+    return _session
@@ -2,14 +2,30 @@
 核心功能模块
 """
 
-from .video_analyzer import VideoAnalyzer
-from .scene_detector import SceneDetector
-from .keyframe_extractor import KeyframeExtractor
-from .subtitle_extractor import SubtitleExtractor
-from .script_generator import ScriptGenerator
-from .tts_engine import TTSEngine
-from .video_processor import VideoProcessor
-from .project_manager import ProjectManager
+import importlib
+
+# 类名 -> 所在子模块（首次访问时才导入，避免启动时加载 Whisper/Gemini/OpenCV 等重量级依赖）
+_LAZY_EXPORTS = {
+    'VideoAnalyzer': 'video_analyzer',
+    'SceneDetector': 'scene_detector',
+    'KeyframeExtractor': 'keyframe_extractor',
+    'SubtitleExtractor': 'subtitle_extractor',
+    'ScriptGenerator': 'script_generator',
+    'TTSEngine': 'tts_engine',
+    'VideoProcessor': 'video_processor',
+    'ProjectManager': 'project_manager',
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     'VideoAnalyzer',
@@ -21,4 +37,3 @@ __all__ = [
     'VideoProcessor',
     'ProjectManager',
 ]
-
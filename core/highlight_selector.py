@@ -3,9 +3,9 @@
 从场景中筛选出精彩片段
 """
 
-import json
 from typing import List, Dict
 from utils.logger import get_logger
+from utils.file_utils import write_json
 
 logger = get_logger(__name__)
 
@@ -182,8 +182,7 @@ class HighlightSelector:
     def save_selected_scenes(self, selected_scenes: List[Dict], output_path: str):
         """保存筛选结果"""
         try:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(selected_scenes, f, ensure_ascii=False, indent=2)
+            write_json(output_path, selected_scenes)
             
             logger.info(f"✅ 筛选结果已保存: {output_path}")
         except Exception as e:
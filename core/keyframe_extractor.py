@@ -5,6 +5,7 @@
 
 import cv2
 import numpy as np
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import List, Dict, Optional, Tuple
 from pathlib import Path
 import hashlib
@@ -14,6 +15,12 @@ import config
 
 logger = get_logger(__name__)
 
+# 目标帧在当前读取位置之后不超过此帧数时顺序跳过（grab 只解码不取图），不重新定位
+GRAB_FORWARD_LIMIT = 60
+
+# 关键帧图片写入线程数（JPEG 编码与磁盘写入和后续镜头的解码并行）
+IMAGE_WRITE_WORKERS = 4
+
 
 class KeyframeExtractor:
     """关键帧提取器"""
@@ -47,7 +54,8 @@ class KeyframeExtractor:
                 scenes: List[Dict],
                 output_dir: Optional[str] = None,
                 prefix: str = '',
-                progress_callback: Optional[callable] = None) -> List[Dict]:
+                progress_callback: Optional[callable] = None,
+                scene_callback: Optional[callable] = None) -> List[Dict]:
         """
         提取关键帧
         
@@ -57,6 +65,7 @@ class KeyframeExtractor:
             output_dir: 输出目录（如果需要保存图片）
             prefix: 文件名前缀
             progress_callback: 进度回调
+            scene_callback: 单个镜头完成回调，参数为 (镜头ID, 该镜头的关键帧列表)
             
         Returns:
             关键帧列表，每个包含scene_id, time, frame_number, image_path等
@@ -79,16 +88,28 @@ class KeyframeExtractor:
             if output_dir:
                 Path(output_dir).mkdir(parents=True, exist_ok=True)
             
-            for i, scene in enumerate(scenes):
-                # 提取该镜头的关键帧
-                keyframes = self._extract_from_scene(
-                    cap, scene, fps, output_dir, prefix
-                )
-                all_keyframes.extend(keyframes)
+            with ThreadPoolExecutor(max_workers=IMAGE_WRITE_WORKERS,
+                                    thread_name_prefix="keyframe-writer") as writer:
+                # 上一个镜头：图片写完后再回调，期间继续解码下一个镜头
+                pending = None
+                
+                for i, scene in enumerate(scenes):
+                    # 提取该镜头的关键帧
+                    keyframes, writes = self._extract_from_scene(
+                        cap, scene, fps, output_dir, prefix, writer
+                    )
+                    all_keyframes.extend(keyframes)
+                    
+                    if pending:
+                        self._finish_scene(*pending, scene_callback)
+                    pending = (scene['id'], keyframes, writes)
+                    
+                    if progress_callback:
+                        progress = (i + 1) / len(scenes) * 100
+                        progress_callback(progress)
                 
-                if progress_callback:
-                    progress = (i + 1) / len(scenes) * 100
-                    progress_callback(progress)
+                if pending:
+                    self._finish_scene(*pending, scene_callback)
             
             cap.release()
             
@@ -102,8 +123,14 @@ class KeyframeExtractor:
     def _extract_from_scene(self, cap: cv2.VideoCapture, 
                            scene: Dict, fps: float,
                            output_dir: Optional[str],
-                           prefix: str = '') -> List[Dict]:
-        """从单个镜头中提取关键帧"""
+                           prefix: str = '',
+                           writer: Optional[ThreadPoolExecutor] = None) -> Tuple[List[Dict], List[Future]]:
+        """
+        从单个镜头中提取关键帧
+        
+        Returns:
+            (关键帧列表, 图片写入任务列表)；没有 writer 时图片同步写入，任务列表为空
+        """
         
         # ✅ 兼容两种ID格式
         scene_id = scene.get('selected_id') or scene.get('id')
@@ -142,10 +169,9 @@ class KeyframeExtractor:
         candidates = []
         for time_sec in sample_times:
             frame_number = int(time_sec * fps)
-            cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
-            ret, frame = cap.read()
+            frame = self._read_frame_at(cap, frame_number)
             
-            if not ret:
+            if frame is None:
                 continue
             
             # 评估帧质量
@@ -167,6 +193,7 @@ class KeyframeExtractor:
         
         # 保存并生成结果
         keyframes = []
+        writes = []
         for idx, candidate in enumerate(selected):
             keyframe = {
                 'scene_id': scene_id,
@@ -181,7 +208,10 @@ class KeyframeExtractor:
             if output_dir:
                 filename = f"{prefix}{scene_id}_keyframe_{idx+1:02d}.jpg"
                 image_path = Path(output_dir) / filename
-                cv2.imwrite(str(image_path), candidate['frame'])
+                if writer:
+                    writes.append(writer.submit(cv2.imwrite, str(image_path), candidate['frame']))
+                else:
+                    cv2.imwrite(str(image_path), candidate['frame'])
                 keyframe['image_path'] = str(image_path)
             
             # 生成图片哈希（用于去重）
@@ -189,7 +219,39 @@ class KeyframeExtractor:
             
             keyframes.append(keyframe)
         
-        return keyframes
+        return keyframes, writes
+    
+    def _finish_scene(self, scene_id: str, keyframes: List[Dict], writes: List[Future],
+                      scene_callback: Optional[callable]):
+        """等待镜头的关键帧图片写完，再回调（回调方可以立即读取图片）"""
+        for future in writes:
+            future.result()
+        
+        if scene_callback:
+            scene_callback(scene_id, keyframes)
+    
+    def _read_frame_at(self, cap: cv2.VideoCapture, frame_number: int) -> Optional[np.ndarray]:
+        """
+        读取指定帧（目标就在前方不远时顺序跳过，避免回退到关键帧重新解码）
+        
+        Args:
+            cap: 视频捕获对象
+            frame_number: 帧号
+            
+        Returns:
+            帧图像，失败返回None
+        """
+        delta = frame_number - int(cap.get(cv2.CAP_PROP_POS_FRAMES))
+        
+        if 0 <= delta <= GRAB_FORWARD_LIMIT:
+            for _ in range(delta):
+                if not cap.grab():
+                    return None
+        else:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
+        
+        ret, frame = cap.read()
+        return frame if ret else None
     
     def _evaluate_frame_quality(self, frame: np.ndarray) -> float:
         """
@@ -208,12 +270,15 @@ class KeyframeExtractor:
         sharpness = laplacian.var()
         sharpness_score = min(sharpness / 1000, 1.0)
         
+        # 亮度与对比度一次遍历求出
+        mean, std = cv2.meanStdDev(gray)
+        
         # 2. 对比度
-        contrast = gray.std()
+        contrast = std[0, 0]
         contrast_score = min(contrast / 80, 1.0)
         
         # 3. 亮度（接近127.5最好）
-        brightness = gray.mean()
+        brightness = mean[0, 0]
         brightness_score = 1.0 - abs(brightness - 127.5) / 127.5
         
         # 4. 色彩丰富度
@@ -229,7 +294,7 @@ class KeyframeExtractor:
             color_score * 0.1
         )
         
-        return round(total_score, 3)
+        return round(float(total_score), 3)
     
     def _calculate_image_hash(self, frame: np.ndarray) -> str:
         """
@@ -248,12 +313,8 @@ class KeyframeExtractor:
         # 计算平均值
         avg = gray.mean()
         
-        # 生成哈希
-        hash_str = ''.join(['1' if pixel > avg else '0' for pixel in gray.flatten()])
-        
-        # 转换为十六进制
-        hash_int = int(hash_str, 2)
-        return format(hash_int, '016x')
+        # 生成哈希（64位按行优先打包，转换为十六进制）
+        return np.packbits(gray > avg).tobytes().hex()
     
     def remove_duplicates(self, keyframes: List[Dict], 
                          similarity_threshold: float = 0.9) -> List[Dict]:
@@ -311,10 +372,9 @@ class KeyframeExtractor:
             
             for idx, time_sec in enumerate(time_points):
                 frame_number = int(time_sec * fps)
-                cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
-                ret, frame = cap.read()
+                frame = self._read_frame_at(cap, frame_number)
                 
-                if not ret:
+                if frame is None:
                     logger.warning(f"无法读取时间点 {time_sec} 的帧")
                     continue
                 
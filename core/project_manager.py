@@ -12,10 +12,27 @@ from datetime import datetime
 from utils.logger import get_logger
 from .exceptions import ProjectManagerError
 from database.db_manager import DatabaseManager
+from utils.file_utils import clone_file, read_json, write_json
 import config
 
 logger = get_logger(__name__)
 
+# 已压缩的文件格式，导出时直接存储，不再 DEFLATE 压缩
+PRECOMPRESSED_EXTENSIONS = frozenset({
+    '.mp4', '.avi', '.mov', '.mkv', '.webm',
+    '.jpg', '.jpeg', '.png', '.webp',
+    '.mp3', '.aac', '.m4a', '.ogg', '.zip',
+})
+
+# 导出时 DEFLATE 的压缩级别（剩下的多为 JSON/数据库，级别 1 速度快且压缩率已足够）
+EXPORT_COMPRESS_LEVEL = 1
+
+# 单独存放在项目目录下的数据段（<段名>.json），镜头和文案保存在数据库中
+PROJECT_SECTIONS = (
+    'keyframes', 'script_data', 'selected_scenes',
+    'selected_keyframes', 'all_subtitles', 'audios',
+)
+
 
 class ProjectManager:
     """项目管理器"""
@@ -59,7 +76,7 @@ class ProjectManager:
             # 复制视频文件到项目目录
             video_filename = os.path.basename(video_path)
             project_video_path = project_dir / video_filename
-            shutil.copy2(video_path, project_video_path)
+            clone_file(video_path, project_video_path)
             
             # 创建子目录
             (project_dir / "keyframes").mkdir(exist_ok=True)
@@ -116,11 +133,16 @@ class ProjectManager:
             # 加载项目文件
             project_file = self.projects_dir / project_id / "project.json"
             if project_file.exists():
-                with open(project_file, 'r', encoding='utf-8') as f:
-                    project_data = json.load(f)
+                project_data = read_json(project_file)
             else:
                 project_data = project_info
             
+            # 加载单独保存的数据段
+            for section in PROJECT_SECTIONS:
+                section_file = self.projects_dir / project_id / f"{section}.json"
+                if section_file.exists():
+                    project_data[section] = read_json(section_file)
+            
             # 加载场景数据
             scenes = self.db.get_project_scenes(project_id)
             project_data['scenes'] = scenes
@@ -171,6 +193,38 @@ class ProjectManager:
             logger.error(f"项目保存失败: {str(e)}", exc_info=True)
             raise ProjectManagerError(f"项目保存失败: {str(e)}")
     
+    def save_partial(self, project_id: str, partial: Dict):
+        """
+        只保存有改动的数据段
+        
+        Args:
+            project_id: 项目ID
+            partial: 段名 -> 数据（scenes/scripts 写入数据库，其余写入 <段名>.json）
+        """
+        logger.info(f"保存项目: {project_id}, 改动: {', '.join(partial)}")
+        
+        try:
+            project_dir = self.projects_dir / project_id
+            
+            for section, data in partial.items():
+                if section == 'scenes':
+                    self.db.save_project_scenes(project_id, data)
+                elif section == 'scripts':
+                    self.db.save_project_scripts(project_id, data)
+                elif section in PROJECT_SECTIONS:
+                    write_json(project_dir / f"{section}.json", data)
+                else:
+                    logger.warning(f"未知的数据段，跳过: {section}")
+            
+            # 更新时间
+            self.db.update_project(project_id, {})
+            
+            logger.info(f"项目保存完成: {project_id}")
+            
+        except Exception as e:
+            logger.error(f"项目保存失败: {str(e)}", exc_info=True)
+            raise ProjectManagerError(f"项目保存失败: {str(e)}")
+    
     def delete_project(self, project_id: str):
         """
         删除项目
@@ -234,7 +288,8 @@ class ProjectManager:
             
             project_dir = self.projects_dir / project_id
             
-            with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+            with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED,
+                                 compresslevel=EXPORT_COMPRESS_LEVEL) as zipf:
                 # 添加项目文件
                 for root, dirs, files in os.walk(project_dir):
                     for file in files:
@@ -245,7 +300,10 @@ class ProjectManager:
                         if not include_source and file_path.suffix in ['.mp4', '.avi', '.mov']:
                             continue
                         
-                        zipf.write(file_path, arcname)
+                        if file_path.suffix.lower() in PRECOMPRESSED_EXTENSIONS:
+                            zipf.write(file_path, arcname, compress_type=zipfile.ZIP_STORED)
+                        else:
+                            zipf.write(file_path, arcname)
             
             logger.info(f"项目导出完成: {output_path}")
             return output_path
@@ -269,8 +327,8 @@ class ProjectManager:
         try:
             import zipfile
             
-            # 解压到临时目录
-            temp_dir = Path(config.TEMP_DIR) / f"import_{os.getpid()}"
+            # 解压到项目目录下的临时目录（与目标在同一文件系统，最后移动只是重命名，不复制文件）
+            temp_dir = self.projects_dir / f".import_{os.getpid()}"
             temp_dir.mkdir(parents=True, exist_ok=True)
             
             with zipfile.ZipFile(zip_path, 'r') as zipf:
@@ -307,10 +365,19 @@ class ProjectManager:
         return f"project_{timestamp}_{hash_str}"
     
     def _save_project_file(self, project_id: str, project_data: Dict):
-        """保存项目文件"""
-        project_file = self.projects_dir / project_id / "project.json"
+        """保存项目文件（同时更新单独保存的数据段，与 load_project 的读取方式保持一致）"""
+        project_dir = self.projects_dir / project_id
+        project_file = project_dir / "project.json"
         with open(project_file, 'w', encoding='utf-8') as f:
             json.dump(project_data, f, ensure_ascii=False, indent=2)
+        
+        # 数据段文件会覆盖 project.json 中的同名字段：有数据时重写，没有时删除旧文件
+        for section in PROJECT_SECTIONS:
+            section_file = project_dir / f"{section}.json"
+            if section in project_data:
+                write_json(section_file, project_data[section])
+            else:
+                section_file.unlink(missing_ok=True)
     
     def get_project_path(self, project_id: str, subdir: str = "") -> Path:
         """
@@ -3,9 +3,12 @@
 功能：自动检测视频中的镜头切换点
 """
 
+import os
 import cv2
 import numpy as np
-from typing import List, Dict, Optional
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import List, Dict, Optional, Tuple
 from scenedetect import VideoManager, SceneManager
 from scenedetect.detectors import ContentDetector, ThresholdDetector, AdaptiveDetector
 from utils.logger import get_logger
@@ -14,6 +17,15 @@ import config
 
 logger = get_logger(__name__)
 
+# 并行检测时每个分段的最少帧数（太短的视频直接单进程检测）
+MIN_SEGMENT_FRAMES = 1500
+
+
+def _scan_segment(params: Dict, video_path: str,
+                  start_frame: int, end_frame: int) -> Tuple[List[Tuple[int, int]], float]:
+    """在子进程中检测一个分段（模块级函数，便于进程池序列化）"""
+    return SceneDetector(**params)._scan(video_path, start_frame, end_frame)
+
 
 class SceneDetector:
     """镜头检测器"""
@@ -22,7 +34,9 @@ class SceneDetector:
                  method: str = "content",
                  threshold: float = 30.0,
                  min_scene_len: float = 1.0,
-                 use_gpu: bool = False):
+                 use_gpu: bool = False,
+                 frame_skip: int = 0,
+                 downscale: Optional[int] = None):
         """
         初始化镜头检测器
         
@@ -31,22 +45,31 @@ class SceneDetector:
             threshold: 检测阈值
             min_scene_len: 最小镜头时长（秒）
             use_gpu: 是否使用GPU加速
+            frame_skip: 每处理一帧后跳过的帧数（跳过的帧只解码不取图，0 为逐帧检测）
+            downscale: 检测前的缩小倍数（None 为按分辨率自动选择，1 为不缩小）
         """
         self.method = method
         self.threshold = threshold
         self.min_scene_len = min_scene_len
         self.use_gpu = use_gpu
+        self.frame_skip = frame_skip
+        self.downscale = downscale
+        
+        # 检测结果缓存：(视频路径, 修改时间, 文件大小, 检测参数) -> 镜头列表
+        self._cache = {}
         
         logger.info(f"镜头检测器初始化: method={method}, threshold={threshold}")
     
     def detect(self, video_path: str, 
-               progress_callback: Optional[callable] = None) -> List[Dict]:
+               progress_callback: Optional[callable] = None,
+               scene_callback: Optional[callable] = None) -> List[Dict]:
         """
         检测视频中的镜头
         
         Args:
             video_path: 视频文件路径
             progress_callback: 进度回调函数
+            scene_callback: 镜头回调函数（每得到一个镜头调用一次，参数为镜头字典）
             
         Returns:
             镜头列表，每个镜头包含start_time, end_time, start_frame, end_frame
@@ -56,11 +79,123 @@ class SceneDetector:
         """
         logger.info(f"开始检测镜头: {video_path}")
         
+        # 同一视频未改动时直接返回上次的结果
+        cache_key = self._cache_key(video_path)
+        if cache_key in self._cache:
+            logger.info("使用缓存的镜头检测结果")
+            return self._replay(self._cache[cache_key], progress_callback, scene_callback)
+        
         try:
-            # 创建视频管理器
-            video_manager = VideoManager([video_path])
-            scene_manager = SceneManager()
+            boundaries, fps = self._scan(video_path)
+            scenes = self._build_scenes(boundaries, fps, progress_callback, scene_callback)
+            
+            if cache_key:
+                self._cache[cache_key] = [scene.copy() for scene in scenes]
+            
+            logger.info(f"镜头检测完成: 共检测到 {len(scenes)} 个镜头")
+            return scenes
+            
+        except Exception as e:
+            logger.error(f"镜头检测失败: {str(e)}", exc_info=True)
+            raise SceneDetectionError(f"镜头检测失败: {str(e)}")
+    
+    def detect_parallel(self, video_path: str,
+                        workers: Optional[int] = None,
+                        progress_callback: Optional[callable] = None,
+                        scene_callback: Optional[callable] = None) -> List[Dict]:
+        """
+        把视频按时间切成多段，用多个进程并行检测镜头
+        
+        分段接缝处产生的切分会被合并回去，恰好落在接缝上的真实镜头切换因此会丢失
+        
+        Args:
+            video_path: 视频文件路径
+            workers: 进程数（默认CPU核心数）
+            progress_callback: 进度回调函数
+            scene_callback: 镜头回调函数
+            
+        Returns:
+            镜头列表，格式与 detect 相同
+            
+        Raises:
+            SceneDetectionError: 检测失败时抛出
+        """
+        workers = workers or os.cpu_count() or 1
+        
+        cache_key = self._cache_key(video_path)
+        if cache_key in self._cache:
+            logger.info("使用缓存的镜头检测结果")
+            return self._replay(self._cache[cache_key], progress_callback, scene_callback)
+        
+        cap = cv2.VideoCapture(video_path)
+        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        cap.release()
+        
+        # 视频太短时分段开销大于收益
+        workers = min(workers, total_frames // MIN_SEGMENT_FRAMES)
+        if workers < 2:
+            return self.detect(video_path, progress_callback, scene_callback)
+        
+        logger.info(f"开始并行检测镜头: {video_path}, {workers} 个进程")
+        
+        try:
+            bounds = np.linspace(0, total_frames, workers + 1).astype(int).tolist()
+            params = {
+                'method': self.method,
+                'threshold': self.threshold,
+                'min_scene_len': self.min_scene_len,
+                'frame_skip': self.frame_skip,
+                'downscale': self.downscale,
+            }
+            
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(
+                    _scan_segment, repeat(params), repeat(video_path), bounds[:-1], bounds[1:]
+                ))
+            
+            # 拼接各分段的镜头，合并被接缝切开的镜头
+            boundaries = []
+            for (segment, _), seg_start, seg_end in zip(results, bounds[:-1], bounds[1:]):
+                # 分段内没有镜头切换时 PySceneDetect 返回空列表，整段视为一个镜头
+                if not segment:
+                    segment = [(seg_start, seg_end)]
+                if boundaries and segment and boundaries[-1][1] == segment[0][0]:
+                    boundaries[-1] = (boundaries[-1][0], segment[0][1])
+                    segment = segment[1:]
+                boundaries.extend(segment)
+            
+            fps = results[0][1]
+            scenes = self._build_scenes(boundaries, fps, progress_callback, scene_callback)
             
+            if cache_key:
+                self._cache[cache_key] = [scene.copy() for scene in scenes]
+            
+            logger.info(f"并行镜头检测完成: 共检测到 {len(scenes)} 个镜头")
+            return scenes
+            
+        except Exception as e:
+            logger.error(f"并行镜头检测失败: {str(e)}", exc_info=True)
+            raise SceneDetectionError(f"镜头检测失败: {str(e)}")
+    
+    def _scan(self, video_path: str,
+              start_frame: Optional[int] = None,
+              end_frame: Optional[int] = None) -> Tuple[List[Tuple[int, int]], float]:
+        """
+        用 PySceneDetect 检测镜头边界
+        
+        Args:
+            video_path: 视频文件路径
+            start_frame: 开始帧（None 为视频开头）
+            end_frame: 结束帧（None 为视频结尾）
+            
+        Returns:
+            ([(开始帧, 结束帧), ...], 帧率)
+        """
+        # 创建视频管理器
+        video_manager = VideoManager([video_path])
+        scene_manager = SceneManager()
+        
+        try:
             # 选择检测器
             if self.method == "content":
                 detector = ContentDetector(threshold=self.threshold)
@@ -73,57 +208,89 @@ class SceneDetector:
             
             scene_manager.add_detector(detector)
             
-            # 开始检测
-            video_manager.set_downscale_factor()
-            video_manager.start()
-            
             # 获取视频信息
             fps = video_manager.get_framerate()
             base_timecode = video_manager.get_base_timecode()
             
+            # 只检测指定范围
+            if start_frame is not None or end_frame is not None:
+                video_manager.set_duration(
+                    start_time=base_timecode + (start_frame or 0),
+                    end_time=base_timecode + end_frame if end_frame is not None else None
+                )
+            
+            # 开始检测
+            video_manager.set_downscale_factor(self.downscale)
+            video_manager.start()
+            
             # 检测场景
-            scene_manager.detect_scenes(frame_source=video_manager)
+            scene_manager.detect_scenes(frame_source=video_manager, frame_skip=self.frame_skip)
             
-            # 获取场景列表（传入 base_timecode）
+            # 获取场景列表（传入 base_timecode），scene 是 (start_timecode, end_timecode) 元组
             scene_list = scene_manager.get_scene_list(base_timecode)
+            return [(start.get_frames(), end.get_frames()) for start, end in scene_list], fps
+        finally:
+            video_manager.release()
+    
+    def _build_scenes(self, boundaries: List[Tuple[int, int]], fps: float,
+                      progress_callback: Optional[callable] = None,
+                      scene_callback: Optional[callable] = None) -> List[Dict]:
+        """把镜头边界转换为镜头字典（过滤太短的镜头）"""
+        scenes = []
+        for i, (start_frame, end_frame) in enumerate(boundaries):
+            start_sec = start_frame / fps
+            end_sec = end_frame / fps
             
-            # 转换为我们的格式
-            scenes = []
-            for i, scene in enumerate(scene_list):
-                # scene 是 (start_timecode, end_timecode) 元组
-                start_time = scene[0]
-                end_time = scene[1]
-                
-                start_sec = start_time.get_seconds()
-                end_sec = end_time.get_seconds()
-                
-                # 过滤太短的镜头
-                if end_sec - start_sec < self.min_scene_len:
-                    continue
-                
-                scene_dict = {
-                    'id': f"scene_{i+1:03d}",
-                    'index': i,
-                    'start_time': start_sec,
-                    'end_time': end_sec,
-                    'duration': end_sec - start_sec,
-                    'start_frame': start_time.get_frames(),
-                    'end_frame': end_time.get_frames(),
-                }
-                scenes.append(scene_dict)
-                
-                if progress_callback:
-                    progress = (i + 1) / len(scene_list) * 100
-                    progress_callback(progress)
+            # 过滤太短的镜头
+            if end_sec - start_sec < self.min_scene_len:
+                continue
             
-            video_manager.release()
+            scene_dict = {
+                'id': f"scene_{i+1:03d}",
+                'index': i,
+                'start_time': start_sec,
+                'end_time': end_sec,
+                'duration': end_sec - start_sec,
+                'start_frame': start_frame,
+                'end_frame': end_frame,
+            }
+            scenes.append(scene_dict)
             
-            logger.info(f"镜头检测完成: 共检测到 {len(scenes)} 个镜头")
-            return scenes
+            if scene_callback:
+                scene_callback(scene_dict)
             
-        except Exception as e:
-            logger.error(f"镜头检测失败: {str(e)}", exc_info=True)
-            raise SceneDetectionError(f"镜头检测失败: {str(e)}")
+            if progress_callback:
+                progress = (i + 1) / len(boundaries) * 100
+                progress_callback(progress)
+        
+        return scenes
+    
+    def _replay(self, cached: List[Dict],
+                progress_callback: Optional[callable] = None,
+                scene_callback: Optional[callable] = None) -> List[Dict]:
+        """返回缓存结果的副本，并照常触发回调"""
+        scenes = [scene.copy() for scene in cached]
+        for i, scene in enumerate(scenes):
+            if scene_callback:
+                scene_callback(scene)
+            if progress_callback:
+                progress_callback((i + 1) / len(scenes) * 100)
+        return scenes
+    
+    def _cache_key(self, video_path: str) -> Optional[tuple]:
+        """生成缓存键（文件不可访问时返回None，不使用缓存）"""
+        try:
+            stat = os.stat(video_path)
+        except OSError:
+            return None
+        return (
+            os.path.abspath(video_path), stat.st_mtime_ns, stat.st_size,
+            self.method, self.threshold, self.min_scene_len, self.frame_skip, self.downscale,
+        )
+    
+    def clear_cache(self):
+        """清除缓存"""
+        self._cache.clear()
     
     def refine_scenes(self, scenes: List[Dict], 
                      merge_threshold: float = 2.0) -> List[Dict]:
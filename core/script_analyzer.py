@@ -4,11 +4,11 @@
 """
 
 import os
-import json
 import base64
-import requests
 from typing import List, Dict, Optional
+from api import get_session
 from utils.logger import get_logger
+from utils.file_utils import write_json
 from .exceptions import ScriptGenerationError
 from .subtitle_extractor import SubtitleExtractor
 import config
@@ -38,7 +38,7 @@ class ScriptAnalyzer:
                       scenes: List[Dict],
                       keyframes: List[Dict],
                       video_path: str,
-                      output_path: str,
+                      output_path: Optional[str] = None,
                       progress_callback: Optional[callable] = None) -> List[Dict]:
         """
         分析所有镜头，生成完整剧本
@@ -47,7 +47,7 @@ class ScriptAnalyzer:
             scenes: 镜头列表（可能是筛选后的）
             keyframes: 关键帧列表
             video_path: 视频路径
-            output_path: 输出路径（JSON）
+            output_path: 输出路径（JSON），为None时不保存（由调用方负责）
             progress_callback: 进度回调
             
         Returns:
@@ -118,10 +118,10 @@ class ScriptAnalyzer:
                 progress_callback(progress)
         
         # 3. 保存剧本
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(script_data, f, ensure_ascii=False, indent=2)
+        if output_path:
+            write_json(output_path, script_data)
         
-        logger.info(f"剧本生成完成: {output_path}")
+        logger.info(f"剧本生成完成: {len(script_data)} 个镜头")
         return script_data
     
     def _analyze_single_scene(self,
@@ -171,7 +171,7 @@ class ScriptAnalyzer:
             # 调用 Gemini API
             logger.info(f"调用 Gemini API 识别画面: {keyframe_path}")
             
-            response = requests.post(
+            response = get_session().post(
                 f"{config.API_BASE_URL}/chat/completions",
                 headers={
                     "Authorization": f"Bearer {config.API_KEY}",
@@ -7,6 +7,7 @@ import os
 import requests
 from typing import List, Dict, Optional
 from openai import OpenAI
+from api import get_session
 from utils.logger import get_logger
 from .exceptions import ScriptGenerationError
 import config
@@ -91,7 +92,7 @@ class ScriptGenerator:
         
         try:
             # 使用中转 API
-            response = requests.post(
+            response = get_session().post(
                 f"{config.API_BASE_URL}/chat/completions",
                 headers={
                     "Authorization": f"Bearer {config.API_KEY}",
@@ -8,6 +8,7 @@ import ffmpeg
 import requests
 from typing import List, Dict, Optional
 from pathlib import Path
+from api import get_session
 from utils.logger import get_logger
 from .exceptions import SubtitleExtractionError
 import config
@@ -152,7 +153,7 @@ class SubtitleExtractor:
                 # 调用 API
                 logger.info(f"调用 Whisper API: {config.API_BASE_URL}/audio/transcriptions")
                 
-                response = requests.post(
+                response = get_session().post(
                     f"{config.API_BASE_URL}/audio/transcriptions",
                     headers=headers,
                     files=files,
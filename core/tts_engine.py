@@ -4,11 +4,15 @@
 """
 
 import os
+import ssl
 import asyncio
 import edge_tts
 from typing import Dict, List, Optional
 from pathlib import Path
+import requests
+import numpy as np
 from pydub import AudioSegment
+from requests.adapters import HTTPAdapter
 from utils.logger import get_logger
 from .exceptions import TTSError
 import config
@@ -21,6 +25,25 @@ from urllib.parse import quote
 
 logger = get_logger(__name__)
 
+# Edge TTS 限流参数：请求发起间隔（秒）与同时进行的请求数
+EDGE_REQUEST_INTERVAL = 1.5
+EDGE_MAX_WORKERS = 3
+
+# 下载音频时每次读取的块大小（字节）
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+
+
+class _SSLContextAdapter(HTTPAdapter):
+    """复用预构建 SSLContext 的 HTTP 适配器"""
+    
+    def __init__(self, ssl_context: ssl.SSLContext, **kwargs):
+        self.ssl_context = ssl_context
+        super().__init__(**kwargs)
+    
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs['ssl_context'] = self.ssl_context
+        return super().init_poolmanager(*args, **kwargs)
+
 
 class TTSEngine:
     """语音合成引擎"""
@@ -41,6 +64,12 @@ class TTSEngine:
         # 可用音色列表
         self.available_voices = self._load_available_voices()
         
+        # 预构建 SSLContext（CA 证书只加载一次），供所有 HTTPS 连接复用
+        self._ssl_context = ssl.create_default_context()
+        self._ssl_context.minimum_version = ssl.TLSVersion.TLSv1_2
+        self._http_session = None
+        self._aliyun_static_params = None
+        
         logger.info(f"TTS引擎初始化: engine={engine}, voice={self.voice}")
     
     def _load_available_voices(self) -> Dict[str, Dict]:
@@ -131,6 +160,15 @@ class TTSEngine:
             logger.error(f"语音合成失败: {str(e)}", exc_info=True)
             raise TTSError(f"语音合成失败: {str(e)}")
     
+    def _get_http_session(self):
+        """获取复用的 HTTP 会话"""
+        if self._http_session is None:
+            session = requests.Session()
+            session.mount('https://', _SSLContextAdapter(self._ssl_context))
+            self._http_session = session
+        
+        return self._http_session
+    
     def _synthesize_edge(self, text: str, output_path: str,
                         voice: str, rate: float, pitch: float, volume: float) -> str:
         """使用Edge TTS合成"""
@@ -160,7 +198,6 @@ class TTSEngine:
     def _synthesize_aliyun(self, text: str, output_path: str,
                           voice: str, rate: float, pitch: float, volume: float) -> str:
         """使用阿里云 TTS 合成 (HTTP GET 方法)"""
-        import requests
         from urllib.parse import quote
         
         try:
@@ -195,63 +232,84 @@ class TTSEngine:
             logger.info(f"调用阿里云 TTS: voice={voice_name}, rate={speech_rate}, pitch={pitch_rate}, volume={volume_val}")
             
             # 发送 GET 请求
-            response = requests.get(url, timeout=30)
+            response = self._get_http_session().get(url, timeout=30, stream=True)
             
-            if response.status_code == 200:
-                # 检查响应类型
-                content_type = response.headers.get('Content-Type', '')
-                
-                if 'audio' in content_type:
-                    # 保存音频
-                    with open(output_path, 'wb') as f:
-                        f.write(response.content)
+            with response:
+                if response.status_code == 200:
+                    # 检查响应类型
+                    content_type = response.headers.get('Content-Type', '')
                     
-                    logger.info(f"阿里云 TTS 合成完成: {output_path} ({len(response.content)} bytes)")
-                    return output_path
+                    if 'audio' in content_type:
+                        # 边接收边保存音频
+                        size = 0
+                        with open(output_path, 'wb') as f:
+                            for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                                f.write(chunk)
+                                size += len(chunk)
+                        
+                        logger.info(f"阿里云 TTS 合成完成: {output_path} ({size} bytes)")
+                        return output_path
+                    else:
+                        # 错误响应
+                        try:
+                            error_data = response.json()
+                            error_msg = error_data.get('message', response.text)
+                        except:
+                            error_msg = response.text
+                        
+                        logger.error(f"阿里云 TTS 返回错误: {error_msg}")
+                        raise TTSError(f"阿里云 TTS 错误: {error_msg}")
                 else:
-                    # 错误响应
-                    try:
-                        error_data = response.json()
-                        error_msg = error_data.get('message', response.text)
-                    except:
-                        error_msg = response.text
-                    
-                    logger.error(f"阿里云 TTS 返回错误: {error_msg}")
-                    raise TTSError(f"阿里云 TTS 错误: {error_msg}")
-            else:
-                logger.error(f"阿里云 TTS 请求失败: HTTP {response.status_code}")
-                raise TTSError(f"阿里云 TTS 请求失败: HTTP {response.status_code}")
-                
+                    logger.error(f"阿里云 TTS 请求失败: HTTP {response.status_code}")
+                    raise TTSError(f"阿里云 TTS 请求失败: HTTP {response.status_code}")
+        
         except TTSError:
             raise
         except Exception as e:
             logger.error(f"阿里云 TTS 调用失败: {e}", exc_info=True)
             raise TTSError(f"阿里云 TTS 失败: {str(e)}")
     
-    def _get_aliyun_token(self) -> str:
-        """获取阿里云 Token"""
-        import requests
-        
-        try:
-            # Token API 端点
-            url = "https://nls-meta.cn-shanghai.aliyuncs.com/token"
-            
-            # 使用 AccessKey 获取 Token
-            params = {
+    def _get_aliyun_static_params(self):
+        """获取阿里云签名的静态参数及其编码结果（首次调用时计算并缓存）"""
+        if self._aliyun_static_params is None:
+            static_params = {
                 'AccessKeyId': config.ALIYUN_ACCESS_KEY_ID,
                 'Action': 'CreateToken',
                 'Version': '2019-02-28',
                 'Format': 'JSON',
                 'RegionId': 'cn-shanghai',
-                'Timestamp': datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ'),
                 'SignatureMethod': 'HMAC-SHA1',
                 'SignatureVersion': '1.0',
+            }
+            static_quoted = [
+                (quote(k, safe=''), quote(str(v), safe=''))
+                for k, v in sorted(static_params.items())
+            ]
+            self._aliyun_static_params = (static_params, static_quoted)
+        
+        return self._aliyun_static_params
+    
+    def _get_aliyun_token(self) -> str:
+        """获取阿里云 Token"""
+        try:
+            # Token API 端点
+            url = "https://nls-meta.cn-shanghai.aliyuncs.com/token"
+            
+            static_params, static_quoted = self._get_aliyun_static_params()
+            
+            # 仅时间戳和随机数每次变化
+            dynamic_params = {
+                'Timestamp': datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ'),
                 'SignatureNonce': str(uuid.uuid4()),
             }
+            params = {**static_params, **dynamic_params}
             
-            # 构建签名字符串
-            sorted_params = sorted(params.items())
-            query_string = '&'.join([f"{quote(k, safe='')}={quote(str(v), safe='')}" for k, v in sorted_params])
+            # 构建签名字符串（静态部分已预先编码）
+            quoted_pairs = static_quoted + [
+                (quote(k, safe=''), quote(v, safe='')) for k, v in dynamic_params.items()
+            ]
+            quoted_pairs.sort()
+            query_string = '&'.join([f"{k}={v}" for k, v in quoted_pairs])
             string_to_sign = f"POST&%2F&{quote(query_string, safe='')}"
             
             # 计算签名
@@ -262,7 +320,7 @@ class TTSEngine:
             params['Signature'] = signature_b64
             
             # 发送请求
-            response = requests.post(url, data=params, timeout=10)
+            response = self._get_http_session().post(url, data=params, timeout=10)
             
             if response.status_code == 200:
                 result = response.json()
@@ -312,22 +370,23 @@ class TTSEngine:
             音频文件列表
         """
         import time
+        import threading
         from concurrent.futures import ThreadPoolExecutor, as_completed
         
         logger.info(f"批量合成语音: {len(scripts)} 个文案")
         
         Path(output_dir).mkdir(parents=True, exist_ok=True)
         
-        results = []
         total = len(scripts)
+        results = [None] * total
         
         # 根据引擎类型决定并发策略
         if self.engine == "edge":
-            # Edge TTS 需要限流，顺序执行
-            max_workers = 1
-            delay_between_requests = 1.5  # 每个请求间隔1.5秒
+            # Edge TTS 需要限流：请求按固定间隔发起，但不必等上一个请求完成
+            max_workers = EDGE_MAX_WORKERS
+            delay_between_requests = EDGE_REQUEST_INTERVAL
             max_retries = 3
-            logger.info("使用 Edge TTS，启用限流模式（顺序执行）")
+            logger.info(f"使用 Edge TTS，启用限流模式（每 {delay_between_requests} 秒发起一个请求）")
         else:
             # 阿里云可以并发
             max_workers = 5
@@ -335,20 +394,33 @@ class TTSEngine:
             max_retries = 2
             logger.info(f"使用 {self.engine} TTS，启用并发模式（{max_workers} 线程）")
         
+        # 请求发起节拍（所有线程共享，保证请求间隔）
+        pace_lock = threading.Lock()
+        next_start = [0.0]
+        
+        def wait_turn():
+            """等待下一个可发起请求的时间点"""
+            with pace_lock:
+                now = time.monotonic()
+                start = max(now, next_start[0])
+                next_start[0] = start + delay_between_requests
+            if start > now:
+                time.sleep(start - now)
+        
         def synthesize_one(script: Dict, idx: int) -> Dict:
             """合成单个音频（带重试）"""
             scene_id = script['scene_id']
             text = script['script']
             output_path = os.path.join(output_dir, f"{scene_id}_audio.mp3")
             
-            # Edge TTS 限流：添加延迟
-            if self.engine == "edge" and idx > 0:
-                time.sleep(delay_between_requests)
-            
             # 重试逻辑
             last_error = None
             for attempt in range(max_retries):
                 try:
+                    # 限流：按节拍发起请求
+                    if self.engine == "edge":
+                        wait_turn()
+                    
                     # 合成语音
                     self.synthesize(text, output_path, voice)
                     
@@ -389,35 +461,23 @@ class TTSEngine:
                 'success': False
             }
         
-        # 执行合成
-        if max_workers == 1:
-            # 顺序执行（Edge TTS）
-            for idx, script in enumerate(scripts):
-                result = synthesize_one(script, idx)
-                results.append(result)
+        # 执行合成（网络请求并发进行，结果按文案顺序排列）
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # 提交所有任务
+            future_to_idx = {
+                executor.submit(synthesize_one, script, idx): idx
+                for idx, script in enumerate(scripts)
+            }
+            
+            # 收集结果
+            completed = 0
+            for future in as_completed(future_to_idx):
+                results[future_to_idx[future]] = future.result()
                 
+                completed += 1
                 if progress_callback:
-                    progress = (idx + 1) / total * 100
+                    progress = completed / total * 100
                     progress_callback(progress)
-        else:
-            # 并发执行（阿里云等）
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                # 提交所有任务
-                future_to_idx = {
-                    executor.submit(synthesize_one, script, idx): idx
-                    for idx, script in enumerate(scripts)
-                }
-                
-                # 收集结果
-                completed = 0
-                for future in as_completed(future_to_idx):
-                    result = future.result()
-                    results.append(result)
-                    
-                    completed += 1
-                    if progress_callback:
-                        progress = completed / total * 100
-                        progress_callback(progress)
         
         # 统计结果
         success_count = len([r for r in results if r.get('success', False)])
@@ -489,6 +549,15 @@ class TTSEngine:
         if not audio_paths:
             raise TTSError("没有音频文件可合并")
         
+        # 无交叉淡化且编码一致时，直接流复制拼接，避免解码+重新编码
+        if crossfade == 0 and self._can_stream_concat(audio_paths, output_path):
+            try:
+                self._concat_audios_copy(audio_paths, output_path)
+                logger.info(f"音频合并完成（流复制）: {output_path}")
+                return output_path
+            except Exception as e:
+                logger.warning(f"流复制合并失败，回退到 pydub: {str(e)}")
+        
         # 加载第一个音频
         combined = AudioSegment.from_file(audio_paths[0])
         
@@ -507,6 +576,58 @@ class TTSEngine:
         logger.info(f"音频合并完成: {output_path}")
         return output_path
     
+    def _can_stream_concat(self, audio_paths: List[str], output_path: str) -> bool:
+        """检查音频是否可以直接流复制拼接（同为MP3且参数一致）"""
+        if Path(output_path).suffix.lower() != '.mp3':
+            return False
+        
+        try:
+            import ffmpeg
+            
+            layout = None
+            for audio_path in audio_paths:
+                probe = ffmpeg.probe(audio_path)
+                stream = next(
+                    (s for s in probe['streams'] if s['codec_type'] == 'audio'),
+                    None
+                )
+                if not stream or stream.get('codec_name') != 'mp3':
+                    return False
+                
+                current = (stream.get('sample_rate'), stream.get('channels'))
+                if layout is None:
+                    layout = current
+                elif current != layout:
+                    return False
+            
+            return True
+        except Exception as e:
+            logger.warning(f"探测音频格式失败: {str(e)}")
+            return False
+    
+    def _concat_audios_copy(self, audio_paths: List[str], output_path: str):
+        """使用 ffmpeg concat 分离器流复制拼接音频"""
+        import ffmpeg
+        
+        concat_file = Path(config.TEMP_DIR) / f"audio_concat_{os.getpid()}_{uuid.uuid4().hex[:8]}.txt"
+        concat_file.parent.mkdir(parents=True, exist_ok=True)
+        
+        try:
+            with open(concat_file, 'w', encoding='utf-8') as f:
+                for audio_path in audio_paths:
+                    f.write(f"file '{os.path.abspath(audio_path)}'\n")
+            
+            (
+                ffmpeg
+                .input(str(concat_file), format='concat', safe=0)
+                .output(output_path, c='copy')
+                .overwrite_output()
+                .run(quiet=True)
+            )
+        finally:
+            if concat_file.exists():
+                concat_file.unlink()
+    
     def add_background_music(self,
                            voice_path: str,
                            music_path: str,
@@ -526,23 +647,33 @@ class TTSEngine:
         """
         logger.info("添加背景音乐")
         
-        # 加载音频
-        voice = AudioSegment.from_file(voice_path)
-        music = AudioSegment.from_file(music_path)
+        # 加载音频（统一为16位，采样率/声道与语音一致）
+        voice = AudioSegment.from_file(voice_path).set_sample_width(2)
+        music = (
+            AudioSegment.from_file(music_path)
+            .set_frame_rate(voice.frame_rate)
+            .set_channels(voice.channels)
+            .set_sample_width(2)
+        )
         
         # 调整音乐音量
         music = music - (20 * (1 - music_volume))
         
-        # 循环音乐以匹配语音长度
-        if len(music) < len(voice):
-            loops = (len(voice) // len(music)) + 1
-            music = music * loops
-        
-        # 截取音乐
-        music = music[:len(voice)]
+        voice_samples = np.frombuffer(voice.raw_data, dtype=np.int16)
+        music_samples = np.frombuffer(music.raw_data, dtype=np.int16)
         
-        # 混合
-        combined = voice.overlay(music)
+        # 循环音乐以匹配语音长度并截取
+        if music_samples.size == 0:
+            music_samples = np.zeros_like(voice_samples)
+        else:
+            music_samples = np.resize(music_samples, voice_samples.shape)
+        
+        # 混合（int32 累加后裁剪，避免溢出）
+        mixed = np.clip(
+            voice_samples.astype(np.int32) + music_samples.astype(np.int32),
+            -32768, 32767
+        ).astype(np.int16)
+        combined = voice._spawn(mixed.tobytes())
         
         # 导出
         combined.export(output_path, format="mp3")
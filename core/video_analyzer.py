@@ -6,13 +6,19 @@
 import os
 import cv2
 import ffmpeg
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Optional, Tuple
 from pathlib import Path
 from utils.logger import get_logger
+from utils.format_utils import parse_frame_rate
 from .exceptions import VideoAnalysisError
 
 logger = get_logger(__name__)
 
+# ffprobe 探测线程（子进程等待期间由 OpenCV 打开视频、解码采样帧）
+_probe_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="ffprobe")
+
 
 class VideoAnalyzer:
     """视频分析器"""
@@ -52,18 +58,28 @@ class VideoAnalyzer:
             logger.info("使用缓存的分析结果")
             return self._cache[video_path]
         
+        cap = None
         try:
-            # 基础信息
-            basic_info = self._get_basic_info(video_path)
+            # ffprobe 元数据（编码/音频/时长共用一次探测），在后台线程中与 OpenCV 并行
+            probe_future = _probe_pool.submit(self._probe, video_path)
+            
+            # 基础信息与质量信息共用同一个视频捕获对象
+            cap = cv2.VideoCapture(video_path)
+            if not cap.isOpened():
+                raise VideoAnalysisError("无法打开视频文件")
+            
+            # 基础信息（优先使用 ffprobe 结果，探测失败时回退到 OpenCV 属性）
+            probe = probe_future.result()
+            basic_info = self._get_probe_basic_info(probe) or self._get_basic_info(cap)
             
             # 编码信息
-            codec_info = self._get_codec_info(video_path)
+            codec_info = self._get_codec_info(probe)
             
-            # 质量信息
-            quality_info = self._get_quality_info(video_path)
+            # 质量信息（按 ffprobe 时长规划采样时间点）
+            quality_info = self._get_quality_info(cap, basic_info['duration'])
             
             # 音频信息
-            audio_info = self._get_audio_info(video_path)
+            audio_info = self._get_audio_info(probe)
             
             # 合并所有信息
             result = {
@@ -86,20 +102,53 @@ class VideoAnalyzer:
         except Exception as e:
             logger.error(f"视频分析失败: {str(e)}", exc_info=True)
             raise VideoAnalysisError(f"视频分析失败: {str(e)}")
+        finally:
+            if cap is not None:
+                cap.release()
     
-    def _get_basic_info(self, video_path: str) -> Dict:
+    def _get_basic_info(self, cap: cv2.VideoCapture) -> Dict:
         """获取基础信息"""
-        cap = cv2.VideoCapture(video_path)
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        duration = frame_count / fps if fps > 0 else 0
         
-        if not cap.isOpened():
-            raise VideoAnalysisError("无法打开视频文件")
+        return {
+            'width': width,
+            'height': height,
+            'fps': fps,
+            'frame_count': frame_count,
+            'duration': duration,
+            'aspect_ratio': f"{width}:{height}",
+        }
+    
+    def _get_probe_basic_info(self, probe: Optional[Dict]) -> Optional[Dict]:
+        """从 ffprobe 结果中获取基础信息，缺少视频流或关键字段时返回None"""
+        if not probe:
+            return None
         
         try:
-            width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-            height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-            fps = cap.get(cv2.CAP_PROP_FPS)
-            frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-            duration = frame_count / fps if fps > 0 else 0
+            video_stream = next(
+                (s for s in probe['streams'] if s['codec_type'] == 'video'),
+                None
+            )
+            if not video_stream:
+                return None
+            
+            width = int(video_stream['width'])
+            height = int(video_stream['height'])
+            
+            # 平均帧率无效（如 "0/0"）时回退到 r_frame_rate
+            fps = (parse_frame_rate(video_stream.get('avg_frame_rate', ''))
+                   or parse_frame_rate(video_stream.get('r_frame_rate', '')))
+            if not fps or fps <= 0:
+                return None
+            
+            duration = self._get_probe_duration(probe) or float(video_stream.get('duration', 0))
+            if duration <= 0:
+                return None
+            frame_count = int(video_stream.get('nb_frames', 0)) or int(round(duration * fps))
             
             return {
                 'width': width,
@@ -109,13 +158,31 @@ class VideoAnalyzer:
                 'duration': duration,
                 'aspect_ratio': f"{width}:{height}",
             }
-        finally:
-            cap.release()
+        except (KeyError, ValueError, ZeroDivisionError) as e:
+            logger.warning(f"解析 ffprobe 基础信息失败: {str(e)}")
+            return None
+    
+    def _probe(self, video_path: str) -> Optional[Dict]:
+        """调用 ffprobe 获取元数据，失败返回None"""
+        try:
+            return ffmpeg.probe(video_path)
+        except Exception as e:
+            logger.warning(f"ffprobe 探测失败: {str(e)}")
+            return None
     
-    def _get_codec_info(self, video_path: str) -> Dict:
+    def _get_probe_duration(self, probe: Optional[Dict]) -> float:
+        """从 ffprobe 结果中获取时长（秒），失败返回0"""
+        try:
+            return float(probe['format']['duration'])
+        except (TypeError, KeyError, ValueError):
+            return 0.0
+    
+    def _get_codec_info(self, probe: Optional[Dict]) -> Dict:
         """获取编码信息"""
+        if not probe:
+            return {}
+        
         try:
-            probe = ffmpeg.probe(video_path)
             video_stream = next(
                 (s for s in probe['streams'] if s['codec_type'] == 'video'),
                 None
@@ -135,56 +202,61 @@ class VideoAnalyzer:
             logger.warning(f"获取编码信息失败: {str(e)}")
             return {}
     
-    def _get_quality_info(self, video_path: str) -> Dict:
-        """获取质量信息"""
-        cap = cv2.VideoCapture(video_path)
+    def _get_quality_info(self, cap: cv2.VideoCapture, duration: float) -> Dict:
+        """
+        获取质量信息
         
-        try:
-            # 读取几帧进行质量评估
-            frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-            sample_count = min(10, frame_count)
-            sample_indices = [int(i * frame_count / sample_count) for i in range(sample_count)]
+        Args:
+            cap: 已打开的视频捕获对象
+            duration: 视频时长（秒），用于规划采样时间点
+        """
+        # 在时长范围内均匀取几帧进行质量评估
+        sample_count = 10 if duration > 0 else 0
+        sample_times = np.linspace(0, duration, sample_count, endpoint=False)
+        
+        brightness_values = np.empty(sample_count, dtype=np.float32)
+        contrast_values = np.empty(sample_count, dtype=np.float32)
+        sharpness_values = np.empty(sample_count, dtype=np.float32)
+        valid = 0
+        
+        for time_sec in sample_times:
+            cap.set(cv2.CAP_PROP_POS_MSEC, time_sec * 1000)
+            ret, frame = cap.read()
             
-            brightness_values = []
-            contrast_values = []
-            sharpness_values = []
+            if not ret:
+                continue
             
-            for idx in sample_indices:
-                cap.set(cv2.CAP_PROP_POS_FRAMES, idx)
-                ret, frame = cap.read()
-                
-                if not ret:
-                    continue
-                
-                # 转换为灰度图
-                gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-                
-                # 亮度
-                brightness = gray.mean()
-                brightness_values.append(brightness)
-                
-                # 对比度
-                contrast = gray.std()
-                contrast_values.append(contrast)
-                
-                # 清晰度（拉普拉斯方差）
-                laplacian = cv2.Laplacian(gray, cv2.CV_64F)
-                sharpness = laplacian.var()
-                sharpness_values.append(sharpness)
+            # 转换为灰度图
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
             
-            return {
-                'avg_brightness': sum(brightness_values) / len(brightness_values) if brightness_values else 0,
-                'avg_contrast': sum(contrast_values) / len(contrast_values) if contrast_values else 0,
-                'avg_sharpness': sum(sharpness_values) / len(sharpness_values) if sharpness_values else 0,
-                'quality_score': self._calculate_quality_score(brightness_values, contrast_values, sharpness_values),
-            }
-        finally:
-            cap.release()
+            # 亮度、对比度
+            mean, std = cv2.meanStdDev(gray)
+            brightness_values[valid] = mean[0, 0]
+            contrast_values[valid] = std[0, 0]
+            
+            # 清晰度（拉普拉斯方差）
+            laplacian = cv2.Laplacian(gray, cv2.CV_64F)
+            sharpness_values[valid] = laplacian.var()
+            
+            valid += 1
+        
+        brightness_values = brightness_values[:valid]
+        contrast_values = contrast_values[:valid]
+        sharpness_values = sharpness_values[:valid]
+        
+        return {
+            'avg_brightness': float(brightness_values.mean()) if valid else 0,
+            'avg_contrast': float(contrast_values.mean()) if valid else 0,
+            'avg_sharpness': float(sharpness_values.mean()) if valid else 0,
+            'quality_score': self._calculate_quality_score(brightness_values, contrast_values, sharpness_values),
+        }
     
-    def _get_audio_info(self, video_path: str) -> Dict:
+    def _get_audio_info(self, probe: Optional[Dict]) -> Dict:
         """获取音频信息"""
+        if not probe:
+            return {'has_audio': False}
+        
         try:
-            probe = ffmpeg.probe(video_path)
             audio_stream = next(
                 (s for s in probe['streams'] if s['codec_type'] == 'audio'),
                 None
@@ -211,20 +283,24 @@ class VideoAnalyzer:
         计算视频质量评分（0-100）
         
         Args:
-            brightness: 亮度值列表
-            contrast: 对比度值列表
-            sharpness: 清晰度值列表
+            brightness: 亮度值数组
+            contrast: 对比度值数组
+            sharpness: 清晰度值数组
             
         Returns:
             质量评分
         """
-        if not brightness or not contrast or not sharpness:
+        brightness = np.asarray(brightness, dtype=np.float32)
+        contrast = np.asarray(contrast, dtype=np.float32)
+        sharpness = np.asarray(sharpness, dtype=np.float32)
+        
+        if not brightness.size or not contrast.size or not sharpness.size:
             return 0.0
         
         # 归一化
-        avg_brightness = sum(brightness) / len(brightness)
-        avg_contrast = sum(contrast) / len(contrast)
-        avg_sharpness = sum(sharpness) / len(sharpness)
+        avg_brightness = float(brightness.mean())
+        avg_contrast = float(contrast.mean())
+        avg_sharpness = float(sharpness.mean())
         
         # 亮度评分（理想值127.5）
         brightness_score = 100 - abs(avg_brightness - 127.5) / 127.5 * 100
@@ -4,28 +4,172 @@
 """
 
 import os
-import ffmpeg
+import subprocess
+import threading
+import wave
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import List, Dict, Optional, Tuple
 from pathlib import Path
 from utils.logger import get_logger
+from utils.format_utils import parse_frame_rate
 from .exceptions import VideoProcessingError
+from database.db_manager import DatabaseManager
 import config
 
 logger = get_logger(__name__)
 
+# 解说音轨的混音参数
+NARRATION_SAMPLE_RATE = 44100
+NARRATION_CHANNELS = 2
+# 解说片段不多时直接在 ffmpeg 滤镜图中 adelay+amix，过多则先用 NumPy 预混
+NARRATION_FILTER_MAX_INPUTS = 32
+
+# 分段并行编码参数（短视频直接单进程编码）
+PARALLEL_ENCODE_MIN_DURATION = 120
+PARALLEL_ENCODE_SEGMENT_TIME = 10
+PARALLEL_ENCODE_THREADS = 2
+
+# 剪切时关键帧对齐参数（秒）
+KEYFRAME_SNAP_TOLERANCE = 0.5
+KEYFRAME_SEARCH_WINDOW = 30
+
+# 重新编码时的线程参数：编解码器自动线程，滤镜按 CPU 核数并行
+ENCODE_THREAD_OPTIONS = {
+    'threads': 0,
+    'filter_threads': os.cpu_count() or 1,
+    'filter_complex_threads': os.cpu_count() or 1,
+}
+
+# 中间文件的输入探测参数（缩短 ffmpeg 启动分析时间）
+FAST_INPUT_PROBESIZE = '1M'
+FAST_INPUT_ANALYZEDURATION = '1M'
+FAST_INPUT_FFLAGS = '+nobuffer+fastseek'
+
+# 硬件编码器（按优先级），以及各编码器的质量参数
+HW_ENCODERS = ('h264_nvenc', 'h264_qsv')
+ENCODER_QUALITY_PARAMS = {
+    'libx264': {
+        'low': {'crf': 28, 'preset': 'fast'},
+        'medium': {'crf': 23, 'preset': 'medium'},
+        'high': {'crf': 18, 'preset': 'slow'},
+    },
+    'h264_nvenc': {
+        'low': {'rc': 'vbr', 'cq': 28, 'preset': 'p3'},
+        'medium': {'rc': 'vbr', 'cq': 23, 'preset': 'p5'},
+        'high': {'rc': 'vbr', 'cq': 18, 'preset': 'p7'},
+    },
+    'h264_qsv': {
+        'low': {'global_quality': 28, 'preset': 'veryfast'},
+        'medium': {'global_quality': 23, 'preset': 'medium'},
+        'high': {'global_quality': 18, 'preset': 'veryslow'},
+    },
+}
+
+# 硬件编码器测试编码的超时时间（秒）
+ENCODER_TEST_TIMEOUT = 15
+
+# 消费级显卡限制并发编码会话数，硬件编码任务需排队
+_hw_encode_semaphore = threading.Semaphore(2)
+
+
+@lru_cache(maxsize=1)
+def _ffmpeg():
+    """延迟导入 ffmpeg-python（仅在实际处理视频时加载）"""
+    import ffmpeg
+    return ffmpeg
+
+
+def _fast_input(path: str, **kwargs):
+    """
+    以较小的探测量打开本地输入文件
+    
+    只用于处理流程自己生成的中间文件（解说音频、分段等）；用户提供的源视频可能
+    音频流起始较晚或文件头较大，需使用 FFmpeg 默认的探测参数
+    
+    Args:
+        path: 输入路径
+        **kwargs: 其他输入参数（fflags 会与默认标志合并）
+    """
+    fflags = FAST_INPUT_FFLAGS + kwargs.pop('fflags', '')
+    return _ffmpeg().input(
+        path,
+        probesize=FAST_INPUT_PROBESIZE,
+        analyzeduration=FAST_INPUT_ANALYZEDURATION,
+        fflags=fflags,
+        **kwargs
+    )
+
+
+def _encoder_works(ffmpeg_path: str, encoder: str) -> bool:
+    """
+    用一帧测试编码检查编码器是否真正可用
+    
+    FFmpeg 编译了硬件编码器并不代表机器上有对应的显卡/驱动
+    """
+    try:
+        result = subprocess.run(
+            [ffmpeg_path, '-hide_banner', '-loglevel', 'error',
+             '-f', 'lavfi', '-i', 'color=c=black:s=256x256:d=0.1',
+             '-frames:v', '1', '-c:v', encoder, '-f', 'null', '-'],
+            capture_output=True, timeout=ENCODER_TEST_TIMEOUT
+        )
+    except Exception as e:
+        logger.warning(f"测试编码器 {encoder} 失败: {str(e)}")
+        return False
+    return result.returncode == 0
+
+
+@lru_cache(maxsize=None)
+def _available_encoders(ffmpeg_path: str) -> frozenset:
+    """
+    查询 FFmpeg 可用的编码器名称（每个可执行文件只查询一次）
+    
+    硬件编码器额外做一次测试编码，只有测试通过的才算可用
+    """
+    try:
+        result = subprocess.run(
+            [ffmpeg_path, '-hide_banner', '-encoders'],
+            capture_output=True, text=True, timeout=10
+        )
+    except Exception as e:
+        logger.warning(f"查询FFmpeg编码器失败: {str(e)}")
+        return frozenset()
+    
+    encoders = set()
+    for line in result.stdout.splitlines():
+        parts = line.split()
+        # 编码器行格式: " V....D libx264   libx264 H.264 ..."
+        if len(parts) >= 2 and len(parts[0]) == 6 and parts[0][0] == 'V':
+            encoders.add(parts[1])
+    
+    for encoder in HW_ENCODERS:
+        if encoder in encoders and not _encoder_works(ffmpeg_path, encoder):
+            logger.info(f"硬件编码器不可用，跳过: {encoder}")
+            encoders.discard(encoder)
+    
+    return frozenset(encoders)
+
 
 class VideoProcessor:
     """视频处理器"""
     
-    def __init__(self, ffmpeg_path: Optional[str] = None):
+    def __init__(self, ffmpeg_path: Optional[str] = None,
+                 db: Optional[DatabaseManager] = None):
         """
         初始化视频处理器
         
         Args:
             ffmpeg_path: FFmpeg可执行文件路径
+            db: 数据库管理器（用于缓存视频探测结果）
         """
         self.ffmpeg_path = ffmpeg_path or config.FFMPEG_PATH
-        logger.info("视频处理器初始化完成")
+        self.db = db
+        
+        encoders = _available_encoders(self.ffmpeg_path)
+        self.hw_encoder = next((e for e in HW_ENCODERS if e in encoders), 'libx264')
+        logger.info(f"视频处理器初始化完成, 视频编码器: {self.hw_encoder}")
     
     def compose(self,
                video_path: str,
@@ -56,27 +200,33 @@ class VideoProcessor:
             temp_dir = Path(config.TEMP_DIR) / f"compose_{os.getpid()}"
             temp_dir.mkdir(parents=True, exist_ok=True)
             
-            # 1. 提取原视频音频（如果有）
-            original_audio = None
-            if self._has_audio(video_path):
-                original_audio = str(temp_dir / "original_audio.aac")
-                self._extract_audio(video_path, original_audio)
+            placements = self._narration_placements(audio_segments, scenes)
+            total_duration = scenes[-1]['end_time'] if scenes else 0
+            has_original_audio = self._has_audio(video_path)
             
-            # 2. 创建解说音频时间轴
-            narration_audio = str(temp_dir / "narration.mp3")
-            self._create_narration_timeline(audio_segments, scenes, narration_audio)
-            
-            # 3. 混合音频（原音+解说）
-            if original_audio:
-                mixed_audio = str(temp_dir / "mixed_audio.mp3")
-                self._mix_audios(original_audio, narration_audio, mixed_audio)
+            if len(placements) <= NARRATION_FILTER_MAX_INPUTS:
+                # 单次 ffmpeg：各段解说 adelay 到位后与原音 amix，视频流直接复制
+                self._mux_with_segments(
+                    video_path,
+                    placements,
+                    output_path,
+                    total_duration,
+                    has_original_audio=has_original_audio
+                )
             else:
-                mixed_audio = narration_audio
-            
-            # 4. 合成最终视频
-            self._merge_video_audio(video_path, mixed_audio, output_path)
+                # 1. 创建解说音频时间轴（WAV 中间文件，避免有损编码）
+                narration_audio = str(temp_dir / "narration.wav")
+                self._create_narration_timeline(placements, total_duration, narration_audio)
+                
+                # 2. 单次 ffmpeg：原音+解说混合，视频流直接复制
+                self._mux_with_narration(
+                    video_path,
+                    narration_audio,
+                    output_path,
+                    has_original_audio=has_original_audio
+                )
             
-            # 5. 清理临时文件
+            # 3. 清理临时文件
             self._cleanup_temp_files(temp_dir)
             
             if progress_callback:
@@ -89,102 +239,268 @@ class VideoProcessor:
             logger.error(f"视频合成失败: {str(e)}", exc_info=True)
             raise VideoProcessingError(f"视频合成失败: {str(e)}")
     
+    def _probe_cached(self, video_path: str) -> Dict:
+        """
+        探测视频信息（文件未变化时使用数据库缓存）
+        
+        Args:
+            video_path: 视频路径
+            
+        Returns:
+            ffprobe 结果字典
+        """
+        if self.db:
+            cached = self.db.get_cached_probe(video_path)
+            if cached is not None:
+                return cached
+        
+        probe = _ffmpeg().probe(video_path, probesize='5M', analyzeduration='5M')
+        
+        if self.db:
+            try:
+                self.db.set_cached_probe(video_path, probe)
+            except Exception as e:
+                logger.warning(f"缓存视频探测结果失败: {str(e)}")
+        
+        return probe
+    
     def _has_audio(self, video_path: str) -> bool:
         """检查视频是否有音频"""
         try:
-            probe = ffmpeg.probe(video_path)
+            probe = self._probe_cached(video_path)
             audio_streams = [s for s in probe['streams'] if s['codec_type'] == 'audio']
             return len(audio_streams) > 0
         except:
             return False
     
-    def _extract_audio(self, video_path: str, output_path: str):
-        """提取视频音频"""
-        logger.info("提取原视频音频")
-        
-        (
-            ffmpeg
-            .input(video_path)
-            .output(output_path, acodec='aac', audio_bitrate='192k')
-            .overwrite_output()
-            .run(quiet=True)
-        )
-    
-    def _create_narration_timeline(self,
-                                  audio_segments: List[Dict],
-                                  scenes: List[Dict],
-                                  output_path: str):
-        """创建解说音频时间轴"""
-        logger.info("创建解说音频时间轴")
-        
-        from pydub import AudioSegment
-        
-        # 获取视频总时长
-        total_duration = scenes[-1]['end_time'] if scenes else 0
+    def _narration_placements(self,
+                              audio_segments: List[Dict],
+                              scenes: List[Dict]) -> List[Tuple[str, float]]:
+        """
+        计算各段解说音频在时间轴上的位置
         
-        # 创建空白音频
-        silence = AudioSegment.silent(duration=int(total_duration * 1000))
+        Returns:
+            (音频路径, 开始时间) 列表
+        """
+        # 镜头ID索引，避免每段解说都线性查找
+        scene_by_id = {s['id']: s for s in scenes}
         
-        # 将各段解说音频插入到对应时间点
+        placements = []
         for segment in audio_segments:
             if not segment.get('audio_path'):
                 continue
             
             # 找到对应的镜头
-            scene = next((s for s in scenes if s['id'] == segment['scene_id']), None)
+            scene = scene_by_id.get(segment['scene_id'])
             if not scene:
                 continue
             
-            # 加载音频
-            audio = AudioSegment.from_file(segment['audio_path'])
-            
-            # 插入到时间轴
-            start_ms = int(scene['start_time'] * 1000)
-            silence = silence.overlay(audio, position=start_ms)
+            placements.append((segment['audio_path'], scene['start_time']))
+        
+        return placements
+    
+    def _create_narration_timeline(self,
+                                  placements: List[Tuple[str, float]],
+                                  total_duration: float,
+                                  output_path: str):
+        """
+        创建解说音频时间轴
+        
+        按时间顺序流式写入 WAV：空白部分直接写静音块，
+        只有相互重叠的解说片段才在内存中累加混合
+        """
+        logger.info("创建解说音频时间轴")
+        
+        sample_rate = NARRATION_SAMPLE_RATE
+        channels = NARRATION_CHANNELS
+        
+        total_samples = int(total_duration * sample_rate)
         
-        # 导出
-        silence.export(output_path, format="mp3")
+        with wave.open(output_path, 'wb') as wav:
+            wav.setnchannels(channels)
+            wav.setsampwidth(2)
+            wav.setframerate(sample_rate)
+            
+            written = 0
+            # 待写出的混合块：起始采样位置 + int32 累加缓冲区（避免溢出）
+            pending_start = 0
+            pending = np.zeros((0, channels), dtype=np.int32)
+            
+            for audio_path, start_time in sorted(placements, key=lambda p: p[1]):
+                start = int(start_time * sample_rate)
+                if start >= total_samples:
+                    continue
+                
+                # 解码音频并截断到时间轴范围内
+                data = self._decode_pcm(audio_path, sample_rate, channels)
+                data = data[:total_samples - start]
+                end = start + len(data)
+                
+                pending_end = pending_start + len(pending)
+                if start >= pending_end:
+                    # 与待写出块不重叠：先写出，再补齐中间的静音
+                    written = self._write_pcm(wav, pending, written)
+                    written = self._write_silence(wav, start - written, written)
+                    pending_start = start
+                    pending = data.astype(np.int32)
+                else:
+                    # 重叠：扩展待写出块并叠加
+                    if end > pending_end:
+                        pending = np.concatenate(
+                            [pending, np.zeros((end - pending_end, channels), dtype=np.int32)]
+                        )
+                    offset = start - pending_start
+                    pending[offset:offset + len(data)] += data
+            
+            written = self._write_pcm(wav, pending, written)
+            self._write_silence(wav, total_samples - written, written)
+    
+    def _write_pcm(self, wav: wave.Wave_write, mix: np.ndarray, written: int) -> int:
+        """裁剪 int32 混合块并写入 WAV，返回已写入的采样数"""
+        if not len(mix):
+            return written
+        np.clip(mix, -32768, 32767, out=mix)
+        wav.writeframes(mix.astype(np.int16).tobytes())
+        return written + len(mix)
+    
+    def _write_silence(self, wav: wave.Wave_write, samples: int, written: int) -> int:
+        """分块写入静音，返回已写入的采样数"""
+        if samples <= 0:
+            return written
+        chunk = np.zeros((NARRATION_SAMPLE_RATE, NARRATION_CHANNELS), dtype=np.int16).tobytes()
+        frame_size = 2 * NARRATION_CHANNELS
+        remaining = samples
+        while remaining > 0:
+            count = min(remaining, NARRATION_SAMPLE_RATE)
+            wav.writeframes(chunk[:count * frame_size])
+            remaining -= count
+        return written + samples
+    
+    def _decode_pcm(self, audio_path: str, sample_rate: int, channels: int) -> np.ndarray:
+        """将音频解码为 int16 PCM 数组，形状为 (采样数, 声道数)"""
+        out, _ = (
+            _fast_input(audio_path)
+            .output('pipe:', format='s16le', acodec='pcm_s16le', ac=channels, ar=sample_rate)
+            .run(capture_stdout=True, quiet=True)
+        )
+        return np.frombuffer(out, dtype=np.int16).reshape(-1, channels)
     
-    def _mix_audios(self, audio1_path: str, audio2_path: str, 
-                   output_path: str, ratio: float = 0.3):
+    def _mux_with_segments(self,
+                           video_path: str,
+                           placements: List[Tuple[str, float]],
+                           output_path: str,
+                           total_duration: float,
+                           has_original_audio: bool = True,
+                           ratio: float = 0.3):
         """
-        混合两个音频
+        在一个 ffmpeg 滤镜图中完成解说定位、与原音混合并封装到视频
         
         Args:
-            audio1_path: 音频1（原音）
-            audio2_path: 音频2（解说）
+            video_path: 原视频路径
+            placements: (解说音频路径, 开始时间) 列表
             output_path: 输出路径
-            ratio: 音频1的音量比例
+            total_duration: 时间轴总时长（秒）
+            has_original_audio: 原视频是否包含音频
+            ratio: 原音的音量比例
         """
-        logger.info("混合音频")
+        logger.info(f"混合音频并合成视频: {len(placements)} 段解说")
+        
+        video = _ffmpeg().input(video_path)
+        layout = 'stereo' if NARRATION_CHANNELS == 2 else 'mono'
+        
+        streams = []
+        if has_original_audio:
+            streams.append(video.audio.filter('volume', ratio))
+        
+        for audio_path, start_time in placements:
+            ms = int(start_time * 1000)
+            narration = (
+                _fast_input(audio_path)
+                .audio
+                .filter('aformat', sample_rates=NARRATION_SAMPLE_RATE, channel_layouts=layout)
+                .filter('adelay', '|'.join([str(ms)] * NARRATION_CHANNELS))
+            )
+            # 只有与原音混合时才按比例降低解说音量
+            if has_original_audio:
+                narration = narration.filter('volume', 1 - ratio)
+            streams.append(narration)
+        
+        if not streams:
+            # 既无原音也无解说：生成静音轨
+            streams.append(
+                _ffmpeg().input(
+                    f'anullsrc=r={NARRATION_SAMPLE_RATE}:cl={layout}', format='lavfi'
+                ).audio
+            )
+        
+        if len(streams) > 1:
+            audio = _ffmpeg().filter(
+                streams, 'amix', inputs=len(streams), duration='longest', normalize=0
+            )
+        else:
+            audio = streams[0]
+        
+        # 与 NumPy 时间轴一致：补齐并截断到时间轴总时长
+        audio = (
+            audio
+            .filter('apad', whole_dur=total_duration)
+            .filter('atrim', end=total_duration)
+        )
         
         (
-            ffmpeg
-            .filter([
-                ffmpeg.input(audio1_path).audio,
-                ffmpeg.input(audio2_path).audio
-            ], 'amix', inputs=2, duration='longest', weights=f'{ratio} {1-ratio}')
-            .output(output_path)
+            _ffmpeg()
+            .output(
+                video.video,
+                audio,
+                output_path,
+                vcodec='copy',
+                acodec='aac',
+                audio_bitrate='192k',
+                **ENCODE_THREAD_OPTIONS
+            )
             .overwrite_output()
             .run(quiet=True)
         )
     
-    def _merge_video_audio(self, video_path: str, audio_path: str, output_path: str):
-        """合并视频和音频"""
-        logger.info("合并视频和音频")
+    def _mux_with_narration(self,
+                            video_path: str,
+                            narration_path: str,
+                            output_path: str,
+                            has_original_audio: bool = True,
+                            ratio: float = 0.3):
+        """
+        在一个 ffmpeg 进程中完成原音与解说的混合并封装到视频
         
-        video = ffmpeg.input(video_path)
-        audio = ffmpeg.input(audio_path)
+        Args:
+            video_path: 原视频路径
+            narration_path: 解说音频路径
+            output_path: 输出路径
+            has_original_audio: 原视频是否包含音频
+            ratio: 原音的音量比例
+        """
+        logger.info("混合音频并合成视频")
+        
+        video = _ffmpeg().input(video_path)
+        narration = _fast_input(narration_path)
+        
+        if has_original_audio:
+            audio = _ffmpeg().filter(
+                [video.audio, narration.audio],
+                'amix', inputs=2, duration='longest', weights=f'{ratio} {1-ratio}'
+            )
+        else:
+            audio = narration.audio
         
         (
-            ffmpeg
+            _ffmpeg()
             .output(
                 video.video,
-                audio.audio,
+                audio,
                 output_path,
                 vcodec='copy',
                 acodec='aac',
-                audio_bitrate='192k'
+                audio_bitrate='192k',
+                **ENCODE_THREAD_OPTIONS
             )
             .overwrite_output()
             .run(quiet=True)
@@ -210,17 +526,67 @@ class VideoProcessor:
         logger.info(f"剪切视频: {start_time}s - {end_time}s")
         
         duration = end_time - start_time
-        
-        (
-            ffmpeg
-            .input(video_path, ss=start_time, t=duration)
-            .output(output_path, vcodec='copy', acodec='copy')
-            .overwrite_output()
-            .run(quiet=True)
-        )
+        output_kwargs = {}
+        if Path(output_path).suffix.lower() in ('.mp4', '.mov'):
+            output_kwargs['movflags'] = '+faststart'
+        
+        prev_keyframe = self._find_prev_keyframe(video_path, start_time)
+        
+        if prev_keyframe is None or start_time - prev_keyframe <= KEYFRAME_SNAP_TOLERANCE:
+            # 起点靠近关键帧：输入端快速定位 + 流复制
+            (
+                _ffmpeg().input(video_path, ss=start_time, t=duration,
+                                noaccurate_seek=None, fflags='+genpts')
+                .output(output_path, vcodec='copy', acodec='copy',
+                        avoid_negative_ts='make_zero', **output_kwargs)
+                .overwrite_output()
+                .run(quiet=True)
+            )
+        else:
+            # 起点远离关键帧：定位到前一关键帧，再精确裁剪并重新编码
+            (
+                _ffmpeg().input(video_path, ss=prev_keyframe, fflags='+genpts')
+                .output(output_path, ss=start_time - prev_keyframe, t=duration,
+                        vcodec='libx264', preset='ultrafast', acodec='aac',
+                        **output_kwargs, **ENCODE_THREAD_OPTIONS)
+                .overwrite_output()
+                .run(quiet=True)
+            )
         
         return output_path
     
+    def _find_prev_keyframe(self, video_path: str, time_sec: float) -> Optional[float]:
+        """
+        查找指定时间之前（含）最近的关键帧时间
+        
+        Args:
+            video_path: 视频路径
+            time_sec: 时间（秒）
+            
+        Returns:
+            关键帧时间（秒），探测失败返回None
+        """
+        try:
+            probe = _ffmpeg().probe(
+                video_path,
+                select_streams='v:0',
+                skip_frame='nokey',
+                show_entries='frame=best_effort_timestamp_time',
+                read_intervals=f"{max(0.0, time_sec - KEYFRAME_SEARCH_WINDOW)}%{time_sec + 0.001}"
+            )
+        except Exception as e:
+            logger.warning(f"探测关键帧失败: {str(e)}")
+            return None
+        
+        keyframe_times = [
+            float(frame['best_effort_timestamp_time'])
+            for frame in probe.get('frames', [])
+            if 'best_effort_timestamp_time' in frame
+        ]
+        candidates = [t for t in keyframe_times if t <= time_sec]
+        
+        return max(candidates) if candidates else None
+    
     def concat_videos(self, 
                      video_paths: List[str],
                      output_path: str) -> str:
@@ -236,24 +602,14 @@ class VideoProcessor:
         """
         logger.info(f"拼接 {len(video_paths)} 个视频")
         
-        # 创建concat文件
-        concat_file = Path(config.TEMP_DIR) / f"concat_{os.getpid()}.txt"
-        with open(concat_file, 'w') as f:
-            for video_path in video_paths:
-                f.write(f"file '{os.path.abspath(video_path)}'\n")
-        
-        # 拼接
+        # 拼接（文件列表经标准输入传给 concat 分离器，无需临时文件）
         (
-            ffmpeg
-            .input(str(concat_file), format='concat', safe=0)
+            self._concat_input()
             .output(output_path, c='copy')
             .overwrite_output()
-            .run(quiet=True)
+            .run(input=self._concat_list(video_paths), quiet=True)
         )
         
-        # 清理
-        concat_file.unlink()
-        
         return output_path
     
     def add_subtitle(self,
@@ -278,11 +634,11 @@ class VideoProcessor:
         logger.info("添加字幕")
         
         (
-            ffmpeg
-            .input(video_path)
+            _ffmpeg().input(video_path)
             .output(
                 output_path,
-                vf=f"subtitles={subtitle_path}:force_style='FontSize={font_size},PrimaryColour={font_color}'"
+                vf=f"subtitles={subtitle_path}:force_style='FontSize={font_size},PrimaryColour={font_color}'",
+                **ENCODE_THREAD_OPTIONS
             )
             .overwrite_output()
             .run(quiet=True)
@@ -309,29 +665,151 @@ class VideoProcessor:
         """
         logger.info(f"转换视频格式: {format}, 质量: {quality}")
         
-        # 质量参数
-        quality_params = {
-            'low': {'crf': 28, 'preset': 'fast'},
-            'medium': {'crf': 23, 'preset': 'medium'},
-            'high': {'crf': 18, 'preset': 'slow'},
-        }
+        # 长视频：分段并行编码后拼接（硬件编码本身足够快，且并发会话受限）
+        if self.hw_encoder == 'libx264':
+            try:
+                duration = self.get_video_info(input_path)['duration']
+            except Exception as e:
+                logger.warning(f"获取视频时长失败，使用单进程编码: {str(e)}")
+                duration = 0
+            
+            if duration >= PARALLEL_ENCODE_MIN_DURATION:
+                try:
+                    params = self._quality_params('libx264', quality)
+                    return self._convert_parallel(input_path, output_path, params)
+                except Exception as e:
+                    logger.warning(f"分段并行编码失败，回退到单进程编码: {str(e)}")
+        else:
+            try:
+                with _hw_encode_semaphore:
+                    self._encode(input_path, output_path, self.hw_encoder, quality)
+                return output_path
+            except Exception as e:
+                logger.warning(f"硬件编码失败，回退到libx264: {str(e)}")
+        
+        self._encode(input_path, output_path, 'libx264', quality)
         
-        params = quality_params.get(quality, quality_params['medium'])
+        return output_path
+    
+    def _quality_params(self, encoder: str, quality: str) -> Dict:
+        """获取编码器对应的质量参数"""
+        params = ENCODER_QUALITY_PARAMS[encoder]
+        return params.get(quality, params['medium'])
+    
+    def _encode(self, input_path: str, output_path: str, encoder: str, quality: str):
+        """使用指定编码器整体转码"""
+        (
+            _ffmpeg().input(input_path)
+            .output(
+                output_path,
+                vcodec=encoder,
+                acodec='aac',
+                **self._quality_params(encoder, quality),
+                **ENCODE_THREAD_OPTIONS
+            )
+            .overwrite_output()
+            .run(quiet=True)
+        )
+    
+    def _convert_parallel(self, input_path: str, output_path: str, params: Dict) -> str:
+        """
+        分段并行编码：按关键帧切分 → 并行编码视频 → 拼接并编码音频
+        
+        Args:
+            input_path: 输入路径
+            output_path: 输出路径
+            params: 编码质量参数（crf, preset）
+            
+        Returns:
+            输出路径
+        """
+        temp_dir = Path(config.TEMP_DIR) / f"convert_{os.getpid()}_{id(self)}"
+        temp_dir.mkdir(parents=True, exist_ok=True)
+        
+        try:
+            segments = self._split(input_path, temp_dir)
+            workers = max(1, (os.cpu_count() or 2) // PARALLEL_ENCODE_THREADS)
+            logger.info(f"分段并行编码: {len(segments)} 段, {workers} 个进程")
+            
+            encoded = [str(Path(seg).with_name(f"enc_{Path(seg).name}")) for seg in segments]
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(self._encode_segment, seg, out, params)
+                    for seg, out in zip(segments, encoded)
+                ]
+                for future in futures:
+                    future.result()
+            
+            # 拼接视频段，音频从原视频整体编码一次
+            video = self._concat_input(intermediate=True)
+            streams = [video.video]
+            if self._has_audio(input_path):
+                streams.append(_ffmpeg().input(input_path).audio)
+            
+            (
+                _ffmpeg()
+                .output(*streams, output_path, vcodec='copy', acodec='aac',
+                        **ENCODE_THREAD_OPTIONS)
+                .overwrite_output()
+                .run(input=self._concat_list(encoded), quiet=True)
+            )
+            
+            return output_path
+        finally:
+            self._cleanup_temp_files(temp_dir)
+    
+    def _split(self, input_path: str, temp_dir: Path,
+               segment_time: int = PARALLEL_ENCODE_SEGMENT_TIME) -> List[str]:
+        """按关键帧将视频流无损切分为多段"""
+        (
+            _ffmpeg().input(input_path)
+            .output(
+                str(temp_dir / "seg_%04d.mkv"),
+                map='0:v:0',
+                c='copy',
+                f='segment',
+                segment_time=segment_time,
+                reset_timestamps=1
+            )
+            .overwrite_output()
+            .run(quiet=True)
+        )
         
+        return sorted(str(p) for p in temp_dir.glob("seg_*.mkv"))
+    
+    def _encode_segment(self, segment_path: str, output_path: str, params: Dict):
+        """编码单个视频段"""
         (
-            ffmpeg
-            .input(input_path)
+            _fast_input(segment_path)
             .output(
                 output_path,
                 vcodec='libx264',
-                acodec='aac',
+                threads=PARALLEL_ENCODE_THREADS,
                 **params
             )
             .overwrite_output()
             .run(quiet=True)
         )
+    
+    def _concat_input(self, intermediate: bool = False):
+        """
+        从标准输入读取文件列表的 concat 分离器输入
         
-        return output_path
+        Args:
+            intermediate: 列表中是否都是处理流程自己生成的中间文件（是则使用快速探测）
+        """
+        open_input = _fast_input if intermediate else _ffmpeg().input
+        return open_input(
+            'pipe:', format='concat', safe=0, protocol_whitelist='pipe,file'
+        )
+    
+    def _concat_list(self, paths: List[str]) -> bytes:
+        """生成 concat 分离器使用的文件列表"""
+        lines = []
+        for path in paths:
+            escaped = os.path.abspath(path).replace("'", "'\\''")
+            lines.append(f"file '{escaped}'\n")
+        return ''.join(lines).encode('utf-8')
     
     def get_video_info(self, video_path: str) -> Dict:
         """
@@ -343,7 +821,7 @@ class VideoProcessor:
         Returns:
             视频信息字典
         """
-        probe = ffmpeg.probe(video_path)
+        probe = self._probe_cached(video_path)
         
         video_stream = next(
             (s for s in probe['streams'] if s['codec_type'] == 'video'),
@@ -363,7 +841,7 @@ class VideoProcessor:
                 'codec': video_stream['codec_name'] if video_stream else None,
                 'width': video_stream['width'] if video_stream else None,
                 'height': video_stream['height'] if video_stream else None,
-                'fps': eval(video_stream['r_frame_rate']) if video_stream else None,
+                'fps': parse_frame_rate(video_stream['r_frame_rate']) if video_stream else None,
             },
             'audio': {
                 'codec': audio_stream['codec_name'] if audio_stream else None,
@@ -2,8 +2,10 @@
 数据库管理器
 """
 
+import os
 import sqlite3
 import json
+import threading
 from typing import Dict, List, Optional
 from pathlib import Path
 from datetime import datetime
@@ -12,6 +14,14 @@ import config
 
 logger = get_logger(__name__)
 
+# 每个连接缓存的预编译语句数
+STATEMENT_CACHE_SIZE = 256
+
+# 高频查询语句（固定文本，命中 sqlite3 预编译语句缓存）
+SQL_GET_PROJECT = "SELECT * FROM projects WHERE id = ?"
+SQL_GET_PROJECT_SCENES = "SELECT * FROM scenes WHERE project_id = ? ORDER BY scene_index"
+SQL_GET_PROJECT_SCRIPTS = "SELECT * FROM scripts WHERE project_id = ?"
+SQL_GET_SETTING = "SELECT value FROM settings WHERE key = ?"
 
 class DatabaseManager:
     """数据库管理器"""
@@ -25,6 +35,12 @@ class DatabaseManager:
         """
         self.db_path = db_path or config.LOCAL_DB_PATH
         
+        # 线程本地连接缓存（工作线程结束时其连接随 threading.local 一起回收）
+        self._local = threading.local()
+        # 主线程的连接，应用退出时由 close_all 关闭
+        self._connections = []
+        self._connections_lock = threading.Lock()
+        
         # 确保数据库目录存在
         Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
         
@@ -38,6 +54,9 @@ class DatabaseManager:
         conn = self._get_connection()
         cursor = conn.cursor()
         
+        # WAL 日志模式（持久化到数据库文件）
+        cursor.execute("PRAGMA journal_mode=WAL")
+        
         # 项目表
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS projects (
@@ -49,10 +68,20 @@ class DatabaseManager:
                 updated_at TEXT,
                 version INTEGER,
                 status TEXT,
-                metadata TEXT
+                metadata TEXT,
+                video_metadata TEXT,
+                video_mtime REAL,
+                video_size INTEGER
             )
         """)
         
+        # 旧版本数据库补充视频元数据缓存列
+        self._ensure_columns(cursor, 'projects', {
+            'video_metadata': 'TEXT',
+            'video_mtime': 'REAL',
+            'video_size': 'INTEGER',
+        })
+        
         # 镜头表
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS scenes (
@@ -128,17 +157,68 @@ class DatabaseManager:
             )
         """)
         
+        # 索引（外键列及有序读取）
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_scenes_project ON scenes(project_id, scene_index)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_keyframes_project ON keyframes(project_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_keyframes_scene ON keyframes(scene_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_scripts_project ON scripts(project_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_audios_project ON audios(project_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_projects_video_path ON projects(video_path)")
+        
         conn.commit()
-        conn.close()
         
         logger.info("数据库表初始化完成")
     
+    def _ensure_columns(self, cursor: sqlite3.Cursor, table: str, columns: Dict[str, str]):
+        """为已存在的表补充缺失的列"""
+        cursor.execute(f"PRAGMA table_info({table})")
+        existing = {row[1] for row in cursor.fetchall()}
+        
+        for name, col_type in columns.items():
+            if name not in existing:
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN {name} {col_type}")
+                logger.info(f"数据库表 {table} 新增列: {name}")
+    
     def _get_connection(self) -> sqlite3.Connection:
-        """获取数据库连接"""
-        conn = sqlite3.connect(self.db_path)
+        """获取数据库连接（每个线程复用同一个连接）"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            return conn
+        
+        conn = sqlite3.connect(self.db_path, cached_statements=STATEMENT_CACHE_SIZE)
         conn.row_factory = sqlite3.Row
+        
+        # 连接级性能参数
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA mmap_size=268435456")
+        
+        self._local.conn = conn
+        
+        # 只登记主线程的连接；工作线程的连接不能被其他线程关闭，
+        # 若在此保留引用会一直存活到进程退出
+        if threading.current_thread() is threading.main_thread():
+            with self._connections_lock:
+                self._connections.append(conn)
+        
         return conn
     
+    def close_all(self):
+        """关闭主线程的数据库连接（应用退出时调用，工作线程的连接在线程结束时已回收）"""
+        with self._connections_lock:
+            connections = self._connections
+            self._connections = []
+        
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.ProgrammingError:
+                # 不在主线程调用时无法关闭主线程的连接
+                pass
+        
+        self._local = threading.local()
+        logger.info("数据库连接已关闭")
+    
     # ==================== 项目操作 ====================
     
     def save_project(self, project: Dict):
@@ -163,7 +243,6 @@ class DatabaseManager:
         ))
         
         conn.commit()
-        conn.close()
         
         logger.info(f"项目已保存: {project['id']}")
     
@@ -172,11 +251,9 @@ class DatabaseManager:
         conn = self._get_connection()
         cursor = conn.cursor()
         
-        cursor.execute("SELECT * FROM projects WHERE id = ?", (project_id,))
+        cursor.execute(SQL_GET_PROJECT, (project_id,))
         row = cursor.fetchone()
         
-        conn.close()
-        
         if row:
             return dict(row)
         return None
@@ -189,8 +266,6 @@ class DatabaseManager:
         cursor.execute("SELECT * FROM projects ORDER BY updated_at DESC")
         rows = cursor.fetchall()
         
-        conn.close()
-        
         return [dict(row) for row in rows]
     
     def update_project(self, project_id: str, updates: Dict):
@@ -210,40 +285,81 @@ class DatabaseManager:
         )
         
         conn.commit()
-        conn.close()
         
         logger.info(f"项目已更新: {project_id}")
     
     def delete_project(self, project_id: str):
-        """删除项目"""
+        """删除项目（连同镜头、关键帧、文案、音频）"""
         conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("DELETE FROM projects WHERE id = ?", (project_id,))
         
-        conn.commit()
-        conn.close()
+        # 文案可能引用不在 scenes 表中的 scene_id（如整段解说），
+        # 因此不依赖 PRAGMA foreign_keys，按 project_id 显式级联删除
+        with conn:
+            for table in ('keyframes', 'scripts', 'audios', 'scenes'):
+                conn.execute(f"DELETE FROM {table} WHERE project_id = ?", (project_id,))
+            conn.execute("DELETE FROM projects WHERE id = ?", (project_id,))
         
         logger.info(f"项目已删除: {project_id}")
     
-    # ==================== 镜头操作 ====================
+    # ==================== 视频元数据缓存 ====================
     
-    def save_project_scenes(self, project_id: str, scenes: List[Dict]):
-        """保存项目的镜头列表"""
+    def get_cached_probe(self, video_path: str) -> Optional[Dict]:
+        """
+        获取缓存的视频探测结果
+        
+        仅当文件的修改时间和大小与缓存时一致时返回缓存
+        
+        Args:
+            video_path: 视频路径
+            
+        Returns:
+            ffprobe 结果字典，未命中返回None
+        """
+        try:
+            stat = os.stat(video_path)
+        except OSError:
+            return None
+        
         conn = self._get_connection()
         cursor = conn.cursor()
         
-        # 先删除旧数据
-        cursor.execute("DELETE FROM scenes WHERE project_id = ?", (project_id,))
+        cursor.execute("""
+            SELECT video_metadata, video_mtime, video_size FROM projects
+            WHERE video_path = ? AND video_metadata IS NOT NULL
+            LIMIT 1
+        """, (video_path,))
+        row = cursor.fetchone()
         
-        # 插入新数据
-        for scene in scenes:
-            cursor.execute("""
-                INSERT INTO scenes 
-                (id, project_id, scene_index, start_time, end_time, duration, 
-                 start_frame, end_frame, metadata)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
+        if row and row['video_mtime'] == stat.st_mtime and row['video_size'] == stat.st_size:
+            return json.loads(row['video_metadata'])
+        return None
+    
+    def set_cached_probe(self, video_path: str, metadata: Dict):
+        """
+        缓存视频探测结果到对应项目
+        
+        Args:
+            video_path: 视频路径
+            metadata: ffprobe 结果字典
+        """
+        stat = os.stat(video_path)
+        
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute("""
+            UPDATE projects SET video_metadata = ?, video_mtime = ?, video_size = ?
+            WHERE video_path = ?
+        """, (json.dumps(metadata), stat.st_mtime, stat.st_size, video_path))
+        
+        conn.commit()
+    
+    # ==================== 镜头操作 ====================
+    
+    def save_project_scenes(self, project_id: str, scenes: List[Dict]):
+        """保存项目的镜头列表"""
+        rows = [
+            (
                 scene['id'],
                 project_id,
                 scene['index'],
@@ -253,10 +369,21 @@ class DatabaseManager:
                 scene['start_frame'],
                 scene['end_frame'],
                 json.dumps(scene.get('metadata', {}))
-            ))
+            )
+            for scene in scenes
+        ]
         
-        conn.commit()
-        conn.close()
+        conn = self._get_connection()
+        
+        # 删除旧数据并批量插入（单个事务）
+        with conn:
+            conn.execute("DELETE FROM scenes WHERE project_id = ?", (project_id,))
+            conn.executemany("""
+                INSERT INTO scenes 
+                (id, project_id, scene_index, start_time, end_time, duration, 
+                 start_frame, end_frame, metadata)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
         
         logger.info(f"镜头已保存: {len(scenes)} 个")
     
@@ -265,44 +392,39 @@ class DatabaseManager:
         conn = self._get_connection()
         cursor = conn.cursor()
         
-        cursor.execute(
-            "SELECT * FROM scenes WHERE project_id = ? ORDER BY scene_index",
-            (project_id,)
-        )
+        cursor.execute(SQL_GET_PROJECT_SCENES, (project_id,))
         rows = cursor.fetchall()
         
-        conn.close()
-        
         return [dict(row) for row in rows]
     
     # ==================== 文案操作 ====================
     
     def save_project_scripts(self, project_id: str, scripts: List[Dict]):
         """保存项目的文案列表"""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        # 先删除旧数据
-        cursor.execute("DELETE FROM scripts WHERE project_id = ?", (project_id,))
-        
-        # 插入新数据
-        for script in scripts:
-            cursor.execute("""
-                INSERT INTO scripts 
-                (scene_id, project_id, script, word_count, created_at, updated_at, metadata)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (
+        now = datetime.now().isoformat()
+        rows = [
+            (
                 script['scene_id'],
                 project_id,
                 script['script'],
                 script.get('word_count', len(script['script'])),
-                datetime.now().isoformat(),
-                datetime.now().isoformat(),
+                now,
+                now,
                 json.dumps(script.get('metadata', {}))
-            ))
+            )
+            for script in scripts
+        ]
         
-        conn.commit()
-        conn.close()
+        conn = self._get_connection()
+        
+        # 删除旧数据并批量插入（单个事务）
+        with conn:
+            conn.execute("DELETE FROM scripts WHERE project_id = ?", (project_id,))
+            conn.executemany("""
+                INSERT INTO scripts 
+                (scene_id, project_id, script, word_count, created_at, updated_at, metadata)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, rows)
         
         logger.info(f"文案已保存: {len(scripts)} 个")
     
@@ -311,14 +433,9 @@ class DatabaseManager:
         conn = self._get_connection()
         cursor = conn.cursor()
         
-        cursor.execute(
-            "SELECT * FROM scripts WHERE project_id = ?",
-            (project_id,)
-        )
+        cursor.execute(SQL_GET_PROJECT_SCRIPTS, (project_id,))
         rows = cursor.fetchall()
         
-        conn.close()
-        
         return [dict(row) for row in rows]
     
     # ==================== 设置操作 ====================
@@ -334,18 +451,15 @@ class DatabaseManager:
         """, (key, value, datetime.now().isoformat()))
         
         conn.commit()
-        conn.close()
     
     def get_setting(self, key: str, default: str = None) -> Optional[str]:
         """获取配置项"""
         conn = self._get_connection()
         cursor = conn.cursor()
         
-        cursor.execute("SELECT value FROM settings WHERE key = ?", (key,))
+        cursor.execute(SQL_GET_SETTING, (key,))
         row = cursor.fetchone()
         
-        conn.close()
-        
         if row:
             return row['value']
         return default
@@ -2,27 +2,64 @@
 导出对话框
 """
 
+import os
+import json
+import shutil
+import tempfile
+from typing import Optional
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel,
     QLineEdit, QPushButton, QFileDialog, QComboBox,
-    QGroupBox, QFormLayout, QCheckBox, QSpinBox
+    QGroupBox, QFormLayout, QCheckBox, QSpinBox, QMessageBox
 )
 from PyQt6.QtCore import Qt
 from pathlib import Path
+from database.db_manager import DatabaseManager
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# 各质量档位的预估码率（比特/秒，含音频），用于导出前的磁盘空间检查
+QUALITY_BITRATES = {
+    'high': 8_000_000,
+    'medium': 4_000_000,
+    'low': 2_000_000,
+}
+
+# 剩余空间低于预估大小的该倍数时提示用户
+DISK_SPACE_MARGIN = 1.5
+
+# 上次导出设置在 settings 表中的键名
+EXPORT_DEFAULTS_KEY = 'export_defaults'
+
+# 质量选项文本与取值的对应关系
+QUALITY_MAP = {
+    "高质量": "high",
+    "中等质量": "medium",
+    "低质量": "low",
+}
+
 
 class ExportDialog(QDialog):
     """导出对话框"""
     
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, video_duration: float = 0,
+                 db: Optional[DatabaseManager] = None):
+        """
+        Args:
+            parent: 父窗口
+            video_duration: 待导出视频时长（秒），用于预估输出大小
+            db: 数据库管理器（用于记住上次的导出设置）
+        """
         super().__init__(parent)
         
         self.output_path = ""
+        self.video_duration = video_duration
+        self.db = db
+        self.output_dir = ""
         
         self._init_ui()
+        self._restore_settings()
         logger.info("导出对话框初始化完成")
     
     def _init_ui(self):
@@ -118,7 +155,7 @@ class ExportDialog(QDialog):
         file_path, _ = QFileDialog.getSaveFileName(
             self,
             "选择输出路径",
-            "",
+            self.output_dir,
             "MP4文件 (*.mp4);;AVI文件 (*.avi);;MOV文件 (*.mov);;所有文件 (*.*)"
         )
         
@@ -129,24 +166,116 @@ class ExportDialog(QDialog):
     def accept_export(self):
         """确认导出"""
         if not self.output_path:
-            from PyQt6.QtWidgets import QMessageBox
             QMessageBox.warning(self, "警告", "请选择输出路径")
             return
         
+        if not self._check_output_path():
+            return
+        
+        self._save_settings()
         self.accept()
     
+    def _check_output_path(self) -> bool:
+        """
+        导出前检查输出目录是否可写、磁盘空间是否足够
+        
+        Returns:
+            是否继续导出
+        """
+        output_dir = os.path.dirname(os.path.abspath(self.output_path))
+        
+        # 可写性检查（在目标目录创建临时文件，不影响目标文件本身）
+        try:
+            with tempfile.TemporaryFile(dir=output_dir):
+                pass
+        except OSError as e:
+            QMessageBox.warning(self, "警告", f"输出目录不可写: {output_dir}\n{str(e)}")
+            return False
+        
+        if self.video_duration <= 0:
+            return True
+        
+        # 按时长×码率预估输出大小
+        quality = self.get_settings()['quality']
+        expected_bytes = int(self.video_duration * QUALITY_BITRATES[quality] / 8)
+        free_bytes = shutil.disk_usage(output_dir).free
+        
+        expected_mb = expected_bytes / 1024 / 1024
+        free_mb = free_bytes / 1024 / 1024
+        
+        if free_bytes < expected_bytes:
+            QMessageBox.warning(
+                self, "警告",
+                f"磁盘空间不足\n预计需要: {expected_mb:.0f} MB\n剩余空间: {free_mb:.0f} MB"
+            )
+            return False
+        
+        if free_bytes < expected_bytes * DISK_SPACE_MARGIN:
+            reply = QMessageBox.question(
+                self, "确认",
+                f"磁盘剩余空间可能不足\n预计需要: {expected_mb:.0f} MB\n"
+                f"剩余空间: {free_mb:.0f} MB\n\n是否继续导出？",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+            )
+            return reply == QMessageBox.StandardButton.Yes
+        
+        return True
+    
+    def _restore_settings(self):
+        """恢复上次的导出设置"""
+        if not self.db:
+            return
+        
+        try:
+            defaults = json.loads(self.db.get_setting(EXPORT_DEFAULTS_KEY, '{}'))
+        except Exception as e:
+            logger.warning(f"读取导出设置失败: {str(e)}")
+            return
+        
+        if 'format' in defaults:
+            index = self.format_combo.findText(defaults['format'].upper())
+            if index >= 0:
+                self.format_combo.setCurrentIndex(index)
+        
+        quality_texts = {value: text for text, value in QUALITY_MAP.items()}
+        if defaults.get('quality') in quality_texts:
+            self.quality_combo.setCurrentText(quality_texts[defaults['quality']])
+        
+        if 'resolution' in defaults:
+            index = self.resolution_combo.findText(defaults['resolution'])
+            if index >= 0:
+                self.resolution_combo.setCurrentIndex(index)
+        
+        if 'fps' in defaults:
+            self.fps_spin.setValue(int(defaults['fps']))
+        
+        if 'keep_original_audio' in defaults:
+            self.keep_original_audio.setChecked(bool(defaults['keep_original_audio']))
+        
+        if 'audio_volume' in defaults:
+            self.audio_volume_spin.setValue(round(defaults['audio_volume'] * 100))
+        
+        self.output_dir = defaults.get('output_dir', '')
+    
+    def _save_settings(self):
+        """保存本次导出设置（只记住输出目录，不记住文件名）"""
+        if not self.db:
+            return
+        
+        settings = self.get_settings()
+        settings['output_dir'] = os.path.dirname(settings.pop('output_path'))
+        
+        try:
+            self.db.set_setting(EXPORT_DEFAULTS_KEY, json.dumps(settings, ensure_ascii=False))
+        except Exception as e:
+            logger.warning(f"保存导出设置失败: {str(e)}")
+    
     def get_settings(self) -> dict:
         """获取导出设置"""
-        quality_map = {
-            "高质量": "high",
-            "中等质量": "medium",
-            "低质量": "low"
-        }
-        
         return {
             'output_path': self.output_path,
             'format': self.format_combo.currentText().lower(),
-            'quality': quality_map[self.quality_combo.currentText()],
+            'quality': QUALITY_MAP[self.quality_combo.currentText()],
             'resolution': self.resolution_combo.currentText(),
             'fps': self.fps_spin.value(),
             'keep_original_audio': self.keep_original_audio.isChecked(),
@@ -4,15 +4,23 @@
 
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
-    QLineEdit, QTextEdit, QPushButton, QFileDialog,
+    QLineEdit, QPlainTextEdit, QPushButton, QFileDialog,
     QGroupBox, QFormLayout, QMessageBox
 )
 from PyQt6.QtCore import Qt
-from pathlib import Path
+import os
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# 支持的视频扩展名
+VIDEO_EXTENSIONS = frozenset({'.mp4', '.avi', '.mov', '.mkv', '.flv'})
+
+# 视频文件过滤器
+VIDEO_FILTER = (
+    f"视频文件 ({' '.join('*' + ext for ext in sorted(VIDEO_EXTENSIONS))});;所有文件 (*.*)"
+)
+
 
 class ImportDialog(QDialog):
     """导入对话框"""
@@ -57,7 +65,7 @@ class ImportDialog(QDialog):
         self.name_edit.setPlaceholderText("输入项目名称")
         info_layout.addRow("项目名称:", self.name_edit)
         
-        self.desc_edit = QTextEdit()
+        self.desc_edit = QPlainTextEdit()
         self.desc_edit.setPlaceholderText("输入项目描述（可选）")
         self.desc_edit.setMaximumHeight(80)
         info_layout.addRow("项目描述:", self.desc_edit)
@@ -79,14 +87,25 @@ class ImportDialog(QDialog):
         
         layout.addLayout(button_layout)
     
+    def reset(self):
+        """清空上次输入（对话框复用时调用）"""
+        self.video_path = ""
+        self.project_name = ""
+        self.description = ""
+        
+        self.video_path_edit.clear()
+        self.name_edit.clear()
+        self.desc_edit.clear()
+    
     def browse_video(self):
         """浏览视频文件"""
-        file_path, _ = QFileDialog.getOpenFileName(
-            self,
-            "选择视频文件",
-            "",
-            "视频文件 (*.mp4 *.avi *.mov *.mkv *.flv);;所有文件 (*.*)"
-        )
+        # 不加载自定义目录图标、不解析符号链接，减少大目录/网络盘上的逐项查询
+        dialog = QFileDialog(self, "选择视频文件", "", VIDEO_FILTER)
+        dialog.setOption(QFileDialog.Option.DontUseCustomDirectoryIcons, True)
+        dialog.setOption(QFileDialog.Option.DontResolveSymlinks, True)
+        dialog.setFileMode(QFileDialog.FileMode.ExistingFile)
+        
+        file_path = dialog.selectedFiles()[0] if dialog.exec() else ""
         
         if file_path:
             self.video_path = file_path
@@ -94,7 +113,7 @@ class ImportDialog(QDialog):
             
             # 自动填充项目名称
             if not self.name_edit.text():
-                file_name = Path(file_path).stem
+                file_name = os.path.splitext(os.path.basename(file_path))[0]
                 self.name_edit.setText(file_name)
     
     def accept_import(self):
@@ -5,11 +5,12 @@
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
     QSplitter, QMenuBar, QMenu, QToolBar, QStatusBar,
-    QFileDialog, QMessageBox, QDockWidget
+    QFileDialog, QMessageBox, QDockWidget, QApplication
 )
-from PyQt6.QtCore import Qt, QTimer, pyqtSignal
+from PyQt6.QtCore import Qt, QObject, QRunnable, QThreadPool, QTimer, QThread, pyqtSignal
 from PyQt6.QtGui import QAction, QIcon, QKeySequence
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 from .import_dialog import ImportDialog
 from .scene_editor import SceneEditor
@@ -20,20 +21,114 @@ from .widgets.video_player import VideoPlayer
 from .widgets.timeline import Timeline
 from .widgets.scene_card import SceneListWidget
 from .widgets.progress_dialog import ProgressDialog
+from .workers import (
+    PipelineWorker, AnalyzeWorker, ScriptDataWorker, CommentaryWorker, VoiceWorker,
+    create_scene_detector, create_keyframe_extractor, create_highlight_selector,
+    create_subtitle_extractor, create_script_analyzer,
+    create_script_generator, create_tts_engine
+)
 
 from core.project_manager import ProjectManager
-from core.video_analyzer import VideoAnalyzer
-from core.scene_detector import SceneDetector
-from core.keyframe_extractor import KeyframeExtractor
-from core.script_generator import ScriptGenerator
-from core.tts_engine import TTSEngine
-from core.video_processor import VideoProcessor
 
 from utils.logger import get_logger
 import config
 
 logger = get_logger(__name__)
 
+# 图标目录
+ICONS_DIR = Path("resources/icons")
+
+# 样式表缓存：文件路径 -> (修改时间, 内容)
+_QSS_CACHE = {}
+
+# 位置同步信号的合并间隔（毫秒）
+SEEK_DEBOUNCE_MS = 50       # 时间轴 → 播放器跳转
+POSITION_DEBOUNCE_MS = 16   # 播放器 → 时间轴刷新（约一帧）
+
+
+class _Debouncer(QObject):
+    """信号合并器：间隔内的多次触发只转发最后一个值"""
+    
+    fired = pyqtSignal(object)
+    
+    def __init__(self, interval_ms: int, parent=None):
+        super().__init__(parent)
+        self._value = None
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self._fire)
+    
+    def push(self, value):
+        """记录最新值，间隔结束时转发"""
+        self._value = value
+        # 计时中不重新计时，保证持续触发时也能按间隔转发
+        if not self._timer.isActive():
+            self._timer.start()
+    
+    def _fire(self):
+        self.fired.emit(self._value)
+
+
+class _StyleLoader(QRunnable):
+    """在线程池中读取样式表，读取完成后通过信号交回主线程应用"""
+    
+    class Signals(QObject):
+        loaded = pyqtSignal(str)
+    
+    def __init__(self, style_file: Path):
+        super().__init__()
+        self.style_file = style_file
+        self.signals = _StyleLoader.Signals()
+    
+    def run(self):
+        if not self.style_file.exists():
+            return
+        
+        try:
+            # 文件未修改时复用缓存的内容
+            key = str(self.style_file)
+            mtime = self.style_file.stat().st_mtime
+            cached = _QSS_CACHE.get(key)
+            if cached and cached[0] == mtime:
+                stylesheet = cached[1]
+            else:
+                stylesheet = self.style_file.read_text(encoding='utf-8')
+                _QSS_CACHE[key] = (mtime, stylesheet)
+        except OSError as e:
+            logger.warning(f"读取样式表失败: {str(e)}")
+            return
+        
+        self.signals.loaded.emit(stylesheet)
+
+
+class _Icons:
+    """图标缓存（每个图标在进程生命周期内只加载一次）"""
+    
+    _cache = {}
+    
+    @classmethod
+    def get(cls, name: str) -> QIcon:
+        """
+        获取图标
+        
+        Args:
+            name: 图标名（不含扩展名）
+            
+        Returns:
+            图标，文件不存在时返回空图标
+        """
+        icon = cls._cache.get(name)
+        if icon is None:
+            icon = QIcon()
+            for ext in ('svg', 'png'):
+                icon_file = ICONS_DIR / f"{name}.{ext}"
+                if icon_file.exists():
+                    icon = QIcon(str(icon_file))
+                    break
+            cls._cache[name] = icon
+        return icon
+
 
 class MainWindow(QMainWindow):
     """主窗口"""
@@ -49,6 +144,34 @@ class MainWindow(QMainWindow):
         self.current_project = None
         self.current_project_id = None
         
+        # 镜头/文案索引（随 current_project 中的列表同步更新）
+        self._scenes_by_id = {}
+        self._scripts_by_scene = {}
+        
+        # 自上次保存以来有改动的数据段（保存时只写这些）
+        self._dirty = set()
+        
+        # 时间轴跳转时屏蔽播放器位置回写，避免两者互相触发
+        self._suppress_position_sync = False
+        
+        # 后台任务状态（同一时间只允许运行一个处理流程）
+        self._busy = False
+        self._worker = None
+        self._worker_thread = None
+        self._progress = None
+        self._on_worker_finished = None
+        self._worker_error_title = ""
+        
+        # 处理引擎缓存（进程内只创建一次；下一阶段的引擎在等待用户确认期间预先创建）
+        self._prewarm_pool = ThreadPoolExecutor(max_workers=1)
+        self._engines = {}
+        
+        # 按需创建的停靠窗口与对话框
+        self._scene_editor_dock = None
+        self._voice_settings_dock = None
+        self._import_dialog = None
+        self._export_dialog = None
+        
         self._init_ui()
         self._init_menu()
         self._init_toolbar()
@@ -104,23 +227,39 @@ class MainWindow(QMainWindow):
         self.timeline = Timeline()
         main_layout.addWidget(self.timeline)
         
-        # 镜头编辑器（停靠窗口）
-        self.scene_editor_dock = QDockWidget("镜头编辑器", self)
-        self.scene_editor = SceneEditor()
-        self.scene_editor_dock.setWidget(self.scene_editor)
-        self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, self.scene_editor_dock)
-        self.scene_editor_dock.hide()
-        
-        # 配音设置（停靠窗口）
-        self.voice_settings_dock = QDockWidget("配音设置", self)
-        self.voice_settings = VoiceSettings()
-        self.voice_settings_dock.setWidget(self.voice_settings)
-        self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, self.voice_settings_dock)
-        self.voice_settings_dock.hide()
-        
         # 加载样式表
         self._load_stylesheet()
     
+    def _get_scene_editor_dock(self) -> QDockWidget:
+        """获取镜头编辑器停靠窗口（首次使用时创建）"""
+        if self._scene_editor_dock is None:
+            self._scene_editor_dock = QDockWidget("镜头编辑器", self)
+            self._scene_editor_dock.setWidget(SceneEditor())
+            self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, self._scene_editor_dock)
+            self._scene_editor_dock.hide()
+        return self._scene_editor_dock
+    
+    def _get_voice_settings_dock(self) -> QDockWidget:
+        """获取配音设置停靠窗口（首次使用时创建）"""
+        if self._voice_settings_dock is None:
+            self._voice_settings_dock = QDockWidget("配音设置", self)
+            # 与配音合成共用同一个 TTS 引擎
+            tts_engine = self._get_engine('tts_engine', create_tts_engine).result()
+            self._voice_settings_dock.setWidget(VoiceSettings(tts_engine=tts_engine))
+            self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, self._voice_settings_dock)
+            self._voice_settings_dock.hide()
+        return self._voice_settings_dock
+    
+    @property
+    def scene_editor(self) -> SceneEditor:
+        """镜头编辑器"""
+        return self._get_scene_editor_dock().widget()
+    
+    @property
+    def voice_settings(self) -> VoiceSettings:
+        """配音设置"""
+        return self._get_voice_settings_dock().widget()
+    
     def _init_menu(self):
         """初始化菜单栏"""
         menubar = self.menuBar()
@@ -128,35 +267,35 @@ class MainWindow(QMainWindow):
         # 文件菜单
         file_menu = menubar.addMenu("文件(&F)")
         
-        new_action = QAction("新建项目(&N)", self)
+        new_action = QAction(_Icons.get('new'), "新建项目(&N)", self)
         new_action.setShortcut(QKeySequence.StandardKey.New)
         new_action.triggered.connect(self.new_project)
         file_menu.addAction(new_action)
         
-        open_action = QAction("打开项目(&O)", self)
+        open_action = QAction(_Icons.get('open'), "打开项目(&O)", self)
         open_action.setShortcut(QKeySequence.StandardKey.Open)
         open_action.triggered.connect(self.open_project)
         file_menu.addAction(open_action)
         
-        save_action = QAction("保存项目(&S)", self)
+        save_action = QAction(_Icons.get('save'), "保存项目(&S)", self)
         save_action.setShortcut(QKeySequence.StandardKey.Save)
         save_action.triggered.connect(self.save_project)
         file_menu.addAction(save_action)
         
         file_menu.addSeparator()
         
-        import_action = QAction("导入视频(&I)", self)
+        import_action = QAction(_Icons.get('import'), "导入视频(&I)", self)
         import_action.triggered.connect(self.import_video)
         file_menu.addAction(import_action)
         
-        export_action = QAction("导出视频(&E)", self)
+        export_action = QAction(_Icons.get('export'), "导出视频(&E)", self)
         export_action.setShortcut(QKeySequence("Ctrl+E"))
         export_action.triggered.connect(self.export_video)
         file_menu.addAction(export_action)
         
         file_menu.addSeparator()
         
-        exit_action = QAction("退出(&X)", self)
+        exit_action = QAction(_Icons.get('exit'), "退出(&X)", self)
         exit_action.setShortcut(QKeySequence.StandardKey.Quit)
         exit_action.triggered.connect(self.close)
         file_menu.addAction(exit_action)
@@ -164,34 +303,34 @@ class MainWindow(QMainWindow):
         # 编辑菜单
         edit_menu = menubar.addMenu("编辑(&E)")
         
-        undo_action = QAction("撤销(&U)", self)
+        undo_action = QAction(_Icons.get('undo'), "撤销(&U)", self)
         undo_action.setShortcut(QKeySequence.StandardKey.Undo)
         edit_menu.addAction(undo_action)
         
-        redo_action = QAction("重做(&R)", self)
+        redo_action = QAction(_Icons.get('redo'), "重做(&R)", self)
         redo_action.setShortcut(QKeySequence.StandardKey.Redo)
         edit_menu.addAction(redo_action)
         
         # 视图菜单
         view_menu = menubar.addMenu("视图(&V)")
         
-        scene_editor_action = QAction("镜头编辑器", self)
+        scene_editor_action = QAction(_Icons.get('scene_editor'), "镜头编辑器", self)
         scene_editor_action.setCheckable(True)
         scene_editor_action.triggered.connect(
-            lambda checked: self.scene_editor_dock.setVisible(checked)
+            lambda checked: self._get_scene_editor_dock().setVisible(checked)
         )
         view_menu.addAction(scene_editor_action)
         
-        voice_settings_action = QAction("配音设置", self)
+        voice_settings_action = QAction(_Icons.get('voice_settings'), "配音设置", self)
         voice_settings_action.setCheckable(True)
         voice_settings_action.triggered.connect(
-            lambda checked: self.voice_settings_dock.setVisible(checked)
+            lambda checked: self._get_voice_settings_dock().setVisible(checked)
         )
         view_menu.addAction(voice_settings_action)
         
         view_menu.addSeparator()
         
-        fullscreen_action = QAction("全屏(&F)", self)
+        fullscreen_action = QAction(_Icons.get('fullscreen'), "全屏(&F)", self)
         fullscreen_action.setShortcut(QKeySequence("F11"))
         fullscreen_action.triggered.connect(self.toggle_fullscreen)
         view_menu.addAction(fullscreen_action)
@@ -199,32 +338,32 @@ class MainWindow(QMainWindow):
         # 工具菜单
         tools_menu = menubar.addMenu("工具(&T)")
         
-        analyze_action = QAction("分析视频", self)
+        analyze_action = QAction(_Icons.get('analyze'), "分析视频", self)
         analyze_action.triggered.connect(self.analyze_video)
         tools_menu.addAction(analyze_action)
         
         # ✅ 修改：添加"生成剧本"菜单项
-        generate_script_data_action = QAction("生成剧本", self)
+        generate_script_data_action = QAction(_Icons.get('generate_script'), "生成剧本", self)
         generate_script_data_action.triggered.connect(self.generate_script_data)
         tools_menu.addAction(generate_script_data_action)
         
         # ✅ 修改：原"生成文案"改为"生成解说"
-        generate_commentary_action = QAction("生成解说", self)
+        generate_commentary_action = QAction(_Icons.get('generate_commentary'), "生成解说", self)
         generate_commentary_action.triggered.connect(self.generate_commentary)
         tools_menu.addAction(generate_commentary_action)
         
-        synthesize_voice_action = QAction("合成配音", self)
+        synthesize_voice_action = QAction(_Icons.get('synthesize'), "合成配音", self)
         synthesize_voice_action.triggered.connect(self.synthesize_voice)
         tools_menu.addAction(synthesize_voice_action)
         
         # 帮助菜单
         help_menu = menubar.addMenu("帮助(&H)")
         
-        doc_action = QAction("用户手册", self)
+        doc_action = QAction(_Icons.get('help'), "用户手册", self)
         doc_action.triggered.connect(self.show_documentation)
         help_menu.addAction(doc_action)
         
-        about_action = QAction("关于", self)
+        about_action = QAction(_Icons.get('about'), "关于", self)
         about_action.triggered.connect(self.show_about)
         help_menu.addAction(about_action)
     
@@ -235,51 +374,51 @@ class MainWindow(QMainWindow):
         self.addToolBar(toolbar)
         
         # 新建
-        new_btn = QAction("新建", self)
+        new_btn = QAction(_Icons.get('new'), "新建", self)
         new_btn.triggered.connect(self.new_project)
         toolbar.addAction(new_btn)
         
         # 打开
-        open_btn = QAction("打开", self)
+        open_btn = QAction(_Icons.get('open'), "打开", self)
         open_btn.triggered.connect(self.open_project)
         toolbar.addAction(open_btn)
         
         # 保存
-        save_btn = QAction("保存", self)
+        save_btn = QAction(_Icons.get('save'), "保存", self)
         save_btn.triggered.connect(self.save_project)
         toolbar.addAction(save_btn)
         
         toolbar.addSeparator()
         
         # 导入
-        import_btn = QAction("导入", self)
+        import_btn = QAction(_Icons.get('import'), "导入", self)
         import_btn.triggered.connect(self.import_video)
         toolbar.addAction(import_btn)
         
         # 导出
-        export_btn = QAction("导出", self)
+        export_btn = QAction(_Icons.get('export'), "导出", self)
         export_btn.triggered.connect(self.export_video)
         toolbar.addAction(export_btn)
         
         toolbar.addSeparator()
         
         # 分析
-        analyze_btn = QAction("分析", self)
+        analyze_btn = QAction(_Icons.get('analyze'), "分析", self)
         analyze_btn.triggered.connect(self.analyze_video)
         toolbar.addAction(analyze_btn)
         
         # ✅ 修改：原"生成"改为"生成剧本"
-        generate_script_btn = QAction("生成剧本", self)
+        generate_script_btn = QAction(_Icons.get('generate_script'), "生成剧本", self)
         generate_script_btn.triggered.connect(self.generate_script_data)
         toolbar.addAction(generate_script_btn)
         
         # ✅ 新增："生成解说"按钮
-        generate_commentary_btn = QAction("生成解说", self)
+        generate_commentary_btn = QAction(_Icons.get('generate_commentary'), "生成解说", self)
         generate_commentary_btn.triggered.connect(self.generate_commentary)
         toolbar.addAction(generate_commentary_btn)
         
         # 合成
-        synthesize_btn = QAction("合成", self)
+        synthesize_btn = QAction(_Icons.get('synthesize'), "合成", self)
         synthesize_btn.triggered.connect(self.synthesize_voice)
         toolbar.addAction(synthesize_btn)
     
@@ -292,21 +431,60 @@ class MainWindow(QMainWindow):
     def _connect_signals(self):
         """连接信号"""
         self.scene_list.scene_selected.connect(self.on_scene_selected)
-        self.timeline.position_changed.connect(self.video_player.seek)
-        self.video_player.position_changed.connect(self.timeline.set_position)
+        
+        # 文案编辑
+        self.script_editor.script_changed.connect(self._on_script_changed)
+        self.script_editor.scripts_updated.connect(self._rebuild_script_index)
+        
+        # 时间轴拖动与播放进度刷新频率很高，合并后再转发
+        self._seek_debouncer = _Debouncer(SEEK_DEBOUNCE_MS, self)
+        self.timeline.position_changed.connect(self._seek_debouncer.push)
+        self._seek_debouncer.fired.connect(self._on_timeline_seek)
+        
+        self._position_debouncer = _Debouncer(POSITION_DEBOUNCE_MS, self)
+        self.video_player.position_changed.connect(self._on_player_position)
+        self._position_debouncer.fired.connect(self.timeline.set_position)
+    
+    def _on_timeline_seek(self, time_sec: float):
+        """时间轴驱动的跳转（播放器回报的位置不再回写时间轴）"""
+        self._suppress_position_sync = True
+        try:
+            self.video_player.seek(time_sec)
+        finally:
+            self._suppress_position_sync = False
+    
+    def _on_player_position(self, time_sec: float):
+        """播放位置改变"""
+        if not self._suppress_position_sync:
+            self._position_debouncer.push(time_sec)
     
     def _load_stylesheet(self):
-        """加载样式表"""
+        """加载样式表（后台读取文件，窗口无需等待即可显示）"""
         theme = config.UI_THEME
         style_file = Path("resources/styles") / f"{theme}_theme.qss"
         
-        if style_file.exists():
-            with open(style_file, 'r', encoding='utf-8') as f:
-                self.setStyleSheet(f.read())
+        loader = _StyleLoader(style_file)
+        loader.signals.loaded.connect(self._apply_stylesheet)
+        # 保持信号对象的引用，直到读取完成
+        self._style_signals = loader.signals
+        QThreadPool.globalInstance().start(loader)
+    
+    def _apply_stylesheet(self, stylesheet: str):
+        """应用样式表（设置在 QApplication 上，所有窗口和对话框共用一份规则）"""
+        app = QApplication.instance()
+        # 内容相同时不重新应用，避免 Qt 重新刷新所有控件的样式
+        if stylesheet != app.styleSheet():
+            app.setStyleSheet(stylesheet)
     
     def new_project(self):
         """新建项目"""
-        dialog = ImportDialog(self)
+        # 导入对话框只创建一次，之后清空输入复用
+        if self._import_dialog is None:
+            self._import_dialog = ImportDialog(self)
+        else:
+            self._import_dialog.reset()
+        
+        dialog = self._import_dialog
         if dialog.exec():
             video_path = dialog.get_video_path()
             project_name = dialog.get_project_name()
@@ -322,6 +500,9 @@ class MainWindow(QMainWindow):
                 
                 self.current_project = project
                 self.current_project_id = project['id']
+                self._set_scenes(project.get('scenes', []))
+                self._set_scripts(project.get('scripts', []))
+                self._dirty.clear()
                 
                 # 加载视频
                 self.video_player.load_video(project['video_path'])
@@ -348,14 +529,23 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "警告", "没有打开的项目")
             return
         
+        # 同步编辑器中尚未处理的输入
+        self.script_editor.flush()
+        
+        if not self._dirty:
+            self.statusbar.showMessage("没有需要保存的修改")
+            return
+        
         try:
-            # 收集当前数据
-            project_data = self.current_project.copy()
-            project_data['scenes'] = self.scene_list.get_scenes()
-            project_data['scripts'] = self.script_editor.get_scripts()
+            # 只收集有改动的数据段
+            partial = {
+                key: self.current_project[key]
+                for key in self._dirty if key in self.current_project
+            }
             
             # 保存
-            self.project_manager.save_project(self.current_project_id, project_data)
+            self.project_manager.save_partial(self.current_project_id, partial)
+            self._dirty.clear()
             
             self.statusbar.showMessage("项目已保存")
             self.project_saved.emit()
@@ -373,68 +563,171 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "警告", "没有打开的项目")
             return
         
-        dialog = ExportDialog(self)
+        # 导出对话框只创建一次，之后复用
+        if self._export_dialog is None:
+            self._export_dialog = ExportDialog(self, db=self.project_manager.db)
+        
+        dialog = self._export_dialog
+        dialog.video_duration = self._get_video_duration()
         if dialog.exec():
             # TODO: 实现导出逻辑
             pass
     
+    def _get_video_duration(self) -> float:
+        """获取当前项目视频时长（秒），失败返回0"""
+        video_path = (self.current_project or {}).get('video_path')
+        if not video_path:
+            return 0
+        
+        try:
+            from core.video_processor import VideoProcessor
+            processor = VideoProcessor(db=self.project_manager.db)
+            return processor.get_video_info(video_path)['duration']
+        except Exception as e:
+            logger.warning(f"获取视频时长失败: {str(e)}")
+            return 0
+    
+    def _start_worker(self, worker: PipelineWorker, progress: ProgressDialog,
+                      on_finished, error_title: str) -> bool:
+        """
+        在后台线程中运行工作者
+        
+        Args:
+            worker: 工作者
+            progress: 进度对话框
+            on_finished: 完成回调（在主线程中调用，参数为处理结果）
+            error_title: 失败时的提示前缀
+            
+        Returns:
+            是否成功启动（已有任务运行时返回False）
+        """
+        if self._busy:
+            QMessageBox.warning(self, "警告", "已有任务正在运行，请稍候")
+            return False
+        
+        self._busy = True
+        self._progress = progress
+        self._on_worker_finished = on_finished
+        self._worker_error_title = error_title
+        
+        thread = QThread(self)
+        worker.moveToThread(thread)
+        
+        thread.started.connect(worker.run)
+        worker.progress.connect(progress.set_progress)
+        worker.message.connect(progress.set_message)
+        worker.finished.connect(self._handle_worker_finished)
+        worker.failed.connect(self._handle_worker_failed)
+        worker.finished.connect(thread.quit)
+        worker.failed.connect(thread.quit)
+        thread.finished.connect(worker.deleteLater)
+        thread.finished.connect(thread.deleteLater)
+        
+        # 保持引用，避免线程运行期间被回收
+        self._worker = worker
+        self._worker_thread = thread
+        
+        progress.show()
+        thread.start()
+        return True
+    
+    def _finish_worker(self):
+        """结束当前后台任务"""
+        self._busy = False
+        self._worker = None
+        self._worker_thread = None
+        
+        if self._progress:
+            self._progress.close()
+            self._progress = None
+    
+    def _handle_worker_finished(self, result):
+        """后台任务完成"""
+        on_finished = self._on_worker_finished
+        self._finish_worker()
+        on_finished(result)
+    
+    def _handle_worker_failed(self, error: str):
+        """后台任务失败"""
+        error_title = self._worker_error_title
+        self._finish_worker()
+        QMessageBox.critical(self, "错误", f"{error_title}: {error}")
+    
+    def _prewarm(self, key: str, factory):
+        """在后台预先创建引擎（已创建或正在创建时不重复创建）"""
+        future = self._engines.get(key)
+        # 上次创建失败时重新创建
+        if future is None or (future.done() and future.exception() is not None):
+            self._engines[key] = self._prewarm_pool.submit(factory)
+    
+    def _get_engine(self, key: str, factory):
+        """
+        获取引擎（进程内只创建一次，之后各次处理流程复用同一实例）
+        
+        Args:
+            key: 引擎名
+            factory: 创建函数
+            
+        Returns:
+            创建引擎的 Future，由工作者在后台线程中取结果
+        """
+        self._prewarm(key, factory)
+        return self._engines[key]
+    
     def analyze_video(self):
         """分析视频（第1步：检测镜头+提取关键帧）"""
         if not self.current_project:
             QMessageBox.warning(self, "警告", "没有打开的项目")
             return
         
+        project_dir = self.project_manager.get_project_path(
+            self.current_project_id, "keyframes"
+        )
+        worker = AnalyzeWorker(
+            self.current_project['video_path'], str(project_dir),
+            detector=self._get_engine('scene_detector', create_scene_detector),
+            extractor=self._get_engine('keyframe_extractor', create_keyframe_extractor)
+        )
+        
+        # 边分析边显示：镜头与缩略图逐个到达
+        worker.scene_ready.connect(self.scene_list.append_scene)
+        worker.keyframes_ready.connect(self.scene_list.set_scene_keyframes)
+        
         progress = ProgressDialog("分析视频", "正在分析视频，请稍候...", self)
-        progress.show()
+        if self._start_worker(worker, progress, self._on_analyze_done, "视频分析失败"):
+            # 排队信号要等本方法返回后才会投递，此处清空不会丢失镜头
+            self.scene_list.set_scenes([])
+    
+    def _on_analyze_done(self, result: dict):
+        """视频分析完成"""
+        scenes = result['scenes']
+        keyframes = result['keyframes']
         
-        try:
-            video_path = self.current_project['video_path']
-            
-            # 检测镜头
-            detector = SceneDetector()
-            scenes = detector.detect(
-                video_path,
-                progress_callback=lambda p: progress.set_progress(int(p * 0.5))
-            )
-            
-            # 提取关键帧
-            project_dir = self.project_manager.get_project_path(
-                self.current_project_id, "keyframes"
-            )
-            extractor = KeyframeExtractor()
-            keyframes = extractor.extract(
-                video_path,
-                scenes,
-                output_dir=str(project_dir),
-                progress_callback=lambda p: progress.set_progress(50 + int(p * 0.5))
-            )
-            
-            # 更新UI
-            self.scene_list.set_scenes(scenes, keyframes)
-            self.timeline.set_scenes(scenes)
-            
-            # 保存到项目
-            self.current_project['scenes'] = scenes
-            self.current_project['keyframes'] = keyframes
-            
-            progress.close()
-            self.statusbar.showMessage(f"分析完成: {len(scenes)} 个镜头")
-            
-            # ✅ 自动进入下一步：生成剧本
-            reply = QMessageBox.question(
-                self,
-                "继续操作",
-                "视频分析完成！是否继续生成剧本（识别画面+提取对白）？",
-                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
-                QMessageBox.StandardButton.Yes
-            )
-            
-            if reply == QMessageBox.StandardButton.Yes:
-                QTimer.singleShot(500, self.generate_script_data)
-            
-        except Exception as e:
-            progress.close()
-            QMessageBox.critical(self, "错误", f"视频分析失败: {str(e)}")
+        # 更新UI（镜头列表已在分析过程中逐个填充）
+        self.timeline.set_scenes(scenes)
+        
+        # 保存到项目
+        self._set_scenes(scenes)
+        self.current_project['keyframes'] = keyframes
+        self._dirty.add('keyframes')
+        
+        self.statusbar.showMessage(f"分析完成: {len(scenes)} 个镜头")
+        
+        # 用户确认期间预热下一阶段（Whisper 模型、剧本分析器）
+        self._prewarm('subtitle_extractor', create_subtitle_extractor)
+        self._prewarm('script_analyzer', create_script_analyzer)
+        
+        # ✅ 自动进入下一步：生成剧本
+        reply = QMessageBox.question(
+            self,
+            "继续操作",
+            "视频分析完成！是否继续生成剧本（识别画面+提取对白）？",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            QMessageBox.StandardButton.Yes
+        )
+        
+        if reply == QMessageBox.StandardButton.Yes:
+            QTimer.singleShot(500, self.generate_script_data)
     
     def generate_script_data(self):
         """生成剧本（第2步：Gemini识别画面+提取对白）"""
@@ -442,131 +735,62 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "警告", "请先分析视频")
             return
         
-        progress = ProgressDialog("生成剧本", "正在识别画面和提取对白，请稍候...", self)
-        progress.show()
-        
-        try:
-            from core.script_analyzer import ScriptAnalyzer
-            from core.highlight_selector import HighlightSelector
-            import json
-            
-            scenes = self.current_project['scenes']
-            keyframes = self.current_project['keyframes']
-            video_path = self.current_project['video_path']
-            
-            # ========== 步骤1：提取字幕 ==========
-            logger.info("步骤1: 提取字幕...")
-            progress.set_message("步骤1/4: 提取字幕...")
-            
-            from core.subtitle_extractor import SubtitleExtractor
-            
-            subtitle_extractor = SubtitleExtractor(
-                model_size=config.WHISPER_MODEL_SIZE,
-                use_online=config.USE_ONLINE_WHISPER
-            )
-            
-            all_subtitles = subtitle_extractor.extract(
-                video_path,
-                progress_callback=lambda p: progress.set_progress(int(p * 0.3))
-            )
-            
-            logger.info(f"✅ 字幕提取完成: {len(all_subtitles)} 条")
-            
-            # ========== 步骤2：筛选精彩片段 ==========
-            logger.info("步骤2: 筛选精彩片段...")
-            progress.set_message("步骤2/4: 筛选精彩片段...")
-            progress.set_progress(30)
-            
-            selector = HighlightSelector()
-            target_duration = getattr(config, 'TARGET_DURATION', 600)
-            
-            selected_scenes = selector.select_highlights(
-                scenes=scenes,
-                subtitles=all_subtitles,
-                target_duration=target_duration
-            )
-            
-            total_duration = sum(s['duration'] for s in selected_scenes)
-            logger.info(
-                f"✅ 筛选完成: 从 {len(scenes)} 个场景中选出 {len(selected_scenes)} 个，"
-                f"总时长: {total_duration:.1f}秒"
-            )
-            
-            # 保存筛选结果
-            selected_scenes_file = self.project_manager.get_project_path(
+        worker = ScriptDataWorker(
+            video_path=self.current_project['video_path'],
+            scenes=self.current_project['scenes'],
+            selected_scenes_file=str(self.project_manager.get_project_path(
                 self.current_project_id, "selected_scenes.json"
-            )
-            selector.save_selected_scenes(selected_scenes, str(selected_scenes_file))
-            
-            # ========== 步骤3：提取筛选后场景的关键帧 ==========
-            logger.info("步骤3: 提取筛选后场景的关键帧...")
-            progress.set_message("步骤3/4: 提取关键帧...")
-            progress.set_progress(40)
-            
-            from core.keyframe_extractor import KeyframeExtractor
-            
-            keyframes_dir = self.project_manager.get_project_path(
+            )),
+            keyframes_dir=str(self.project_manager.get_project_path(
                 self.current_project_id, "keyframes"
-            )
-            
-            extractor = KeyframeExtractor()
-            selected_keyframes = extractor.extract(
-                video_path,
-                selected_scenes,
-                output_dir=str(keyframes_dir),
-                prefix='selected_'
-            )
-            
-            logger.info(f"✅ 提取了 {len(selected_keyframes)} 个关键帧")
-            
-            # ========== 步骤4：画面识别和生成剧本 ==========
-            logger.info("步骤4: 画面识别和生成剧本...")
-            progress.set_message("步骤4/4: 画面识别...")
-            progress.set_progress(50)
-            
-            # 输出路径
-            output_path = self.project_manager.get_project_path(
+            )),
+            output_path=str(self.project_manager.get_project_path(
                 self.current_project_id, "script_data.json"
-            )
-            
-            # 生成剧本
-            analyzer = ScriptAnalyzer()
-            script_data = analyzer.analyze_scenes(
-                selected_scenes,
-                selected_keyframes,
-                video_path,
-                str(output_path),
-                progress_callback=lambda p: progress.set_progress(50 + int(p * 0.5))
-            )
-            
-            # 保存到项目
-            self.current_project['script_data'] = script_data
-            self.current_project['selected_scenes'] = selected_scenes
-            self.current_project['selected_keyframes'] = selected_keyframes
-            self.current_project['all_subtitles'] = all_subtitles
-            
-            progress.close()
-            self.statusbar.showMessage(f"剧本生成完成: {len(script_data)} 个镜头")
-            
-            # 询问是否继续生成解说
-            reply = QMessageBox.question(
-                self,
-                "继续操作",
-                f"剧本生成完成！\n"
-                f"- 筛选场景: {len(selected_scenes)} 个\n"
-                f"- 总时长: {total_duration/60:.1f} 分钟\n\n"
-                f"是否继续生成解说文案？",
-                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
-                QMessageBox.StandardButton.Yes
-            )
-            
-            if reply == QMessageBox.StandardButton.Yes:
-                QTimer.singleShot(500, self.generate_commentary)
-            
-        except Exception as e:
-            progress.close()
-            logger.error(f"剧本生成失败: {str(e)}", exc_info=True)
-            QMessageBox.critical(self, "错误", f"剧本生成失败: {str(e)}")
+            )),
+            prewarmed={
+                'subtitle_extractor': self._get_engine('subtitle_extractor', create_subtitle_extractor),
+                'highlight_selector': self._get_engine('highlight_selector', create_highlight_selector),
+                'keyframe_extractor': self._get_engine('keyframe_extractor', create_keyframe_extractor),
+                'script_analyzer': self._get_engine('script_analyzer', create_script_analyzer),
+            }
+        )
+        
+        progress = ProgressDialog("生成剧本", "正在识别画面和提取对白，请稍候...", self)
+        self._start_worker(worker, progress, self._on_script_data_done, "剧本生成失败")
+    
+    def _on_script_data_done(self, result: dict):
+        """剧本生成完成"""
+        script_data = result['script_data']
+        selected_scenes = result['selected_scenes']
+        total_duration = result['total_duration']
+        
+        # 保存到项目
+        self.current_project['script_data'] = script_data
+        self.current_project['selected_scenes'] = selected_scenes
+        self.current_project['selected_keyframes'] = result['selected_keyframes']
+        self.current_project['all_subtitles'] = result['all_subtitles']
+        # script_data / selected_scenes 已由工作者写入项目目录
+        self._dirty.update(('selected_keyframes', 'all_subtitles'))
+        
+        self.statusbar.showMessage(f"剧本生成完成: {len(script_data)} 个镜头")
+        
+        # 用户确认期间预热解说生成器
+        self._prewarm('script_generator', create_script_generator)
+        
+        # 询问是否继续生成解说
+        reply = QMessageBox.question(
+            self,
+            "继续操作",
+            f"剧本生成完成！\n"
+            f"- 筛选场景: {len(selected_scenes)} 个\n"
+            f"- 总时长: {total_duration/60:.1f} 分钟\n\n"
+            f"是否继续生成解说文案？",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            QMessageBox.StandardButton.Yes
+        )
+        
+        if reply == QMessageBox.StandardButton.Yes:
+            QTimer.singleShot(500, self.generate_commentary)
     
     def generate_commentary(self):
         """生成解说文案（第3步：根据剧本生成解说）"""
@@ -574,46 +798,36 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "警告", "请先生成剧本")
             return
         
+        # ✅ 传递完整剧本数据
+        worker = CommentaryWorker(
+            self.current_project['script_data'],
+            generator=self._get_engine('script_generator', create_script_generator)
+        )
+        
         progress = ProgressDialog("生成解说", "AI正在生成解说文案，请稍候...", self)
-        progress.show()
+        self._start_worker(worker, progress, self._on_commentary_done, "解说生成失败")
+    
+    def _on_commentary_done(self, scripts: list):
+        """解说文案生成完成"""
+        # 保存到项目并更新编辑器
+        self._set_scripts(scripts)
         
-        try:
-            script_data = self.current_project['script_data']
-            
-            # ✅ 传递完整剧本数据
-            generator = ScriptGenerator()
-            scripts = generator.generate(
-                script_data,  # ← 传剧本数据，不是关键帧
-                style="drama",
-                length=500,
-                progress_callback=lambda p: progress.set_progress(int(p))
-            )
-            
-            # 更新编辑器
-            self.script_editor.set_scripts(scripts)
-            
-            # 保存到项目
-            self.current_project['scripts'] = scripts
-            
-            progress.close()
-            self.statusbar.showMessage(f"解说文案生成完成: {len(scripts)} 段")
-            
-            # ✅ 询问是否继续合成配音
-            reply = QMessageBox.question(
-                self,
-                "继续操作",
-                "解说文案生成完成！是否继续合成配音？",
-                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
-                QMessageBox.StandardButton.Yes
-            )
-            
-            if reply == QMessageBox.StandardButton.Yes:
-                QTimer.singleShot(500, self.synthesize_voice)
-            
-        except Exception as e:
-            progress.close()
-            logger.error(f"解说生成失败: {str(e)}", exc_info=True)
-            QMessageBox.critical(self, "错误", f"解说生成失败: {str(e)}")
+        self.statusbar.showMessage(f"解说文案生成完成: {len(scripts)} 段")
+        
+        # 用户确认期间预热 TTS 引擎
+        self._prewarm('tts_engine', create_tts_engine)
+        
+        # ✅ 询问是否继续合成配音
+        reply = QMessageBox.question(
+            self,
+            "继续操作",
+            "解说文案生成完成！是否继续合成配音？",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            QMessageBox.StandardButton.Yes
+        )
+        
+        if reply == QMessageBox.StandardButton.Yes:
+            QTimer.singleShot(500, self.synthesize_voice)
     
     def generate_script(self):
         """生成文案（入口方法，保持兼容性）"""
@@ -633,47 +847,60 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "警告", "没有文案可合成")
             return
         
+        # 获取配音设置
+        voice = self.voice_settings.get_selected_voice()
+        
+        project_dir = self.project_manager.get_project_path(
+            self.current_project_id, "audios"
+        )
+        worker = VoiceWorker(
+            scripts, str(project_dir), voice,
+            tts=self._get_engine('tts_engine', create_tts_engine)
+        )
+        
         progress = ProgressDialog("合成配音", "正在合成配音，请稍候...", self)
-        progress.show()
+        self._start_worker(worker, progress, self._on_voice_done, "配音合成失败")
+    
+    def _on_voice_done(self, audios: list):
+        """配音合成完成"""
+        # 保存到项目
+        self.current_project['audios'] = audios
+        self._dirty.add('audios')
         
-        try:
-            # 获取配音设置
-            voice = self.voice_settings.get_selected_voice()
-            
-            # 合成
-            project_dir = self.project_manager.get_project_path(
-                self.current_project_id, "audios"
-            )
-            tts = TTSEngine()
-            audios = tts.batch_synthesize(
-                scripts,
-                output_dir=str(project_dir),
-                voice=voice,
-                progress_callback=lambda p: progress.set_progress(int(p))
-            )
-            
-            # 保存到项目
-            self.current_project['audios'] = audios
-            
-            progress.close()
-            self.statusbar.showMessage(f"配音合成完成: {len(audios)} 段")
-            
-        except Exception as e:
-            progress.close()
-            QMessageBox.critical(self, "错误", f"配音合成失败: {str(e)}")
+        self.statusbar.showMessage(f"配音合成完成: {len(audios)} 段")
+    
+    def _set_scenes(self, scenes: list):
+        """更新项目镜头列表及其索引"""
+        self.current_project['scenes'] = scenes
+        self._dirty.add('scenes')
+        self._scenes_by_id = {s['id']: s for s in scenes}
+    
+    def _set_scripts(self, scripts: list):
+        """更新项目文案列表（编辑器发出 scripts_updated 后重建索引）"""
+        self.current_project['scripts'] = scripts
+        self._dirty.add('scripts')
+        self.script_editor.set_scripts(scripts)
+    
+    def _rebuild_script_index(self, scripts: list):
+        """重建 镜头ID -> 文案 索引（同一镜头取第一条文案）"""
+        self._scripts_by_scene = {}
+        for script in scripts:
+            self._scripts_by_scene.setdefault(script.get('scene_id'), script)
+    
+    def _on_script_changed(self, scene_id: str, text: str):
+        """文案编辑（编辑器直接修改项目中的文案列表）"""
+        self._dirty.add('scripts')
     
     def on_scene_selected(self, scene_id: str):
         """镜头选中事件"""
-        scenes = self.current_project.get('scenes', [])
-        scene = next((s for s in scenes if s['id'] == scene_id), None)
+        scene = self._scenes_by_id.get(scene_id)
         
         if scene:
             # 跳转到镜头开始位置
             self.video_player.seek(scene['start_time'])
             
             # 更新编辑器
-            scripts = self.current_project.get('scripts', [])
-            script = next((s for s in scripts if s['scene_id'] == scene_id), None)
+            script = self._scripts_by_scene.get(scene_id)
             if script:
                 self.script_editor.set_current_script(script)
     
@@ -707,6 +934,12 @@ class MainWindow(QMainWindow):
     
     def closeEvent(self, event):
         """关闭事件"""
+        # 后台任务运行中不能退出（线程无法中途终止）
+        if self._busy:
+            QMessageBox.warning(self, "警告", "有任务正在运行，请等待完成后再退出")
+            event.ignore()
+            return
+        
         # 检查是否有未保存的更改
         reply = QMessageBox.question(
             self,
@@ -717,6 +950,9 @@ class MainWindow(QMainWindow):
         )
         
         if reply == QMessageBox.StandardButton.Yes:
+            self._prewarm_pool.shutdown(wait=False, cancel_futures=True)
+            self.video_player.release()
+            self.project_manager.db.close_all()
             event.accept()
         else:
             event.ignore()
@@ -6,27 +6,60 @@ from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QTextEdit,
     QPushButton, QLabel, QComboBox, QSpinBox, QGroupBox
 )
-from PyQt6.QtCore import Qt, pyqtSignal
-from PyQt6.QtGui import QFont
+from PyQt6.QtCore import Qt, pyqtSignal, QTimer, QSignalBlocker
+from PyQt6.QtGui import QFont, QTextCursor
 from typing import List, Dict
+import re
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# 连续输入合并间隔（毫秒），停止输入后再同步文案和统计
+TEXT_CHANGE_DEBOUNCE_MS = 150
+
+# 中文字符（CJK 统一表意文字基本区）
+_CJK_RE = re.compile('[\u4e00-\u9fff]')
+
+# 与 QTextDocument.toPlainText 相同的字符替换：段落/行分隔符转换为换行，不换行空格转换为空格
+_PLAIN_TEXT_TABLE = str.maketrans({
+    '\u2029': '\n',
+    '\u2028': '\n',
+    '\ufdd0': '\n',
+    '\ufdd1': '\n',
+    '\u00a0': ' ',
+})
+
+
+def _count_cjk(text: str) -> int:
+    """统计中文字符数"""
+    return sum(1 for _ in _CJK_RE.finditer(text))
+
 
 class ScriptEditor(QWidget):
     """文案编辑器"""
     
     # 信号
     script_changed = pyqtSignal(str, str)  # scene_id, new_text
+    scripts_updated = pyqtSignal(list)     # scripts
     generate_requested = pyqtSignal(dict)  # generation_params
     
     def __init__(self, parent=None):
         super().__init__(parent)
         
         self.scripts = []
+        self._script_by_id = {}
         self.current_scene_id = None
         
+        # 当前文本副本与中文字符数（按每次改动的片段增量维护）
+        self._text = ""
+        self._cjk_count = 0
+        
+        # 输入防抖
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(TEXT_CHANGE_DEBOUNCE_MS)
+        self._debounce.timeout.connect(self._flush_text)
+        
         self._init_ui()
         logger.info("文案编辑器初始化完成")
     
@@ -65,6 +98,8 @@ class ScriptEditor(QWidget):
         
         # 连接信号
         self.text_edit.textChanged.connect(self.on_text_changed)
+        self._doc = self.text_edit.document()
+        self._doc.contentsChange.connect(self._on_contents_change)
         
         layout.addWidget(self.text_edit)
         
@@ -83,7 +118,14 @@ class ScriptEditor(QWidget):
     
     def set_scripts(self, scripts: List[Dict]):
         """设置所有文案"""
+        self.flush()
+        
         self.scripts = scripts
+        # 镜头ID -> 文案（同一镜头取第一条）
+        self._script_by_id = {}
+        for script in scripts:
+            self._script_by_id.setdefault(script['scene_id'], script)
+        self.scripts_updated.emit(scripts)
         
         if scripts:
             # 显示第一个
@@ -91,53 +133,97 @@ class ScriptEditor(QWidget):
     
     def set_current_script(self, script: Dict):
         """设置当前文案"""
+        # 先把上一段未同步的输入写回
+        self.flush()
+        
         self.current_scene_id = script['scene_id']
         self.scene_label.setText(script['scene_id'])
         
         # 阻止信号，避免触发textChanged
-        self.text_edit.blockSignals(True)
-        self.text_edit.setPlainText(script['script'])
-        self.text_edit.blockSignals(False)
+        with QSignalBlocker(self.text_edit):
+            self._doc.setPlainText(script['script'])
         
         # 更新统计
         self.update_stats()
     
     def get_scripts(self) -> List[Dict]:
         """获取所有文案"""
+        self.flush()
         return self.scripts
     
     def get_current_text(self) -> str:
-        """获取当前文本"""
-        return self.text_edit.toPlainText()
+        """获取当前文本（保存到文案中的内容以文档为准，增量副本只用于统计）"""
+        return self._doc.toPlainText()
+    
+    def _on_contents_change(self, position: int, chars_removed: int, chars_added: int):
+        """文档内容改变：只统计删除和插入的片段"""
+        text = self._text
+        removed = text[position:position + chars_removed]
+        
+        cursor = QTextCursor(self._doc)
+        cursor.setPosition(position)
+        cursor.setPosition(position + chars_added, QTextCursor.MoveMode.KeepAnchor)
+        # 选中文本保留了段落分隔符等特殊字符，按 toPlainText 的规则转换
+        added = cursor.selectedText().translate(_PLAIN_TEXT_TABLE)
+        
+        new_text = text[:position] + added + text[position + chars_removed:]
+        
+        # 增量信息与文档对不上时（如改动涉及文档末尾）全量重算
+        if len(removed) != chars_removed or len(new_text) != self._doc.characterCount() - 1:
+            self._reset_stats()
+            return
+        
+        self._text = new_text
+        self._cjk_count += _count_cjk(added) - _count_cjk(removed)
+    
+    def _reset_stats(self):
+        """按完整文档重建文本副本与统计"""
+        self._text = self._doc.toPlainText()
+        self._cjk_count = _count_cjk(self._text)
     
     def on_text_changed(self):
-        """文本改变事件"""
+        """文本改变事件（合并连续输入）"""
+        self._debounce.start()
+    
+    def flush(self):
+        """立即同步尚未处理的输入"""
+        if self._debounce.isActive():
+            self._debounce.stop()
+            self._flush_text()
+    
+    def _flush_text(self):
+        """同步当前文本到文案列表并更新统计"""
         if self.current_scene_id:
             new_text = self.get_current_text()
+            cjk_count = self._cjk_count
+            char_count = len(new_text)
             
-            # 更新scripts列表
-            for script in self.scripts:
-                if script['scene_id'] == self.current_scene_id:
-                    script['script'] = new_text
-                    script['word_count'] = len(new_text)
-                    break
+            # 更新scripts列表（word_count 沿用数据库字段含义，记录字符数）
+            script = self._script_by_id.get(self.current_scene_id)
+            if script:
+                script['script'] = new_text
+                script['word_count'] = char_count
+                script['cjk_count'] = cjk_count
             
             # 发出信号
             self.script_changed.emit(self.current_scene_id, new_text)
             
             # 更新统计
-            self.update_stats()
+            self._show_stats(cjk_count, char_count)
     
     def update_stats(self):
-        """更新统计信息"""
-        text = self.get_current_text()
-        
-        # 字数（中文字符）
-        word_count = len([c for c in text if '\u4e00' <= c <= '\u9fff'])
-        self.word_count_label.setText(f"字数: {word_count}")
-        
-        # 字符数（包括标点和空格）
-        char_count = len(text)
+        """按当前文本刷新统计信息（切换文案时调用）"""
+        self._show_stats(self._cjk_count, len(self._text))
+    
+    def _show_stats(self, cjk_count: int, char_count: int):
+        """
+        显示统计信息
+        
+        Args:
+            cjk_count: 字数（中文字符）
+            char_count: 字符数（包括标点和空格）
+        """
+        self.word_count_label.setText(f"字数: {cjk_count}")
         self.char_count_label.setText(f"字符数: {char_count}")
     
     def show_generate_dialog(self):
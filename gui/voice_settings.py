@@ -6,12 +6,14 @@ from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel,
     QComboBox, QSlider, QPushButton, QGroupBox
 )
-from PyQt6.QtCore import Qt, pyqtSignal
-from core.tts_engine import TTSEngine
+from PyQt6.QtCore import Qt, pyqtSignal, QTimer
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# 滑块拖动时设置信号的合并间隔（毫秒）
+SETTINGS_DEBOUNCE_MS = 100
+
 
 class VoiceSettings(QWidget):
     """配音设置"""
@@ -20,10 +22,27 @@ class VoiceSettings(QWidget):
     settings_changed = pyqtSignal(dict)
     preview_requested = pyqtSignal(str, dict)  # text, settings
     
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, tts_engine=None):
+        """
+        初始化配音设置
+        
+        Args:
+            parent: 父控件
+            tts_engine: 共用的 TTS 引擎，为空时自行创建
+        """
         super().__init__(parent)
         
-        self.tts_engine = TTSEngine()
+        if tts_engine is None:
+            # 面板按需创建，TTS 依赖随之延迟导入
+            from core.tts_engine import TTSEngine
+            tts_engine = TTSEngine()
+        self.tts_engine = tts_engine
+        
+        # 拖动滑块时标签实时刷新，设置信号合并后再发出
+        self._emit_timer = QTimer(self)
+        self._emit_timer.setSingleShot(True)
+        self._emit_timer.setInterval(SETTINGS_DEBOUNCE_MS)
+        self._emit_timer.timeout.connect(self.emit_settings)
         
         self._init_ui()
         logger.info("配音设置初始化完成")
@@ -127,7 +146,7 @@ class VoiceSettings(QWidget):
         """语速改变"""
         rate = value / 100.0
         self.rate_value_label.setText(f"{rate:.1f}x")
-        self.emit_settings()
+        self._emit_timer.start()
     
     def on_pitch_changed(self, value: int):
         """音调改变"""
@@ -143,12 +162,12 @@ class VoiceSettings(QWidget):
         else:
             text = "很高"
         self.pitch_value_label.setText(text)
-        self.emit_settings()
+        self._emit_timer.start()
     
     def on_volume_changed(self, value: int):
         """音量改变"""
         self.volume_value_label.setText(f"{value}%")
-        self.emit_settings()
+        self._emit_timer.start()
     
     def emit_settings(self):
         """发出设置改变信号"""
@@ -5,11 +5,14 @@
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QLabel, QProgressBar, QPushButton
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# 进度条刷新间隔（毫秒，约30Hz）
+PROGRESS_REFRESH_MS = 33
+
 
 class ProgressDialog(QDialog):
     """进度对话框"""
@@ -21,6 +24,13 @@ class ProgressDialog(QDialog):
         self.setModal(True)
         self.setMinimumWidth(400)
         
+        # 进度合并刷新：间隔内只记录最新值
+        self._pending = 0
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(PROGRESS_REFRESH_MS)
+        self._flush_timer.timeout.connect(self._flush)
+        
         self._init_ui(message)
         logger.info(f"进度对话框初始化: {title}")
     
@@ -46,12 +56,21 @@ class ProgressDialog(QDialog):
         layout.addWidget(self.cancel_btn)
     
     def set_progress(self, value: int):
-        """设置进度"""
-        self.progress_bar.setValue(value)
+        """设置进度（合并刷新，完成时立即刷新）"""
+        self._pending = value
         
         # 完成时自动关闭
         if value >= 100:
+            self._flush_timer.stop()
+            self._flush()
             self.accept()
+        elif not self._flush_timer.isActive():
+            self._flush_timer.start()
+    
+    def _flush(self):
+        """把最新进度写入进度条"""
+        if self._pending != self.progress_bar.value():
+            self.progress_bar.setValue(self._pending)
     
     def set_message(self, message: str):
         """设置消息"""
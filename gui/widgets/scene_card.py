@@ -3,106 +3,252 @@
 """
 
 from PyQt6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QLabel,
-    QScrollArea, QFrame
+    QListView, QAbstractItemView, QStyledItemDelegate,
+    QStyleOptionViewItem, QStyle
 )
-from PyQt6.QtCore import Qt, pyqtSignal, QSize
-from PyQt6.QtGui import QPixmap, QImage
-from typing import List, Dict
-import cv2
+from PyQt6.QtCore import (
+    Qt, pyqtSignal, QSize, QRect, QObject, QRunnable, QThreadPool,
+    QAbstractListModel, QModelIndex
+)
+from PyQt6.QtGui import (
+    QPixmap, QPixmapCache, QImage, QImageReader,
+    QPainter, QPen, QBrush, QColor, QFont, QPalette
+)
+from typing import List, Dict, Optional
+import os
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# 缩略图尺寸
+THUMBNAIL_WIDTH = 160
+THUMBNAIL_HEIGHT = 90
+
+# 卡片布局（边距、缩略图与文字间距、文字行高）
+CARD_MARGIN = 5
+CARD_SPACING = 6
+TEXT_LINE_HEIGHT = 18
+CARD_HEIGHT = 2 * CARD_MARGIN + THUMBNAIL_HEIGHT + CARD_SPACING + 3 * TEXT_LINE_HEIGHT
+
+# 模型中保存镜头数据的角色
+SCENE_ROLE = Qt.ItemDataRole.UserRole
+
+
+def read_thumbnail(image_path: str) -> QImage:
+    """
+    按缩略图尺寸解码图片（JPEG 在解码阶段直接缩小，不解码全分辨率）
+    
+    Args:
+        image_path: 图片路径
+        
+    Returns:
+        缩略图，读取失败时返回空图像
+    """
+    reader = QImageReader(image_path)
+    size = reader.size()
+    if size.isValid():
+        reader.setScaledSize(size.scaled(
+            THUMBNAIL_WIDTH, THUMBNAIL_HEIGHT, Qt.AspectRatioMode.KeepAspectRatio
+        ))
+    
+    image = reader.read()
+    if image.isNull():
+        logger.error(f"加载缩略图失败: {image_path}: {reader.errorString()}")
+    return image
+
+
+def _thumbnail_cache_key(image_path: str) -> Optional[str]:
+    """缩略图缓存键（包含修改时间，关键帧被重新提取后不会命中旧图）"""
+    try:
+        mtime = os.stat(image_path).st_mtime_ns
+    except OSError:
+        return None
+    return f"{image_path}|{mtime}|{THUMBNAIL_WIDTH}x{THUMBNAIL_HEIGHT}"
+
+
+def cached_thumbnail(image_path: str) -> Optional[QPixmap]:
+    """从进程内缓存中取缩略图，未缓存时返回None（只能在界面线程调用）"""
+    key = _thumbnail_cache_key(image_path)
+    return QPixmapCache.find(key) if key else None
+
+
+def cache_thumbnail(image_path: str, image: QImage) -> QPixmap:
+    """把解码好的缩略图转为 QPixmap 并放入缓存（只能在界面线程调用）"""
+    pixmap = QPixmap.fromImage(image)
+    key = _thumbnail_cache_key(image_path)
+    if key:
+        QPixmapCache.insert(key, pixmap)
+    return pixmap
+
+
+class _ThumbnailSignals(QObject):
+    """缩略图解码完成信号（镜头ID, 图片路径, 缩略图）"""
+    
+    loaded = pyqtSignal(str, str, QImage)
+
 
-class SceneCard(QFrame):
-    """镜头卡片"""
+class _ThumbnailLoader(QRunnable):
+    """在线程池中解码缩略图，完成后通过信号交回主线程显示"""
+    
+    def __init__(self, signals: _ThumbnailSignals, scene_id: str, image_path: str):
+        super().__init__()
+        self.signals = signals
+        self.scene_id = scene_id
+        self.image_path = image_path
     
-    clicked = pyqtSignal(str)  # scene_id
+    def run(self):
+        image = read_thumbnail(self.image_path)
+        if not image.isNull():
+            self.signals.loaded.emit(self.scene_id, self.image_path, image)
+
+
+class SceneModel(QAbstractListModel):
+    """镜头列表数据模型（缩略图随镜头一起保存，视图只绘制可见行）"""
     
-    def __init__(self, scene: Dict, keyframe_path: str = None, parent=None):
+    def __init__(self, parent=None):
         super().__init__(parent)
         
-        self.scene = scene
-        self.scene_id = scene['id']
+        self._scenes = []
+        self._rows = {}             # 镜头ID -> 行号
+        self._pixmaps = {}          # 镜头ID -> 缩略图
+        self._keyframe_paths = {}   # 镜头ID -> 缩略图对应的关键帧路径
+    
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._scenes)
+    
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
         
-        self.setFrameStyle(QFrame.Shape.Box | QFrame.Shadow.Raised)
-        self.setLineWidth(1)
-        self.setCursor(Qt.CursorShape.PointingHandCursor)
+        scene = self._scenes[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return scene['id']
+        if role == Qt.ItemDataRole.DecorationRole:
+            return self._pixmaps.get(scene['id'])
+        if role == SCENE_ROLE:
+            return scene
+        return None
+    
+    def set_scenes(self, scenes: List[Dict]):
+        """替换全部镜头（保留仍然存在的镜头的缩略图）"""
+        self.beginResetModel()
+        self._scenes = scenes
+        self._rows = {scene['id']: row for row, scene in enumerate(scenes)}
+        self._pixmaps = {k: v for k, v in self._pixmaps.items() if k in self._rows}
+        self._keyframe_paths = {k: v for k, v in self._keyframe_paths.items() if k in self._rows}
+        self.endResetModel()
+    
+    def append_scene(self, scene: Dict):
+        """在末尾追加一个镜头"""
+        row = len(self._scenes)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._scenes.append(scene)
+        self._rows[scene['id']] = row
+        self.endInsertRows()
+    
+    def scenes(self) -> List[Dict]:
+        """获取镜头列表"""
+        return self._scenes
+    
+    def row_of(self, scene_id: str) -> Optional[int]:
+        """镜头所在行号，不存在时返回None"""
+        return self._rows.get(scene_id)
+    
+    def keyframe_path(self, scene_id: str) -> Optional[str]:
+        """镜头当前缩略图对应的关键帧路径"""
+        return self._keyframe_paths.get(scene_id)
+    
+    def set_keyframe_path(self, scene_id: str, image_path: Optional[str]):
+        """记录镜头缩略图对应的关键帧路径（为空时清除缩略图）"""
+        if image_path:
+            self._keyframe_paths[scene_id] = image_path
+        else:
+            self._keyframe_paths.pop(scene_id, None)
+            self.set_thumbnail(scene_id, None)
+    
+    def set_thumbnail(self, scene_id: str, pixmap: Optional[QPixmap]):
+        """设置镜头缩略图并刷新对应行"""
+        row = self._rows.get(scene_id)
+        if row is None:
+            return
+        
+        if pixmap is None:
+            self._pixmaps.pop(scene_id, None)
+        else:
+            self._pixmaps[scene_id] = pixmap
         
-        self._init_ui(keyframe_path)
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [Qt.ItemDataRole.DecorationRole])
+
+
+class SceneDelegate(QStyledItemDelegate):
+    """镜头卡片绘制（缩略图 + 镜头ID + 时间 + 时长）"""
     
-    def _init_ui(self, keyframe_path: str):
-        """初始化UI"""
-        layout = QVBoxLayout(self)
-        layout.setContentsMargins(5, 5, 5, 5)
+    # 绘制用的颜色/画笔/画刷（只创建一次）
+    _PEN_BORDER = QPen(QColor(128, 128, 128), 1)
+    _PEN_SELECTED = QPen(QColor(0x4A, 0x90, 0xE2), 2)
+    _BRUSH_THUMBNAIL = QBrush(QColor(0, 0, 0))
+    _COLOR_SECONDARY = QColor(128, 128, 128)
+    
+    def sizeHint(self, option: QStyleOptionViewItem, index: QModelIndex) -> QSize:
+        return QSize(THUMBNAIL_WIDTH + 2 * CARD_MARGIN, CARD_HEIGHT)
+    
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex):
+        scene = index.data(SCENE_ROLE)
+        if scene is None:
+            return
         
-        # 缩略图
-        self.thumbnail_label = QLabel()
-        self.thumbnail_label.setFixedSize(160, 90)
-        self.thumbnail_label.setStyleSheet("background-color: black;")
-        self.thumbnail_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        painter.save()
         
-        if keyframe_path:
-            self.load_thumbnail(keyframe_path)
+        # 卡片边框（选中时高亮）
+        rect = option.rect.adjusted(1, 1, -1, -1)
+        selected = bool(option.state & QStyle.StateFlag.State_Selected)
+        painter.setPen(self._PEN_SELECTED if selected else self._PEN_BORDER)
+        painter.drawRect(rect)
         
-        layout.addWidget(self.thumbnail_label)
+        # 缩略图（水平居中）
+        thumb_rect = QRect(
+            rect.center().x() - THUMBNAIL_WIDTH // 2, rect.top() + CARD_MARGIN,
+            THUMBNAIL_WIDTH, THUMBNAIL_HEIGHT
+        )
+        painter.fillRect(thumb_rect, self._BRUSH_THUMBNAIL)
+        
+        pixmap = index.data(Qt.ItemDataRole.DecorationRole)
+        if pixmap is not None:
+            x = thumb_rect.x() + (THUMBNAIL_WIDTH - pixmap.width()) // 2
+            y = thumb_rect.y() + (THUMBNAIL_HEIGHT - pixmap.height()) // 2
+            painter.drawPixmap(x, y, pixmap)
         
         # 镜头ID
-        id_label = QLabel(self.scene['id'])
-        id_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        layout.addWidget(id_label)
-        
-        # 时间信息
-        time_text = f"{self.scene['start_time']:.1f}s - {self.scene['end_time']:.1f}s"
-        time_label = QLabel(time_text)
-        time_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        time_label.setStyleSheet("color: gray; font-size: 10px;")
-        layout.addWidget(time_label)
-        
-        # 时长
-        duration_text = f"时长: {self.scene['duration']:.1f}s"
-        duration_label = QLabel(duration_text)
-        duration_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        duration_label.setStyleSheet("color: gray; font-size: 10px;")
-        layout.addWidget(duration_label)
-    
-    def load_thumbnail(self, image_path: str):
-        """加载缩略图"""
-        try:
-            # 使用OpenCV读取
-            img = cv2.imread(image_path)
-            if img is not None:
-                img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-                height, width, channel = img.shape
-                bytes_per_line = 3 * width
-                q_image = QImage(img.data, width, height, bytes_per_line, QImage.Format.Format_RGB888)
-                
-                pixmap = QPixmap.fromImage(q_image)
-                scaled_pixmap = pixmap.scaled(
-                    160, 90,
-                    Qt.AspectRatioMode.KeepAspectRatio,
-                    Qt.TransformationMode.SmoothTransformation
-                )
-                
-                self.thumbnail_label.setPixmap(scaled_pixmap)
-        except Exception as e:
-            logger.error(f"加载缩略图失败: {str(e)}")
-    
-    def mousePressEvent(self, event):
-        """鼠标点击事件"""
-        self.clicked.emit(self.scene_id)
-        super().mousePressEvent(event)
-    
-    def set_selected(self, selected: bool):
-        """设置选中状态"""
-        if selected:
-            self.setStyleSheet("QFrame { border: 2px solid #4A90E2; }")
-        else:
-            self.setStyleSheet("")
+        line_rect = QRect(
+            rect.left(), thumb_rect.bottom() + CARD_SPACING,
+            rect.width(), TEXT_LINE_HEIGHT
+        )
+        painter.setPen(option.palette.color(QPalette.ColorRole.Text))
+        painter.drawText(line_rect, Qt.AlignmentFlag.AlignCenter, scene['id'])
+        
+        # 时间信息 / 时长
+        font = QFont(option.font)
+        font.setPixelSize(10)
+        painter.setFont(font)
+        painter.setPen(self._COLOR_SECONDARY)
+        
+        line_rect.translate(0, TEXT_LINE_HEIGHT)
+        painter.drawText(
+            line_rect, Qt.AlignmentFlag.AlignCenter,
+            f"{scene['start_time']:.1f}s - {scene['end_time']:.1f}s"
+        )
+        
+        line_rect.translate(0, TEXT_LINE_HEIGHT)
+        painter.drawText(
+            line_rect, Qt.AlignmentFlag.AlignCenter,
+            f"时长: {scene['duration']:.1f}s"
+        )
+        
+        painter.restore()
 
 
-class SceneListWidget(QScrollArea):
+class SceneListWidget(QListView):
     """镜头列表组件"""
     
     scene_selected = pyqtSignal(str)  # scene_id
@@ -110,67 +256,112 @@ class SceneListWidget(QScrollArea):
     def __init__(self, parent=None):
         super().__init__(parent)
         
-        self.scenes = []
         self.keyframes = []
-        self.scene_cards = []
         self.selected_scene_id = None
         
+        # 缩略图后台解码（留一个核心给界面线程）
+        self._thumbnail_pool = QThreadPool(self)
+        self._thumbnail_pool.setMaxThreadCount(max(1, (os.cpu_count() or 2) - 1))
+        self._thumbnail_signals = _ThumbnailSignals(self)
+        self._thumbnail_signals.loaded.connect(self._on_thumbnail_loaded)
+        
         self._init_ui()
         logger.info("镜头列表初始化完成")
     
     def _init_ui(self):
         """初始化UI"""
-        self.setWidgetResizable(True)
-        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self._model = SceneModel(self)
+        self.setModel(self._model)
+        self.setItemDelegate(SceneDelegate(self))
         
-        # 容器
-        container = QWidget()
-        self.container_layout = QVBoxLayout(container)
-        self.container_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
+        # 所有卡片尺寸相同，视图无需逐行计算布局
+        self.setUniformItemSizes(True)
+        self.setSpacing(2)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.setCursor(Qt.CursorShape.PointingHandCursor)
         
-        self.setWidget(container)
+        self.clicked.connect(self._on_index_clicked)
     
     def set_scenes(self, scenes: List[Dict], keyframes: List[Dict] = None):
-        """设置镜头列表"""
-        self.scenes = scenes
+        """设置镜头列表（仍然存在的镜头保留已加载的缩略图）"""
         self.keyframes = keyframes or []
         
-        # 清空现有卡片
-        self.clear_cards()
+        # 镜头ID -> 第一个关键帧路径
+        keyframe_paths = {}
+        for kf in self.keyframes:
+            keyframe_paths.setdefault(kf['scene_id'], kf.get('image_path'))
+        
+        self._model.set_scenes(scenes)
         
-        # 创建新卡片
         for scene in scenes:
-            # 查找该镜头的第一个关键帧
-            keyframe_path = None
-            for kf in self.keyframes:
-                if kf['scene_id'] == scene['id']:
-                    keyframe_path = kf.get('image_path')
-                    break
-            
-            # 创建卡片
-            card = SceneCard(scene, keyframe_path)
-            card.clicked.connect(self.on_card_clicked)
-            
-            self.scene_cards.append(card)
-            self.container_layout.addWidget(card)
+            keyframe_path = keyframe_paths.get(scene['id'])
+            if keyframe_path != self._model.keyframe_path(scene['id']):
+                self._load_thumbnail(scene['id'], keyframe_path)
+    
+    def append_scene(self, scene: Dict):
+        """追加一个镜头（缩略图待关键帧提取完成后再加载）"""
+        self._model.append_scene(scene)
+    
+    def set_scene_keyframes(self, scene_id: str, keyframes: List[Dict]):
+        """追加某个镜头的关键帧，并用第一帧更新其缩略图"""
+        self.keyframes.extend(keyframes)
+        
+        if self._model.row_of(scene_id) is None:
+            return
+        
+        keyframe_path = next((kf.get('image_path') for kf in keyframes if kf.get('image_path')), None)
+        if keyframe_path:
+            self._load_thumbnail(scene_id, keyframe_path)
+    
+    def _load_thumbnail(self, scene_id: str, image_path: Optional[str]):
+        """提交缩略图解码任务（路径为空时清除缩略图）"""
+        self._model.set_keyframe_path(scene_id, image_path)
+        if not image_path:
+            return
+        
+        # 已解码过的缩略图直接使用
+        pixmap = cached_thumbnail(image_path)
+        if pixmap is not None:
+            self._model.set_thumbnail(scene_id, pixmap)
+            return
+        
+        self._thumbnail_pool.start(_ThumbnailLoader(
+            self._thumbnail_signals, scene_id, image_path
+        ))
+    
+    def _on_thumbnail_loaded(self, scene_id: str, image_path: str, image: QImage):
+        """缩略图解码完成（放入缓存；镜头已删除或已换图时不显示）"""
+        pixmap = cache_thumbnail(image_path, image)
+        
+        if self._model.keyframe_path(scene_id) == image_path:
+            self._model.set_thumbnail(scene_id, pixmap)
     
     def clear_cards(self):
-        """清空所有卡片"""
-        for card in self.scene_cards:
-            self.container_layout.removeWidget(card)
-            card.deleteLater()
+        """清空所有镜头"""
+        self._model.set_scenes([])
+        self.selected_scene_id = None
         
-        self.scene_cards.clear()
+        # 尚未开始的解码任务直接取消
+        self._thumbnail_pool.clear()
     
-    def on_card_clicked(self, scene_id: str):
+    def _on_index_clicked(self, index: QModelIndex):
         """卡片点击事件"""
-        # 更新选中状态
-        for card in self.scene_cards:
-            card.set_selected(card.scene_id == scene_id)
+        scene = index.data(SCENE_ROLE)
+        if scene is not None:
+            self.on_card_clicked(scene['id'])
+    
+    def on_card_clicked(self, scene_id: str):
+        """选中镜头"""
+        row = self._model.row_of(scene_id)
+        if row is None:
+            return
         
+        self.setCurrentIndex(self._model.index(row))
         self.selected_scene_id = scene_id
         self.scene_selected.emit(scene_id)
     
     def get_scenes(self) -> List[Dict]:
         """获取镜头列表"""
-        return self.scenes
+        return self._model.scenes()
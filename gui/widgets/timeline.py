@@ -3,9 +3,10 @@
 """
 
 from PyQt6.QtWidgets import QWidget, QHBoxLayout, QLabel
-from PyQt6.QtCore import Qt, pyqtSignal, QRectF, QPointF
+from PyQt6.QtCore import Qt, pyqtSignal, QEvent, QRect, QRectF, QPointF
 from PyQt6.QtGui import QPainter, QColor, QPen, QBrush, QMouseEvent
 from typing import List, Dict
+import numpy as np
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -18,10 +19,30 @@ class Timeline(QWidget):
     position_changed = pyqtSignal(float)  # 位置改变（秒）
     scene_clicked = pyqtSignal(str)       # 镜头点击
     
+    # 绘制用的颜色/画笔/画刷（只创建一次，每次重绘直接复用）
+    _BRUSH_BG = QBrush(QColor(40, 40, 40))
+    _SCENE_COLORS = (QColor(70, 130, 180), QColor(100, 150, 200))  # 按序号交替
+    _PEN_WHITE = QPen(QColor(255, 255, 255), 1)
+    _PEN_SCALE = QPen(QColor(200, 200, 200))
+    _PEN_CURSOR = QPen(QColor(255, 0, 0), 2)
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         
         self.scenes = []
+        
+        # 镜头起止时间/颜色序号/ID（set_scenes 时预先计算，绘制时只做向量换算）
+        self._starts = np.empty(0)
+        self._ends = np.empty(0)
+        self._parity = np.empty(0, dtype=np.int64)
+        self._ids = []
+        
+        # 刻度间隔 -> (刻度时间数组, 刻度文字列表)
+        self._tick_cache = {}
+        
+        # 镜头ID -> 文字宽度（像素）
+        self._id_widths = {}
+        
         self.duration = 0
         self.current_position = 0
         self.zoom_level = 1.0
@@ -35,71 +56,154 @@ class Timeline(QWidget):
         """设置镜头列表"""
         self.scenes = scenes
         
+        count = len(scenes)
+        self._starts = np.fromiter((s['start_time'] for s in scenes), dtype=np.float64, count=count)
+        self._ends = np.fromiter((s['end_time'] for s in scenes), dtype=np.float64, count=count)
+        self._parity = np.fromiter((s['index'] for s in scenes), dtype=np.int64, count=count) & 1
+        self._ids = [s['id'] for s in scenes]
+        
         if scenes:
             self.duration = scenes[-1]['end_time']
+        self._tick_cache.clear()
+        self._id_widths.clear()
         
         self.update()
     
     def set_position(self, time_sec: float):
         """设置当前位置"""
+        old_x = self._position_x()
         self.current_position = time_sec
-        self.update()
+        new_x = self._position_x()
+        
+        if old_x is None or new_x is None:
+            self.update()
+            return
+        
+        # 只重绘指示器移开和移到的两条窄带（Qt 会合并为一个区域）
+        if new_x != old_x:
+            height = self.height()
+            self.update(QRect(old_x - 2, 0, 5, height))
+            self.update(QRect(new_x - 2, 0, 5, height))
+    
+    def _overlap_range(self, t0: float, t1: float):
+        """与时间区间 [t0, t1] 重叠的镜头下标范围 [first, last)（镜头按时间排列）"""
+        first = int(np.searchsorted(self._ends, t0, side='left'))
+        last = int(np.searchsorted(self._starts, t1, side='right'))
+        return first, max(first, last)
+    
+    def scenes_overlapping(self, t0: float, t1: float) -> np.ndarray:
+        """
+        计算与时间区间重叠的镜头（用于框选、拖动裁剪、吸附等）
+        
+        Args:
+            t0: 区间开始（秒）
+            t1: 区间结束（秒）
+            
+        Returns:
+            布尔掩码，与镜头列表一一对应
+        """
+        mask = np.zeros(len(self._ids), dtype=np.bool_)
+        first, last = self._overlap_range(t0, t1)
+        mask[first:last] = True
+        return mask
+    
+    def _pixels_per_second(self) -> float:
+        """每秒对应的像素数"""
+        return (self.width() - 20) / self.duration * self.zoom_level
+    
+    def _position_x(self):
+        """播放位置指示器的横坐标，无法绘制时返回None"""
+        if not self.scenes or self.duration == 0:
+            return None
+        return int(10 + self.current_position * self._pixels_per_second())
     
     def paintEvent(self, event):
         """绘制事件"""
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         
+        # 只处理需要重绘的区域（播放时通常只是指示器附近的窄带）
+        dirty = event.rect()
+        
         # 背景
-        painter.fillRect(self.rect(), QColor(40, 40, 40))
+        painter.fillRect(dirty, self._BRUSH_BG)
         
         if not self.scenes or self.duration == 0:
             return
         
         # 计算缩放
-        width = self.width()
         height = self.height()
-        pixels_per_second = (width - 20) / self.duration * self.zoom_level
+        pixels_per_second = self._pixels_per_second()
         
         # 绘制镜头
         y_offset = 10
         scene_height = height - 40
         
-        for scene in self.scenes:
-            start_x = 10 + scene['start_time'] * pixels_per_second
-            end_x = 10 + scene['end_time'] * pixels_per_second
+        # 只绘制与重绘区域相交的镜头（镜头按时间排列）
+        starts = self._starts
+        ends = self._ends
+        first, last = self._overlap_range(
+            (dirty.left() - 10) / pixels_per_second,
+            (dirty.right() + 1 - 10) / pixels_per_second
+        )
+        
+        start_xs = (10 + starts[first:last] * pixels_per_second).tolist()
+        end_xs = (10 + ends[first:last] * pixels_per_second).tolist()
+        parities = self._parity[first:last].tolist()
+        
+        # 边框与文字同为白色，只设置一次画笔
+        painter.setPen(self._PEN_WHITE)
+        
+        # 循环内只使用局部变量
+        colors = self._SCENE_COLORS
+        fill_rect = painter.fillRect
+        draw_rect = painter.drawRect
+        draw_text = painter.drawText
+        align_center = Qt.AlignmentFlag.AlignCenter
+        id_widths = self._id_widths
+        text_width = painter.fontMetrics().horizontalAdvance
+        dirty_left = dirty.left()
+        dirty_right = dirty.right() + 1
+        
+        for start_x, end_x, parity, scene_id in zip(start_xs, end_xs, parities, self._ids[first:last]):
             scene_width = end_x - start_x
             
             # 镜头矩形
             rect = QRectF(start_x, y_offset, scene_width, scene_height)
             
             # 填充颜色（交替）
-            if scene['index'] % 2 == 0:
-                color = QColor(70, 130, 180)
-            else:
-                color = QColor(100, 150, 200)
-            
-            painter.fillRect(rect, color)
+            fill_rect(rect, colors[parity])
             
             # 边框
-            painter.setPen(QPen(QColor(255, 255, 255), 1))
-            painter.drawRect(rect)
+            draw_rect(rect)
             
-            # 镜头ID（如果空间足够）
+            # 镜头ID（如果空间足够，且文字落在重绘区域内）
             if scene_width > 50:
-                painter.setPen(QColor(255, 255, 255))
-                painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, scene['id'])
+                half_width = id_widths.get(scene_id)
+                if half_width is None:
+                    half_width = id_widths[scene_id] = text_width(scene_id) / 2
+                
+                center_x = (start_x + end_x) / 2
+                if center_x + half_width >= dirty_left and center_x - half_width <= dirty_right:
+                    draw_text(rect, align_center, scene_id)
         
         # 绘制时间刻度
-        self.draw_time_scale(painter, pixels_per_second)
+        self.draw_time_scale(painter, pixels_per_second, dirty)
         
         # 绘制播放位置指示器
-        position_x = 10 + self.current_position * pixels_per_second
-        painter.setPen(QPen(QColor(255, 0, 0), 2))
-        painter.drawLine(int(position_x), 0, int(position_x), height)
+        position_x = self._position_x()
+        painter.setPen(self._PEN_CURSOR)
+        painter.drawLine(position_x, 0, position_x, height)
     
-    def draw_time_scale(self, painter: QPainter, pixels_per_second: float):
-        """绘制时间刻度"""
+    def draw_time_scale(self, painter: QPainter, pixels_per_second: float, dirty: QRect = None):
+        """
+        绘制时间刻度
+        
+        Args:
+            painter: 绘制器
+            pixels_per_second: 每秒像素数
+            dirty: 需要重绘的区域，为空时绘制全部刻度
+        """
         height = self.height()
         scale_y = height - 20
         
@@ -113,20 +217,46 @@ class Timeline(QWidget):
         else:
             interval = 10  # 10秒
         
-        painter.setPen(QColor(200, 200, 200))
+        painter.setPen(self._PEN_SCALE)
         
-        time = 0
-        while time <= self.duration:
-            x = 10 + time * pixels_per_second
-            
+        times, labels = self._get_ticks(interval)
+        
+        first, last = 0, len(times)
+        if dirty is not None:
+            # 刻度文字向两侧各延伸约20像素
+            first = int(np.searchsorted(times, (dirty.left() - 30) / pixels_per_second, side='left'))
+            last = int(np.searchsorted(times, (dirty.right() + 30) / pixels_per_second, side='right'))
+        
+        xs = (10 + times[first:last] * pixels_per_second).astype(np.int64).tolist()
+        
+        draw_line = painter.drawLine
+        draw_text = painter.drawText
+        tick_bottom = scale_y + 5
+        text_y = scale_y + 15
+        
+        for x, time_text in zip(xs, labels[first:last]):
             # 刻度线
-            painter.drawLine(int(x), scale_y, int(x), scale_y + 5)
+            draw_line(x, scale_y, x, tick_bottom)
             
             # 时间文本
-            time_text = self.format_time(time)
-            painter.drawText(int(x - 20), scale_y + 15, time_text)
+            draw_text(x - 20, text_y, time_text)
+    
+    def _get_ticks(self, interval: int):
+        """
+        获取刻度时间与文字（按间隔缓存，时长变化时重建）
+        
+        Args:
+            interval: 刻度间隔（秒）
             
-            time += interval
+        Returns:
+            (刻度时间数组, 刻度文字列表)
+        """
+        ticks = self._tick_cache.get(interval)
+        if ticks is None:
+            times = np.arange(0, int(self.duration // interval) + 1, dtype=np.float64) * interval
+            ticks = (times, [self.format_time(t) for t in times.tolist()])
+            self._tick_cache[interval] = ticks
+        return ticks
     
     def format_time(self, seconds: float) -> str:
         """格式化时间"""
@@ -140,22 +270,26 @@ class Timeline(QWidget):
             return
         
         x = event.position().x()
-        width = self.width()
-        pixels_per_second = (width - 20) / self.duration * self.zoom_level
+        pixels_per_second = self._pixels_per_second()
         
         # 计算点击的时间位置
         time_sec = (x - 10) / pixels_per_second
         time_sec = max(0, min(time_sec, self.duration))
         
-        # 查找点击的镜头
-        for scene in self.scenes:
-            if scene['start_time'] <= time_sec <= scene['end_time']:
-                self.scene_clicked.emit(scene['id'])
-                break
+        # 查找点击的镜头（二分查找第一个结束时间不早于点击位置的镜头）
+        index = int(np.searchsorted(self._ends, time_sec, side='left'))
+        if index < len(self._ids) and self._starts[index] <= time_sec:
+            self.scene_clicked.emit(self._ids[index])
         
         # 发出位置改变信号
         self.position_changed.emit(time_sec)
     
+    def changeEvent(self, event):
+        """字体变化时重新测量镜头ID宽度"""
+        if event.type() == QEvent.Type.FontChange:
+            self._id_widths.clear()
+        super().changeEvent(event)
+    
     def wheelEvent(self, event):
         """鼠标滚轮事件（缩放）"""
         delta = event.angleDelta().y()
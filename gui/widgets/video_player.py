@@ -2,17 +2,218 @@
 视频播放器组件
 """
 
+import time
+from collections import deque
+from functools import lru_cache
+from typing import Optional, Tuple
+
 import cv2
+import numpy as np
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel,
     QPushButton, QSlider, QStyle
 )
-from PyQt6.QtCore import Qt, QTimer, pyqtSignal, QSize
+from PyQt6.QtCore import (
+    Qt, QTimer, pyqtSignal, QSize, QThread, QMutex, QMutexLocker, QWaitCondition
+)
 from PyQt6.QtGui import QImage, QPixmap, QIcon
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# 解码缓冲区容量（只保留最新的几帧，界面总是显示最新一帧）
+FRAME_BUFFER_SIZE = 3
+
+# 向前跳转不超过此帧数时逐帧跳过（grab 只解码不取图），不重新定位
+SEEK_GRAB_LIMIT = 30
+
+# 播放中进度条/时间显示的刷新间隔（毫秒）
+HUD_REFRESH_MS = 100
+
+# 播放中每秒发出位置信号的次数（时间显示只在整秒变化时更新）
+POSITION_SIGNALS_PER_SEC = 4
+
+# 预分配的帧内存块数量（缓冲区中的帧 + 正在显示的帧 + 正在解码的帧）
+FRAME_SLOT_COUNT = FRAME_BUFFER_SIZE + 2
+
+
+@lru_cache(maxsize=4096)
+def _format_seconds(seconds: int) -> str:
+    """把整数秒格式化为 MM:SS（结果缓存）"""
+    minutes, secs = divmod(seconds, 60)
+    return f"{minutes:02d}:{secs:02d}"
+
+
+class DecoderThread(QThread):
+    """解码线程：按帧率顺序读取视频帧，放入有界缓冲区"""
+    
+    def __init__(self, cap: cv2.VideoCapture, fps: float, parent=None):
+        """
+        初始化解码线程
+        
+        Args:
+            cap: 已打开的视频捕获对象（之后只由本线程读取）
+            fps: 视频帧率
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self.cap = cap
+        self.interval = 1.0 / fps if fps > 0 else 1.0 / 30
+        
+        # 视频捕获对象与解码状态
+        self._cap_mutex = QMutex()
+        self._wake = QWaitCondition()
+        self._last_decoded_frame = -1
+        self._running = False
+        self._stopped = False
+        self._at_end = False
+        
+        # 节拍：_clock_frame 帧应在 _clock_start 时刻显示
+        self._clock_start = 0.0
+        self._clock_frame = 0
+        
+        # 缓冲区：(帧号, 帧图像)
+        self._buffer_mutex = QMutex()
+        self._frames = deque(maxlen=FRAME_BUFFER_SIZE)
+        
+        # 预分配帧内存，解码时轮流写入，播放过程中不再分配图像内存
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        self._slots = [np.empty((height, width, 3), dtype=np.uint8) for _ in range(FRAME_SLOT_COUNT)]
+        self._slot = 0
+    
+    @property
+    def at_end(self) -> bool:
+        """是否已读到视频末尾"""
+        return self._at_end
+    
+    def run(self):
+        """解码循环（在解码线程中执行）"""
+        while True:
+            with QMutexLocker(self._cap_mutex):
+                while not self._stopped and (not self._running or self._at_end):
+                    self._wake.wait(self._cap_mutex)
+                if self._stopped:
+                    break
+                
+                # 解码落后于播放时钟时丢弃来不及显示的帧
+                self._skip_late_frames()
+                
+                frame = self._decode_next()
+                if frame is None:
+                    self._at_end = True
+                    continue
+                
+                frame_number = self._last_decoded_frame
+                due = self._clock_start + (frame_number + 1 - self._clock_frame) * self.interval
+                
+                # 仍持有 _cap_mutex 时入队，避免与 seek_to 交错导致跳转前的旧帧在清空后入队
+                with QMutexLocker(self._buffer_mutex):
+                    self._frames.append((frame_number, frame))
+            
+            # 按帧率节拍解码，最多领先一帧
+            delay = due - time.monotonic()
+            if delay > 0:
+                self.msleep(int(delay * 1000))
+    
+    def resume(self):
+        """开始/继续顺序解码"""
+        with QMutexLocker(self._cap_mutex):
+            self._running = True
+            self._reset_clock()
+            self._wake.wakeAll()
+    
+    def pause(self):
+        """暂停顺序解码"""
+        with QMutexLocker(self._cap_mutex):
+            self._running = False
+    
+    def stop(self):
+        """结束解码线程并等待退出"""
+        with QMutexLocker(self._cap_mutex):
+            self._stopped = True
+            self._wake.wakeAll()
+        self.wait()
+    
+    def latest(self) -> Optional[Tuple[int, np.ndarray]]:
+        """取缓冲区中最新的一帧，没有则返回None"""
+        with QMutexLocker(self._buffer_mutex):
+            return self._frames[-1] if self._frames else None
+    
+    def seek_to(self, frame_number: int) -> Optional[np.ndarray]:
+        """
+        跳转并读取指定帧，之后从下一帧继续顺序解码
+        
+        Args:
+            frame_number: 帧号
+            
+        Returns:
+            帧图像，失败返回None
+        """
+        with QMutexLocker(self._cap_mutex):
+            frame = self._decode_at(frame_number)
+            self._at_end = frame is None
+            self._reset_clock()
+            
+            with QMutexLocker(self._buffer_mutex):
+                self._frames.clear()
+            
+            self._wake.wakeAll()
+            return frame
+    
+    def _reset_clock(self):
+        """以当前时刻作为下一帧的显示时间（调用方持有 _cap_mutex）"""
+        self._clock_start = time.monotonic()
+        self._clock_frame = self._last_decoded_frame + 1
+    
+    def _skip_late_frames(self):
+        """按播放时钟计算应显示的帧，落后时用 grab 跳过（调用方持有 _cap_mutex）"""
+        elapsed = time.monotonic() - self._clock_start
+        target = self._clock_frame + int(elapsed / self.interval)
+        behind = target - (self._last_decoded_frame + 1)
+        
+        for _ in range(min(behind, SEEK_GRAB_LIMIT)):
+            if not self.cap.grab():
+                break
+            self._last_decoded_frame += 1
+    
+    def _decode_next(self) -> Optional[np.ndarray]:
+        """顺序读取下一帧，失败返回None"""
+        ret, frame = self.cap.read(self._slots[self._slot])
+        if not ret:
+            return None
+        
+        # 尺寸不符时 OpenCV 会另行分配，换下原内存块
+        self._slots[self._slot] = frame
+        self._slot = (self._slot + 1) % FRAME_SLOT_COUNT
+        
+        self._last_decoded_frame += 1
+        return frame
+    
+    def _decode_at(self, frame_number: int) -> Optional[np.ndarray]:
+        """
+        读取指定帧（正好是下一帧或小幅向前时不重新定位）
+        
+        Args:
+            frame_number: 帧号
+            
+        Returns:
+            帧图像，失败返回None
+        """
+        delta = frame_number - self._last_decoded_frame
+        if 0 < delta <= SEEK_GRAB_LIMIT:
+            # 小幅向前跳转：跳过中间帧
+            for _ in range(delta - 1):
+                if not self.cap.grab():
+                    return None
+                self._last_decoded_frame += 1
+        elif delta != 1:
+            # 设置帧位置（会回退到关键帧重新解码）
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
+            self._last_decoded_frame = frame_number - 1
+        
+        return self._decode_next()
+
 
 class VideoPlayer(QWidget):
     """视频播放器"""
@@ -26,16 +227,27 @@ class VideoPlayer(QWidget):
         
         self.video_path = None
         self.cap = None
+        self._decoder = None
         self.is_playing = False
         self.current_frame = 0
         self.total_frames = 0
         self.fps = 30
         self.duration = 0
+        self._total_time_str = "00:00"  # 总时长显示（加载视频后不再变化）
         
         # 定时器
         self.timer = QTimer()
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
         self.timer.timeout.connect(self.update_frame)
         
+        # 进度显示定时器（播放中低频刷新进度条、时间与位置信号）
+        self._hud_timer = QTimer(self)
+        self._hud_timer.setInterval(HUD_REFRESH_MS)
+        self._hud_timer.timeout.connect(self._refresh_hud)
+        self._hud_frame = -1  # 进度显示对应的帧号
+        self._hud_sec = -1    # 时间显示对应的整秒
+        self._emit_tick = -1  # 最近一次位置信号对应的节拍
+        
         self._init_ui()
         logger.info("视频播放器初始化完成")
     
@@ -50,23 +262,25 @@ class VideoPlayer(QWidget):
         self.video_label.setStyleSheet("background-color: black;")
         self.video_label.setMinimumSize(640, 360)
         layout.addWidget(self.video_label)
+        self._label_size = self.video_label.size()
         
         # 控制栏
         control_layout = QHBoxLayout()
         
+        # 图标（播放/暂停切换时复用）
+        style = self.style()
+        self._icon_play = style.standardIcon(QStyle.StandardPixmap.SP_MediaPlay)
+        self._icon_pause = style.standardIcon(QStyle.StandardPixmap.SP_MediaPause)
+        
         # 播放/暂停按钮
         self.play_btn = QPushButton()
-        self.play_btn.setIcon(
-            self.style().standardIcon(QStyle.StandardPixmap.SP_MediaPlay)
-        )
+        self.play_btn.setIcon(self._icon_play)
         self.play_btn.clicked.connect(self.toggle_play)
         control_layout.addWidget(self.play_btn)
         
         # 停止按钮
         self.stop_btn = QPushButton()
-        self.stop_btn.setIcon(
-            self.style().standardIcon(QStyle.StandardPixmap.SP_MediaStop)
-        )
+        self.stop_btn.setIcon(style.standardIcon(QStyle.StandardPixmap.SP_MediaStop))
         self.stop_btn.clicked.connect(self.stop)
         control_layout.addWidget(self.stop_btn)
         
@@ -81,16 +295,12 @@ class VideoPlayer(QWidget):
         
         # 音量按钮
         self.volume_btn = QPushButton()
-        self.volume_btn.setIcon(
-            self.style().standardIcon(QStyle.StandardPixmap.SP_MediaVolume)
-        )
+        self.volume_btn.setIcon(style.standardIcon(QStyle.StandardPixmap.SP_MediaVolume))
         control_layout.addWidget(self.volume_btn)
         
         # 全屏按钮
         self.fullscreen_btn = QPushButton()
-        self.fullscreen_btn.setIcon(
-            self.style().standardIcon(QStyle.StandardPixmap.SP_TitleBarMaxButton)
-        )
+        self.fullscreen_btn.setIcon(style.standardIcon(QStyle.StandardPixmap.SP_TitleBarMaxButton))
         control_layout.addWidget(self.fullscreen_btn)
         
         layout.addLayout(control_layout)
@@ -105,21 +315,26 @@ class VideoPlayer(QWidget):
         logger.info(f"加载视频: {video_path}")
         
         # 释放之前的视频
-        if self.cap:
-            self.cap.release()
+        self.release()
         
         # 打开新视频
         self.video_path = video_path
-        self.cap = cv2.VideoCapture(video_path)
+        self.cap = self._open_capture(video_path)
         
         if not self.cap.isOpened():
             logger.error(f"无法打开视频: {video_path}")
+            self.release()
             return
         
         # 获取视频信息
         self.fps = self.cap.get(cv2.CAP_PROP_FPS)
         self.total_frames = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
         self.duration = self.total_frames / self.fps if self.fps > 0 else 0
+        self._total_time_str = self.format_time(self.duration)
+        
+        # 启动解码线程
+        self._decoder = DecoderThread(self.cap, self.fps, self)
+        self._decoder.start()
         
         # 设置进度条范围
         self.progress_slider.setMaximum(self.total_frames)
@@ -133,6 +348,27 @@ class VideoPlayer(QWidget):
         
         logger.info(f"视频加载完成: {self.duration:.2f}秒, {self.fps:.2f}fps")
     
+    def _open_capture(self, video_path: str) -> cv2.VideoCapture:
+        """
+        打开视频，优先使用 FFmpeg 硬件解码，不支持时退回软件解码
+        
+        Args:
+            video_path: 视频文件路径
+            
+        Returns:
+            视频捕获对象
+        """
+        cap = cv2.VideoCapture(
+            video_path, cv2.CAP_FFMPEG,
+            [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY]
+        )
+        if cap.isOpened():
+            logger.debug(f"硬件解码: {int(cap.get(cv2.CAP_PROP_HW_ACCELERATION))}")
+            return cap
+        
+        cap.release()
+        return cv2.VideoCapture(video_path)
+    
     def toggle_play(self):
         """切换播放/暂停"""
         if self.is_playing:
@@ -146,13 +382,13 @@ class VideoPlayer(QWidget):
             return
         
         self.is_playing = True
+        self._decoder.resume()
         interval = int(1000 / self.fps) if self.fps > 0 else 33
         self.timer.start(interval)
+        self._hud_timer.start()
         
         # 更新按钮图标
-        self.play_btn.setIcon(
-            self.style().standardIcon(QStyle.StandardPixmap.SP_MediaPause)
-        )
+        self.play_btn.setIcon(self._icon_pause)
         
         self.state_changed.emit("playing")
         logger.debug("开始播放")
@@ -161,11 +397,15 @@ class VideoPlayer(QWidget):
         """暂停"""
         self.is_playing = False
         self.timer.stop()
+        self._hud_timer.stop()
+        if self._decoder:
+            self._decoder.pause()
+        
+        # 补上最后一次进度显示
+        self._refresh_hud()
         
         # 更新按钮图标
-        self.play_btn.setIcon(
-            self.style().standardIcon(QStyle.StandardPixmap.SP_MediaPlay)
-        )
+        self.play_btn.setIcon(self._icon_play)
         
         self.state_changed.emit("paused")
         logger.debug("暂停播放")
@@ -191,6 +431,8 @@ class VideoPlayer(QWidget):
         frame_number = max(0, min(frame_number, self.total_frames - 1))
         
         self.current_frame = frame_number
+        self._hud_frame = frame_number
+        self._hud_sec = self._emit_tick = -1
         self.display_frame(frame_number)
         
         # 更新进度条
@@ -214,27 +456,49 @@ class VideoPlayer(QWidget):
         if not self.cap or not self.is_playing:
             return
         
-        self.current_frame += 1
+        # 取解码线程最新的一帧
+        latest = self._decoder.latest()
+        if latest is None:
+            # 检查是否到达结尾
+            if self._decoder.at_end:
+                self.stop()
+            return
         
-        # 检查是否到达结尾
-        if self.current_frame >= self.total_frames:
-            self.stop()
+        frame_number, frame = latest
+        if frame_number == self.current_frame:
+            # 最后一帧已显示且解码已到结尾
+            if self._decoder.at_end:
+                self.stop()
             return
         
-        # 显示当前帧
-        self.display_frame(self.current_frame)
+        self.current_frame = frame_number
+        self._show_frame(frame)
+    
+    def _refresh_hud(self):
+        """刷新进度条、时间显示并发出位置信号（播放中由定时器调用）"""
+        frame_number = self.current_frame
+        if frame_number == self._hud_frame:
+            return
+        self._hud_frame = frame_number
         
         # 更新进度条
         self.progress_slider.blockSignals(True)
-        self.progress_slider.setValue(self.current_frame)
+        self.progress_slider.setValue(frame_number)
         self.progress_slider.blockSignals(False)
         
-        # 更新时间显示
-        self.update_time_label()
+        time_sec = frame_number / self.fps if self.fps > 0 else 0
         
-        # 发出信号
-        time_sec = self.current_frame / self.fps if self.fps > 0 else 0
-        self.position_changed.emit(time_sec)
+        # 更新时间显示（只显示到秒）
+        sec = int(time_sec)
+        if sec != self._hud_sec:
+            self._hud_sec = sec
+            self.update_time_label()
+        
+        # 发出信号（按节拍限频）
+        tick = int(time_sec * POSITION_SIGNALS_PER_SEC)
+        if tick != self._emit_tick:
+            self._emit_tick = tick
+            self.position_changed.emit(time_sec)
     
     def display_frame(self, frame_number: int):
         """
@@ -246,29 +510,29 @@ class VideoPlayer(QWidget):
         if not self.cap:
             return
         
-        # 设置帧位置
-        self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
-        
-        # 读取帧
-        ret, frame = self.cap.read()
-        
-        if not ret:
-            return
-        
-        # 转换颜色空间
-        frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        
-        # 转换为QImage
+        frame = self._decoder.seek_to(frame_number)
+        if frame is not None:
+            self._show_frame(frame)
+    
+    def _show_frame(self, frame):
+        """把解码得到的帧显示到画面区域"""
+        # 转换为QImage（直接使用 OpenCV 的 BGR 数据，不做颜色转换）
         height, width, channel = frame.shape
         bytes_per_line = 3 * width
-        q_image = QImage(frame.data, width, height, bytes_per_line, QImage.Format.Format_RGB888)
+        q_image = QImage(frame.data, width, height, bytes_per_line, QImage.Format.Format_BGR888)
         
         # 缩放以适应显示区域
+        # 播放中用快速缩放，暂停/跳转时的静止画面用平滑缩放
+        if self.is_playing:
+            mode = Qt.TransformationMode.FastTransformation
+        else:
+            mode = Qt.TransformationMode.SmoothTransformation
+        
         pixmap = QPixmap.fromImage(q_image)
         scaled_pixmap = pixmap.scaled(
-            self.video_label.size(),
+            self._label_size,
             Qt.AspectRatioMode.KeepAspectRatio,
-            Qt.TransformationMode.SmoothTransformation
+            mode
         )
         
         # 显示
@@ -276,13 +540,8 @@ class VideoPlayer(QWidget):
     
     def update_time_label(self):
         """更新时间显示"""
-        current_sec = self.current_frame / self.fps if self.fps > 0 else 0
-        total_sec = self.duration
-        
-        current_time = self.format_time(current_sec)
-        total_time = self.format_time(total_sec)
-        
-        self.time_label.setText(f"{current_time} / {total_time}")
+        current_sec = int(self.current_frame / self.fps) if self.fps > 0 else 0
+        self.time_label.setText(f"{_format_seconds(current_sec)} / {self._total_time_str}")
     
     def format_time(self, seconds: float) -> str:
         """
@@ -294,16 +553,27 @@ class VideoPlayer(QWidget):
         Returns:
             格式化的时间字符串 (MM:SS)
         """
-        minutes = int(seconds // 60)
-        secs = int(seconds % 60)
-        return f"{minutes:02d}:{secs:02d}"
+        return _format_seconds(int(seconds))
     
     def get_current_time(self) -> float:
         """获取当前播放时间（秒）"""
         return self.current_frame / self.fps if self.fps > 0 else 0
     
-    def closeEvent(self, event):
-        """关闭事件"""
+    def resizeEvent(self, event):
+        """尺寸改变事件：记录画面区域大小（布局已先调整好子控件）"""
+        super().resizeEvent(event)
+        self._label_size = self.video_label.size()
+    
+    def release(self):
+        """结束解码线程并释放视频"""
+        if self._decoder:
+            self._decoder.stop()
+            self._decoder = None
         if self.cap:
             self.cap.release()
+            self.cap = None
+    
+    def closeEvent(self, event):
+        """关闭事件"""
+        self.release()
         event.accept()
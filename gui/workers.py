@@ -0,0 +1,294 @@
+"""
+后台工作者
+在 QThread 中执行耗时的处理流程，通过信号回报进度与结果，避免阻塞界面
+"""
+
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from utils.logger import get_logger
+from utils.file_utils import write_json
+import config
+
+logger = get_logger(__name__)
+
+# 进度信号的最小发送间隔（秒，约一帧）
+PROGRESS_MIN_INTERVAL = 0.016
+
+# 结果文件写入线程（JSON 序列化与磁盘写入不占用处理流程）
+_io_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="json-writer")
+
+
+def create_scene_detector():
+    """创建镜头检测器"""
+    from core.scene_detector import SceneDetector
+    return SceneDetector()
+
+
+def create_keyframe_extractor():
+    """创建关键帧提取器"""
+    from core.keyframe_extractor import KeyframeExtractor
+    return KeyframeExtractor()
+
+
+def create_highlight_selector():
+    """创建精彩片段筛选器"""
+    from core.highlight_selector import HighlightSelector
+    return HighlightSelector()
+
+
+def create_subtitle_extractor():
+    """创建字幕提取器（加载 Whisper 模型）"""
+    from core.subtitle_extractor import SubtitleExtractor
+    return SubtitleExtractor(
+        model_size=config.WHISPER_MODEL_SIZE,
+        use_online=config.USE_ONLINE_WHISPER
+    )
+
+
+def create_script_analyzer():
+    """创建剧本分析器"""
+    from core.script_analyzer import ScriptAnalyzer
+    return ScriptAnalyzer()
+
+
+def create_script_generator():
+    """创建解说生成器"""
+    from core.script_generator import ScriptGenerator
+    return ScriptGenerator()
+
+
+def create_tts_engine():
+    """创建 TTS 引擎"""
+    from core.tts_engine import TTSEngine
+    return TTSEngine()
+
+
+def _throttle(callback: Callable, min_interval: float = PROGRESS_MIN_INTERVAL) -> Callable:
+    """
+    限制进度回调频率：间隔内的重复更新直接丢弃，完成（>=100）时总是回调
+    
+    Args:
+        callback: 原始进度回调
+        min_interval: 最小回调间隔（秒）
+    """
+    last = [0.0]
+    
+    def wrapped(p):
+        now = time.monotonic()
+        if p >= 100 or now - last[0] >= min_interval:
+            last[0] = now
+            callback(p)
+    
+    return wrapped
+
+
+def _resolve(future: Optional[Future], factory: Callable):
+    """取出预热好的实例，没有预热或预热失败时现场创建"""
+    if future is not None:
+        try:
+            return future.result()
+        except Exception as e:
+            logger.warning(f"预热实例不可用，重新创建: {str(e)}")
+    return factory()
+
+
+class PipelineWorker(QObject):
+    """后台工作者基类（子类必须实现 execute，返回处理结果）"""
+    
+    # 信号
+    progress = pyqtSignal(int)      # 进度（0-100）
+    message = pyqtSignal(str)       # 阶段提示
+    finished = pyqtSignal(object)   # 处理结果
+    failed = pyqtSignal(str)        # 错误信息
+    
+    def __init_subclass__(cls, **kwargs):
+        """定义子类时检查是否实现了 execute，避免到工作线程中才报错"""
+        super().__init_subclass__(**kwargs)
+        if not callable(getattr(cls, 'execute', None)):
+            raise TypeError(f"{cls.__name__} 必须实现 execute 方法")
+    
+    def run(self):
+        """执行任务（在工作线程中调用）"""
+        try:
+            result = self.execute()
+        except Exception as e:
+            logger.error(f"{self.__class__.__name__} 执行失败: {str(e)}", exc_info=True)
+            self.failed.emit(str(e))
+        else:
+            self.finished.emit(result)
+
+
+class AnalyzeWorker(PipelineWorker):
+    """分析视频：检测镜头 + 提取关键帧"""
+    
+    # 信号（逐个镜头回报结果，界面可以边分析边显示）
+    scene_ready = pyqtSignal(dict)            # 镜头
+    keyframes_ready = pyqtSignal(str, list)   # 镜头ID, 关键帧列表
+    
+    def __init__(self, video_path: str, keyframes_dir: str,
+                 detector: Optional[Future] = None, extractor: Optional[Future] = None):
+        super().__init__()
+        self.video_path = video_path
+        self.keyframes_dir = keyframes_dir
+        self.detector = detector
+        self.extractor = extractor
+    
+    def execute(self) -> Dict:
+        # 检测镜头
+        detector = _resolve(self.detector, create_scene_detector)
+        scenes = detector.detect(
+            self.video_path,
+            progress_callback=_throttle(lambda p: self.progress.emit(int(p * 0.5))),
+            scene_callback=self.scene_ready.emit
+        )
+        
+        # 提取关键帧
+        extractor = _resolve(self.extractor, create_keyframe_extractor)
+        keyframes = extractor.extract(
+            self.video_path,
+            scenes,
+            output_dir=self.keyframes_dir,
+            progress_callback=_throttle(lambda p: self.progress.emit(50 + int(p * 0.5))),
+            scene_callback=self.keyframes_ready.emit
+        )
+        
+        return {'scenes': scenes, 'keyframes': keyframes}
+
+
+class ScriptDataWorker(PipelineWorker):
+    """生成剧本：提取字幕 → 筛选精彩片段 → 提取关键帧 → 画面识别"""
+    
+    def __init__(self, video_path: str, scenes: List[Dict],
+                 selected_scenes_file: str, keyframes_dir: str, output_path: str,
+                 prewarmed: Optional[Dict[str, Future]] = None):
+        super().__init__()
+        self.prewarmed = prewarmed or {}
+        self.video_path = video_path
+        self.scenes = scenes
+        self.selected_scenes_file = selected_scenes_file
+        self.keyframes_dir = keyframes_dir
+        self.output_path = output_path
+    
+    def execute(self) -> Dict:
+        # ========== 步骤1：提取字幕 ==========
+        logger.info("步骤1: 提取字幕...")
+        self.message.emit("步骤1/4: 提取字幕...")
+        
+        subtitle_extractor = _resolve(
+            self.prewarmed.get('subtitle_extractor'), create_subtitle_extractor
+        )
+        
+        all_subtitles = subtitle_extractor.extract(
+            self.video_path,
+            progress_callback=_throttle(lambda p: self.progress.emit(int(p * 0.3)))
+        )
+        
+        logger.info(f"✅ 字幕提取完成: {len(all_subtitles)} 条")
+        
+        # ========== 步骤2：筛选精彩片段 ==========
+        logger.info("步骤2: 筛选精彩片段...")
+        self.message.emit("步骤2/4: 筛选精彩片段...")
+        self.progress.emit(30)
+        
+        selector = _resolve(self.prewarmed.get('highlight_selector'), create_highlight_selector)
+        target_duration = getattr(config, 'TARGET_DURATION', 600)
+        
+        selected_scenes = selector.select_highlights(
+            scenes=self.scenes,
+            subtitles=all_subtitles,
+            target_duration=target_duration
+        )
+        
+        total_duration = sum(s['duration'] for s in selected_scenes)
+        logger.info(
+            f"✅ 筛选完成: 从 {len(self.scenes)} 个场景中选出 {len(selected_scenes)} 个，"
+            f"总时长: {total_duration:.1f}秒"
+        )
+        
+        # 后台保存筛选结果（与后续步骤并行）
+        pending_writes = [
+            _io_pool.submit(selector.save_selected_scenes, selected_scenes, self.selected_scenes_file)
+        ]
+        
+        # ========== 步骤3：提取筛选后场景的关键帧 ==========
+        logger.info("步骤3: 提取筛选后场景的关键帧...")
+        self.message.emit("步骤3/4: 提取关键帧...")
+        self.progress.emit(40)
+        
+        extractor = _resolve(self.prewarmed.get('keyframe_extractor'), create_keyframe_extractor)
+        selected_keyframes = extractor.extract(
+            self.video_path,
+            selected_scenes,
+            output_dir=self.keyframes_dir,
+            prefix='selected_'
+        )
+        
+        logger.info(f"✅ 提取了 {len(selected_keyframes)} 个关键帧")
+        
+        # ========== 步骤4：画面识别和生成剧本 ==========
+        logger.info("步骤4: 画面识别和生成剧本...")
+        self.message.emit("步骤4/4: 画面识别...")
+        self.progress.emit(50)
+        
+        analyzer = _resolve(self.prewarmed.get('script_analyzer'), create_script_analyzer)
+        script_data = analyzer.analyze_scenes(
+            selected_scenes,
+            selected_keyframes,
+            self.video_path,
+            progress_callback=_throttle(lambda p: self.progress.emit(50 + int(p * 0.5)))
+        )
+        
+        # 后台保存剧本，等待所有写入完成（写入失败时抛出异常）
+        pending_writes.append(_io_pool.submit(write_json, self.output_path, script_data))
+        for future in pending_writes:
+            future.result()
+        
+        return {
+            'script_data': script_data,
+            'selected_scenes': selected_scenes,
+            'selected_keyframes': selected_keyframes,
+            'all_subtitles': all_subtitles,
+            'total_duration': total_duration,
+        }
+
+
+class CommentaryWorker(PipelineWorker):
+    """生成解说文案"""
+    
+    def __init__(self, script_data: List[Dict], generator: Optional[Future] = None):
+        super().__init__()
+        self.script_data = script_data
+        self.generator = generator
+    
+    def execute(self) -> List[Dict]:
+        generator = _resolve(self.generator, create_script_generator)
+        return generator.generate(
+            self.script_data,
+            style="drama",
+            length=500,
+            progress_callback=_throttle(lambda p: self.progress.emit(int(p)))
+        )
+
+
+class VoiceWorker(PipelineWorker):
+    """合成配音"""
+    
+    def __init__(self, scripts: List[Dict], output_dir: str, voice: str,
+                 tts: Optional[Future] = None):
+        super().__init__()
+        self.tts = tts
+        self.scripts = scripts
+        self.output_dir = output_dir
+        self.voice = voice
+    
+    def execute(self) -> List[Dict]:
+        tts = _resolve(self.tts, create_tts_engine)
+        return tts.batch_synthesize(
+            self.scripts,
+            output_dir=self.output_dir,
+            voice=self.voice,
+            progress_callback=_throttle(lambda p: self.progress.emit(int(p)))
+        )
@@ -5,12 +5,16 @@
 import sys
 from PyQt6.QtWidgets import QApplication
 from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QPixmapCache
 from gui.main_window import MainWindow
 from utils.logger import get_logger
 import config
 
 logger = get_logger(__name__)
 
+# 图片缓存上限（KB），镜头缩略图解码后缓存在这里
+PIXMAP_CACHE_LIMIT_KB = 64 * 1024
+
 
 def main():
     """主函数"""
@@ -32,6 +36,9 @@ def main():
     # 设置应用样式
     app.setStyle("Fusion")
     
+    # 缩略图缓存
+    QPixmapCache.setCacheLimit(PIXMAP_CACHE_LIMIT_KB)
+    
     # 创建主窗口
     window = MainWindow()
     window.show()
@@ -2,12 +2,12 @@
 音频模型
 """
 
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from typing import Dict, Optional
 from datetime import datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class Audio:
     """音频数据模型"""
     
@@ -20,32 +20,21 @@ class Audio:
     project_id: Optional[str] = None
     
     # 时间戳
-    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    created_at: Optional[str] = None
     
     # 元数据
     metadata: Dict = field(default_factory=dict)
     
+    def __post_init__(self):
+        """初始化后处理（未给出时间戳时取当前时间）"""
+        if self.created_at is None:
+            self.created_at = datetime.now().isoformat()
+    
     def to_dict(self) -> Dict:
         """转换为字典"""
-        return {
-            'scene_id': self.scene_id,
-            'audio_path': self.audio_path,
-            'duration': self.duration,
-            'voice': self.voice,
-            'project_id': self.project_id,
-            'created_at': self.created_at,
-            'metadata': self.metadata,
-        }
+        return asdict(self)
     
     @classmethod
     def from_dict(cls, data: Dict) -> 'Audio':
-        """从字典创建"""
-        return cls(
-            scene_id=data['scene_id'],
-            audio_path=data['audio_path'],
-            duration=data.get('duration', 0.0),
-            voice=data.get('voice', ''),
-            project_id=data.get('project_id'),
-            created_at=data.get('created_at', datetime.now().isoformat()),
-            metadata=data.get('metadata', {}),
-        )
+        """从字典创建（缺少的字段使用默认值，多余的键忽略）"""
+        return cls(**{k: v for k, v in data.items() if k in cls.__dataclass_fields__})
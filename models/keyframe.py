@@ -2,11 +2,11 @@
 关键帧模型
 """
 
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from typing import Dict, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Keyframe:
     """关键帧数据模型"""
     
@@ -27,31 +27,9 @@ class Keyframe:
     
     def to_dict(self) -> Dict:
         """转换为字典"""
-        return {
-            'scene_id': self.scene_id,
-            'keyframe_index': self.keyframe_index,
-            'time': self.time,
-            'frame_number': self.frame_number,
-            'image_path': self.image_path,
-            'image_hash': self.image_hash,
-            'quality_score': self.quality_score,
-            'project_id': self.project_id,
-            'scene_index': self.scene_index,
-            'metadata': self.metadata,
-        }
+        return asdict(self)
     
     @classmethod
     def from_dict(cls, data: Dict) -> 'Keyframe':
-        """从字典创建"""
-        return cls(
-            scene_id=data['scene_id'],
-            keyframe_index=data['keyframe_index'],
-            time=data['time'],
-            frame_number=data['frame_number'],
-            image_path=data.get('image_path'),
-            image_hash=data.get('image_hash'),
-            quality_score=data.get('quality_score', 0.0),
-            project_id=data.get('project_id'),
-            scene_index=data.get('scene_index'),
-            metadata=data.get('metadata', {}),
-        )
+        """从字典创建（缺少的字段使用默认值，多余的键忽略）"""
+        return cls(**{k: v for k, v in data.items() if k in cls.__dataclass_fields__})
@@ -2,12 +2,25 @@
 项目模型
 """
 
-from dataclasses import dataclass, field
-from typing import List, Optional, Dict
+from dataclasses import dataclass, field, fields
+from typing import List, Optional, Dict, Tuple
 from datetime import datetime
 
+import numpy as np
 
-@dataclass
+# 关联数据字段（单独存储，不参与项目本身的序列化）
+RELATION_FIELDS = frozenset({'scenes', 'keyframes', 'scripts', 'audios'})
+
+# 派生缓存字段（由关联数据重建，不参与序列化）
+_CACHE_FIELDS = frozenset({'_kf_index', '_scene_index'})
+
+# 时间索引的精度（微秒）
+US_PER_SECOND = 1_000_000
+
+_SKIP_FIELDS = RELATION_FIELDS | _CACHE_FIELDS
+
+
+@dataclass(slots=True)
 class Project:
     """项目数据模型"""
     
@@ -15,8 +28,8 @@ class Project:
     name: str
     description: str = ""
     video_path: str = ""
-    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
-    updated_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    created_at: Optional[str] = None
+    updated_at: Optional[str] = None
     version: int = 1
     status: str = "created"
     
@@ -29,36 +42,129 @@ class Project:
     # 元数据
     metadata: Dict = field(default_factory=dict)
     
+    # 关键帧列索引：(缓存键, 时间数组, 帧号数组, 质量评分数组)
+    _kf_index: Optional[Tuple] = field(default=None, init=False, repr=False, compare=False)
+    
+    # 镜头时间索引：(缓存键, 按开始时间排序的下标, 开始时间数组, 结束时间数组)，时间为整数微秒
+    _scene_index: Optional[Tuple] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        """初始化后处理（未给出时间戳时取当前时间）"""
+        if self.created_at is None or self.updated_at is None:
+            now = datetime.now().isoformat()
+            self.created_at = self.created_at or now
+            self.updated_at = self.updated_at or now
+    
     def to_dict(self) -> Dict:
-        """转换为字典"""
-        return {
-            'id': self.id,
-            'name': self.name,
-            'description': self.description,
-            'video_path': self.video_path,
-            'created_at': self.created_at,
-            'updated_at': self.updated_at,
-            'version': self.version,
-            'status': self.status,
-            'metadata': self.metadata,
-        }
+        """转换为字典（不含关联数据）"""
+        return {f.name: getattr(self, f.name) for f in fields(self) if f.name not in _SKIP_FIELDS}
     
     @classmethod
     def from_dict(cls, data: Dict) -> 'Project':
-        """从字典创建"""
-        return cls(
-            id=data['id'],
-            name=data['name'],
-            description=data.get('description', ''),
-            video_path=data.get('video_path', ''),
-            created_at=data.get('created_at', datetime.now().isoformat()),
-            updated_at=data.get('updated_at', datetime.now().isoformat()),
-            version=data.get('version', 1),
-            status=data.get('status', 'created'),
-            metadata=data.get('metadata', {}),
-        )
+        """从字典创建（缺少的字段使用默认值，关联数据与多余的键忽略）"""
+        return cls(**{
+            k: v for k, v in data.items()
+            if k in cls.__dataclass_fields__ and k not in _SKIP_FIELDS
+        })
     
     def update_timestamp(self):
         """更新时间戳"""
         self.updated_at = datetime.now().isoformat()
         self.version += 1
+    
+    def _keyframe_columns(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        获取关键帧的列数组（keyframes 列表仍是数据来源，项目更新或数量变化时重建）
+        
+        Returns:
+            (时间数组, 帧号数组, 质量评分数组)
+        """
+        key = (self.updated_at, len(self.keyframes))
+        if self._kf_index is None or self._kf_index[0] != key:
+            keyframes = self.keyframes
+            n = len(keyframes)
+            self._kf_index = (
+                key,
+                np.fromiter((kf.time for kf in keyframes), dtype=np.float64, count=n),
+                np.fromiter((kf.frame_number for kf in keyframes), dtype=np.int64, count=n),
+                np.fromiter((kf.quality_score for kf in keyframes), dtype=np.float64, count=n),
+            )
+        return self._kf_index[1:]
+    
+    def invalidate_keyframe_index(self):
+        """关键帧被原地修改后调用，下次查询时重建列数组"""
+        self._kf_index = None
+    
+    def keyframes_in_range(self, t_start: float, t_end: float) -> List['Keyframe']:
+        """
+        获取时间范围内的关键帧
+        
+        Args:
+            t_start: 开始时间（秒，包含）
+            t_end: 结束时间（秒，不包含）
+            
+        Returns:
+            关键帧列表
+        """
+        times, _, _ = self._keyframe_columns()
+        idx = np.nonzero((times >= t_start) & (times < t_end))[0]
+        return [self.keyframes[i] for i in idx]
+    
+    def keyframes_above_quality(self, min_score: float) -> List['Keyframe']:
+        """
+        获取质量评分高于阈值的关键帧
+        
+        Args:
+            min_score: 质量评分阈值
+            
+        Returns:
+            关键帧列表
+        """
+        _, _, quality = self._keyframe_columns()
+        idx = np.nonzero(quality > min_score)[0]
+        return [self.keyframes[i] for i in idx]
+    
+    def _scene_columns(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        获取镜头时间索引（按开始时间排序，项目更新或数量变化时重建）
+        
+        Returns:
+            (排序下标, 开始时间数组, 结束时间数组)，时间为 int64 微秒
+        """
+        key = (self.updated_at, len(self.scenes))
+        if self._scene_index is None or self._scene_index[0] != key:
+            scenes = self.scenes
+            n = len(scenes)
+            starts = np.fromiter((s.start_time for s in scenes), dtype=np.float64, count=n)
+            ends = np.fromiter((s.end_time for s in scenes), dtype=np.float64, count=n)
+            order = np.argsort(starts, kind='stable')
+            self._scene_index = (
+                key,
+                order,
+                np.round(starts[order] * US_PER_SECOND).astype(np.int64),
+                np.round(ends[order] * US_PER_SECOND).astype(np.int64),
+            )
+        return self._scene_index[1:]
+    
+    def invalidate_scene_index(self):
+        """镜头被原地修改后调用，下次查询时重建时间索引"""
+        self._scene_index = None
+    
+    def scene_at(self, t_sec: float) -> Optional['Scene']:
+        """
+        获取包含指定时间的镜头
+        
+        Args:
+            t_sec: 时间（秒）
+            
+        Returns:
+            镜头，不在任何镜头内时返回None
+        """
+        order, starts, ends = self._scene_columns()
+        t_us = round(t_sec * US_PER_SECOND)
+        
+        # 最后一个开始时间不晚于 t 的镜头
+        i = int(np.searchsorted(starts, t_us, side='right')) - 1
+        if i < 0 or t_us >= ends[i]:
+            return None
+        return self.scenes[order[i]]
@@ -2,11 +2,11 @@
 镜头模型
 """
 
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from typing import Dict, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Scene:
     """镜头数据模型"""
     
@@ -26,29 +26,9 @@ class Scene:
     
     def to_dict(self) -> Dict:
         """转换为字典"""
-        return {
-            'id': self.id,
-            'index': self.index,
-            'start_time': self.start_time,
-            'end_time': self.end_time,
-            'duration': self.duration,
-            'start_frame': self.start_frame,
-            'end_frame': self.end_frame,
-            'project_id': self.project_id,
-            'metadata': self.metadata,
-        }
+        return asdict(self)
     
     @classmethod
     def from_dict(cls, data: Dict) -> 'Scene':
-        """从字典创建"""
-        return cls(
-            id=data['id'],
-            index=data['index'],
-            start_time=data['start_time'],
-            end_time=data['end_time'],
-            duration=data['duration'],
-            start_frame=data['start_frame'],
-            end_frame=data['end_frame'],
-            project_id=data.get('project_id'),
-            metadata=data.get('metadata', {}),
-        )
+        """从字典创建（缺少的字段使用默认值，多余的键忽略）"""
+        return cls(**{k: v for k, v in data.items() if k in cls.__dataclass_fields__})
@@ -2,12 +2,12 @@
 文案模型
 """
 
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from typing import Dict, Optional
 from datetime import datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class Script:
     """文案数据模型"""
     
@@ -19,41 +19,31 @@ class Script:
     project_id: Optional[str] = None
     
     # 时间戳
-    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
-    updated_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    created_at: Optional[str] = None
+    updated_at: Optional[str] = None
     
     # 元数据
     metadata: Dict = field(default_factory=dict)
     
     def __post_init__(self):
-        """初始化后处理"""
-        if self.word_count == 0:
+        """初始化后处理（未给出时间戳时取当前时间）"""
+        if self.created_at is None or self.updated_at is None:
+            now = datetime.now().isoformat()
+            self.created_at = self.created_at or now
+            self.updated_at = self.updated_at or now
+        
+        # 缺失（0 或 None）时按文案长度补齐
+        if not self.word_count:
             self.word_count = len(self.script)
     
     def to_dict(self) -> Dict:
         """转换为字典"""
-        return {
-            'scene_id': self.scene_id,
-            'script': self.script,
-            'word_count': self.word_count,
-            'project_id': self.project_id,
-            'created_at': self.created_at,
-            'updated_at': self.updated_at,
-            'metadata': self.metadata,
-        }
+        return asdict(self)
     
     @classmethod
     def from_dict(cls, data: Dict) -> 'Script':
-        """从字典创建"""
-        return cls(
-            scene_id=data['scene_id'],
-            script=data['script'],
-            word_count=data.get('word_count', len(data['script'])),
-            project_id=data.get('project_id'),
-            created_at=data.get('created_at', datetime.now().isoformat()),
-            updated_at=data.get('updated_at', datetime.now().isoformat()),
-            metadata=data.get('metadata', {}),
-        )
+        """从字典创建（缺少的字段使用默认值，多余的键忽略）"""
+        return cls(**{k: v for k, v in data.items() if k in cls.__dataclass_fields__})
     
     def update(self, new_script: str):
         """更新文案"""
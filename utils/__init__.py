@@ -5,15 +5,16 @@
 from .logger import get_logger, setup_logger
 from .file_utils import (
     ensure_dir, get_file_size, get_file_hash,
-    copy_file, move_file, delete_file
+    copy_file, move_file, delete_file, write_json
 )
 from .format_utils import (
-    format_time, format_size, format_number
+    format_time, format_size, format_number, parse_frame_rate
 )
 from .device_utils import (
     get_cpu_info, get_gpu_info, get_memory_info,
-    check_cuda_available
+    check_cuda_available, is_module_available
 )
+from .device_monitor import BackgroundRecorder
 
 __all__ = [
     'get_logger',
@@ -24,11 +25,15 @@ __all__ = [
     'copy_file',
     'move_file',
     'delete_file',
+    'write_json',
     'format_time',
     'format_size',
     'format_number',
+    'parse_frame_rate',
     'get_cpu_info',
     'get_gpu_info',
     'get_memory_info',
     'check_cuda_available',
+    'is_module_available',
+    'BackgroundRecorder',
 ]
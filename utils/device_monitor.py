@@ -0,0 +1,107 @@
+"""
+设备监控
+后台线程按固定间隔采样CPU/内存/GPU信息，调用方直接读取最近一次快照
+"""
+
+import time
+import threading
+from collections import deque
+from typing import Dict, List, Optional
+from utils.logger import get_logger
+from .device_utils import get_cpu_info, get_memory_info, get_gpu_info
+
+logger = get_logger(__name__)
+
+# 默认采样间隔（秒）
+DEFAULT_SAMPLE_INTERVAL = 1.0
+
+# 默认保留的历史快照数量
+DEFAULT_HISTORY_SIZE = 60
+
+
+class BackgroundRecorder(threading.Thread):
+    """
+    后台采样设备信息，保留最近的快照
+    
+    用法：
+        with BackgroundRecorder(interval=1.0) as recorder:
+            ...
+            snapshot = recorder.latest()
+    """
+    
+    def __init__(self, interval: float = DEFAULT_SAMPLE_INTERVAL,
+                 history_size: int = DEFAULT_HISTORY_SIZE,
+                 include_gpu: bool = False):
+        """
+        初始化采样线程
+        
+        Args:
+            interval: 采样间隔（秒）
+            history_size: 保留的历史快照数量
+            include_gpu: 是否采样GPU信息（需要 PyTorch）
+        """
+        super().__init__(daemon=True, name="device-monitor")
+        self.interval = interval
+        self.include_gpu = include_gpu
+        self._history = deque(maxlen=history_size)
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._latest: Optional[Dict] = None
+    
+    def run(self):
+        """采样循环（启动时立即采样一次）"""
+        self._sample()
+        while not self._stop_event.wait(self.interval):
+            self._sample()
+    
+    def stop(self):
+        """停止采样并等待线程退出"""
+        self._stop_event.set()
+        if self.is_alive():
+            self.join()
+    
+    def latest(self) -> Optional[Dict]:
+        """
+        获取最近一次快照
+        
+        Returns:
+            快照字典（cpu/memory/gpu/timestamp），尚未采样时返回None
+        """
+        # 快照整体替换，不需要加锁
+        return self._latest
+    
+    def history(self) -> List[Dict]:
+        """
+        获取历史快照
+        
+        Returns:
+            按时间从旧到新排列的快照列表
+        """
+        with self._lock:
+            return list(self._history)
+    
+    def _sample(self):
+        """采样一次"""
+        try:
+            snapshot = {
+                'timestamp': time.time(),
+                'cpu': get_cpu_info(),
+                'memory': get_memory_info(),
+                'gpu': get_gpu_info() if self.include_gpu else None,
+            }
+        except Exception as e:
+            logger.warning(f"设备信息采样失败: {str(e)}")
+            return
+        
+        with self._lock:
+            self._history.append(snapshot)
+        self._latest = snapshot
+    
+    def __enter__(self):
+        """进入时开始采样"""
+        self.start()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        """退出时停止采样"""
+        self.stop()
@@ -2,29 +2,197 @@
 设备工具
 """
 
+import os
+import sys
+import time
 import platform
+import ctypes.util
+import threading
+import importlib.util
+from functools import lru_cache
 import psutil
-from typing import Dict, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# 非阻塞 CPU 占用率采样的最小间隔（秒），间隔内的重复调用直接返回上次结果
+CPU_SAMPLE_MIN_INTERVAL = 0.1
 
-def get_cpu_info() -> Dict:
+# 当前 CPU 频率的缓存时长（秒，与调频策略的更新频率相当）
+CPU_FREQ_TTL = 1.0
+
+# 当前进程（cpu_percent 以同一对象上次调用为基准计算增量）
+_current_process = psutil.Process()
+
+# 上次的 CPU 占用率采样：名称 -> (采样时间, 占用率)
+_cpu_samples: Dict[str, Tuple[float, float]] = {}
+_cpu_sample_lock = threading.Lock()
+
+# 上次读取的当前 CPU 频率：(读取时间, 频率MHz)
+_cpu_freq_sample: Optional[Tuple[float, float]] = None
+
+# NVML 设备列表：[(句柄, 设备名)]，首次查询GPU时初始化；初始化失败后不再重试
+_nvml_devices: Optional[List[Tuple[Any, str]]] = None
+_nvml_failed = False
+_nvml_lock = threading.Lock()
+
+# 以 interval=None 预先调用一次，之后的非阻塞调用才有可比较的基准
+psutil.cpu_percent(interval=None)
+_current_process.cpu_percent(interval=None)
+
+
+def is_module_available(name: str) -> bool:
     """
-    获取CPU信息
+    检查模块是否已安装（只查找模块，不执行导入）
     
+    Args:
+        name: 模块名，可以是 a.b.c 形式
+        
     Returns:
-        CPU信息字典
+        是否可以导入
     """
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        # 父包不存在时 find_spec 会抛出 ModuleNotFoundError
+        return False
+
+
+def _sample_cpu_percent(name: str, measure: Callable[[Optional[float]], float],
+                        interval: Optional[float]) -> float:
+    """
+    采样 CPU 占用率
+    
+    Args:
+        name: 采样名称（区分系统与进程）
+        measure: 接受 interval 参数的 cpu_percent 函数
+        interval: 阻塞测量的时长（秒），None 表示返回自上次采样以来的非阻塞结果
+        
+    Returns:
+        CPU 占用率（百分比）
+    """
+    if interval:
+        return measure(interval)
+    
+    now = time.monotonic()
+    with _cpu_sample_lock:
+        last = _cpu_samples.get(name)
+        if last is not None and now - last[0] < CPU_SAMPLE_MIN_INTERVAL:
+            return last[1]
+        
+        value = measure(None)
+        _cpu_samples[name] = (now, value)
+        return value
+
+
+@lru_cache(maxsize=1)
+def _static_cpu_info() -> Dict:
+    """获取运行期间不变的CPU信息（只查询一次）"""
+    freq = psutil.cpu_freq(percpu=False)
     return {
         'processor': platform.processor(),
         'architecture': platform.machine(),
         'cores_physical': psutil.cpu_count(logical=False),
         'cores_logical': psutil.cpu_count(logical=True),
-        'frequency_current': psutil.cpu_freq().current if psutil.cpu_freq() else 0,
-        'frequency_max': psutil.cpu_freq().max if psutil.cpu_freq() else 0,
-        'usage_percent': psutil.cpu_percent(interval=1),
+        'frequency_max': freq.max if freq else 0,
+    }
+
+
+def _current_cpu_freq() -> float:
+    """获取当前 CPU 频率（MHz），缓存 CPU_FREQ_TTL 秒，避免每次读取各核心的 sysfs 文件"""
+    global _cpu_freq_sample
+    now = time.monotonic()
+    sample = _cpu_freq_sample
+    if sample is not None and now - sample[0] < CPU_FREQ_TTL:
+        return sample[1]
+    
+    freq = psutil.cpu_freq(percpu=False)
+    value = freq.current if freq else 0
+    _cpu_freq_sample = (now, value)
+    return value
+
+
+def get_cpu_info(interval: Optional[float] = None) -> Dict:
+    """
+    获取CPU信息
+    
+    Args:
+        interval: 占用率阻塞测量的时长（秒），默认不阻塞
+        
+    Returns:
+        CPU信息字典
+    """
+    return {
+        **_static_cpu_info(),
+        'frequency_current': _current_cpu_freq(),
+        'usage_percent': _sample_cpu_percent('system', psutil.cpu_percent, interval),
+    }
+
+
+def _get_nvml_devices() -> Optional[List[Tuple[Any, str]]]:
+    """
+    初始化 NVML 并缓存各设备句柄与设备名
+    
+    Returns:
+        [(句柄, 设备名)] 列表，NVML 不可用时返回None
+    """
+    global _nvml_devices, _nvml_failed
+    with _nvml_lock:
+        if _nvml_devices is None and not _nvml_failed:
+            try:
+                import pynvml
+                pynvml.nvmlInit()
+                devices = []
+                for i in range(pynvml.nvmlDeviceGetCount()):
+                    handle = pynvml.nvmlDeviceGetHandleByIndex(i)
+                    name = pynvml.nvmlDeviceGetName(handle)
+                    if isinstance(name, bytes):
+                        name = name.decode()
+                    devices.append((handle, name))
+                _nvml_devices = devices
+            except Exception as e:
+                logger.warning(f"NVML 初始化失败: {str(e)}")
+                _nvml_failed = True
+        
+        return _nvml_devices
+
+
+def _get_gpu_info_nvml(devices: List[Tuple[Any, str]]) -> Optional[Dict]:
+    """通过 NVML 获取GPU信息（每个设备一次显存查询）"""
+    import pynvml
+    
+    if not devices:
+        return None
+    
+    gpus = []
+    for i, (handle, name) in enumerate(devices):
+        mem = pynvml.nvmlDeviceGetMemoryInfo(handle)
+        gpus.append({
+            'index': i,
+            'name': name,
+            'memory_total': mem.total,
+            'memory_used': mem.used,
+            'memory_free': mem.free,
+        })
+    
+    cuda_version = pynvml.nvmlSystemGetCudaDriverVersion()
+    return {
+        'available': True,
+        'count': len(gpus),
+        'devices': gpus,
+        'cuda_version': f"{cuda_version // 1000}.{cuda_version % 1000 // 10}",
+    }
+
+
+@lru_cache(maxsize=None)
+def _torch_device_static_info(index: int) -> Dict:
+    """获取 PyTorch 设备不变的信息（设备名、总显存），每个设备只查询一次"""
+    import torch
+    props = torch.cuda.get_device_properties(index)
+    return {
+        'name': props.name,
+        'memory_total': props.total_memory,
     }
 
 
@@ -32,9 +200,28 @@ def get_gpu_info() -> Optional[Dict]:
     """
     获取GPU信息
     
+    安装了 pynvml 时通过 NVML 查询（显存为整张卡的使用量），否则回退到 PyTorch
+    （显存为本进程的分配量）
+    
     Returns:
         GPU信息字典，如果没有GPU则返回None
     """
+    if is_module_available('pynvml'):
+        devices = _get_nvml_devices()
+        if devices is not None:
+            try:
+                return _get_gpu_info_nvml(devices)
+            except Exception as e:
+                logger.warning(f"NVML 查询失败，改用 PyTorch: {str(e)}")
+    
+    if not is_module_available('torch'):
+        logger.warning("PyTorch未安装，无法获取GPU信息")
+        return None
+    
+    # 没有 NVIDIA 驱动时不必导入 PyTorch（首次导入需要加载 CUDA 库，耗时数秒）
+    if not has_nvidia_driver():
+        return None
+    
     try:
         import torch
         
@@ -47,8 +234,7 @@ def get_gpu_info() -> Optional[Dict]:
         for i in range(gpu_count):
             gpu = {
                 'index': i,
-                'name': torch.cuda.get_device_name(i),
-                'memory_total': torch.cuda.get_device_properties(i).total_memory,
+                **_torch_device_static_info(i),
                 'memory_allocated': torch.cuda.memory_allocated(i),
                 'memory_cached': torch.cuda.memory_reserved(i),
             }
@@ -110,13 +296,9 @@ def get_disk_info(path: str = "/") -> Dict:
     }
 
 
-def get_system_info() -> Dict:
-    """
-    获取系统信息
-    
-    Returns:
-        系统信息字典
-    """
+@lru_cache(maxsize=1)
+def _static_system_info() -> Dict:
+    """获取系统信息（运行期间不变，只查询一次）"""
     return {
         'system': platform.system(),
         'release': platform.release(),
@@ -127,13 +309,45 @@ def get_system_info() -> Dict:
     }
 
 
+def get_system_info() -> Dict:
+    """
+    获取系统信息
+    
+    Returns:
+        系统信息字典
+    """
+    return dict(_static_system_info())
+
+
+@lru_cache(maxsize=1)
+def has_nvidia_driver() -> bool:
+    """
+    不导入 PyTorch，快速检查是否安装了 NVIDIA 驱动
+    
+    Returns:
+        是否找到驱动
+    """
+    if sys.platform.startswith('linux'):
+        # WSL2 下没有 /proc/driver/nvidia，驱动库由 ldconfig 提供
+        return os.path.exists('/proc/driver/nvidia/version') or ctypes.util.find_library('cuda') is not None
+    if sys.platform == 'win32':
+        return ctypes.util.find_library('nvcuda') is not None
+    
+    # macOS 不支持 CUDA
+    return False
+
+
+@lru_cache(maxsize=1)
 def check_cuda_available() -> bool:
     """
-    检查CUDA是否可用
+    检查CUDA是否可用（结果在进程内缓存）
     
     Returns:
         是否可用
     """
+    if not is_module_available('torch') or not has_nvidia_driver():
+        return False
+    
     try:
         import torch
         return torch.cuda.is_available()
@@ -148,7 +362,7 @@ def get_optimal_thread_count() -> int:
     Returns:
         线程数
     """
-    cpu_count = psutil.cpu_count(logical=True)
+    cpu_count = _static_cpu_info()['cores_logical']
     
     # 保留一些CPU给系统
     optimal = max(1, cpu_count - 2)
@@ -172,21 +386,90 @@ def check_memory_available(required_mb: int) -> bool:
     return available_mb >= required_mb
 
 
-def get_process_info() -> Dict:
+@lru_cache(maxsize=1)
+def _static_process_info() -> Dict:
+    """获取当前进程不变的信息（只查询一次）"""
+    return {
+        'pid': _current_process.pid,
+        'name': _current_process.name(),
+        'create_time': _current_process.create_time(),
+    }
+
+
+def get_process_info(interval: Optional[float] = None) -> Dict:
     """
     获取当前进程信息
     
+    Args:
+        interval: 占用率阻塞测量的时长（秒），默认不阻塞
+        
     Returns:
         进程信息字典
     """
-    process = psutil.Process()
+    process = _current_process
     
-    return {
-        'pid': process.pid,
-        'name': process.name(),
-        'cpu_percent': process.cpu_percent(interval=1),
-        'memory_info': process.memory_info()._asdict(),
-        'memory_percent': process.memory_percent(),
-        'num_threads': process.num_threads(),
-        'create_time': process.create_time(),
-    }
+    # oneshot 内的多个查询共用一次 /proc 读取
+    with process.oneshot():
+        return {
+            **_static_process_info(),
+            'cpu_percent': _sample_cpu_percent('process', process.cpu_percent, interval),
+            'memory_info': process.memory_info()._asdict(),
+            'memory_percent': process.memory_percent(),
+            'num_threads': process.num_threads(),
+        }
+
+
+class PeakMemorySampler(threading.Thread):
+    """
+    后台采样当前进程的常驻内存（RSS），记录峰值
+    
+    用法：
+        with PeakMemorySampler() as sampler:
+            ...  # 被测代码
+        peak_mb = sampler.peak_delta / (1024 * 1024)
+    """
+    
+    def __init__(self, interval: float = 0.01):
+        """
+        初始化采样线程
+        
+        Args:
+            interval: 采样间隔（秒）
+        """
+        super().__init__(daemon=True)
+        self.interval = interval
+        self._process = _current_process
+        self._stop_event = threading.Event()
+        self.start_rss = self._process.memory_info().rss
+        self.peak_rss = self.start_rss
+    
+    @property
+    def peak_delta(self) -> int:
+        """采样期间相对开始时的内存峰值增量（字节）"""
+        return self.peak_rss - self.start_rss
+    
+    def run(self):
+        """采样循环"""
+        while not self._stop_event.wait(self.interval):
+            self._sample()
+    
+    def stop(self):
+        """停止采样并等待线程退出（退出前再采样一次）"""
+        self._stop_event.set()
+        self.join()
+        self._sample()
+    
+    def _sample(self):
+        """采样一次，更新峰值"""
+        rss = self._process.memory_info().rss
+        if rss > self.peak_rss:
+            self.peak_rss = rss
+    
+    def __enter__(self):
+        """进入时开始采样"""
+        self.start()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        """退出时停止采样"""
+        self.stop()
@@ -3,14 +3,32 @@
 """
 
 import os
+import re
+import sys
+import json
+import stat
 import shutil
 import hashlib
+import fnmatch
+from dataclasses import asdict, is_dataclass
 from pathlib import Path
 from typing import Optional
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# 计算文件哈希时每次读取的块大小（字节）
+HASH_CHUNK_SIZE = 1 << 20
+
+# 不超过该大小（字节）的文件计算哈希时一次读入
+HASH_SMALL_FILE_SIZE = 64 * 1024
+
+# Linux 下的 FICLONE ioctl（btrfs/XFS 等支持写时复制的文件系统可以秒级"复制"大文件）
+_FICLONE = 0x40049409
+
+# copy_file_range 每次调用复制的最大字节数
+COPY_RANGE_CHUNK_SIZE = 1 << 30
+
 
 def ensure_dir(path: str) -> Path:
     """
@@ -44,9 +62,15 @@ def get_file_hash(file_path: str, algorithm: str = 'md5') -> str:
     """
     计算文件哈希值
     
+    sha256 由 OpenSSL 计算，支持的 CPU 上会使用 SHA 指令；blake2b 在没有
+    SHA 指令的 CPU 上更快；blake3 需要安装 blake3 包
+    
+    xxh3（需要 xxhash 包）与 crc32c（需要 crc32c 包）速度快得多，但不具备抗碰撞
+    能力，只能用于去重与变更检测，不能用于安全校验
+    
     Args:
         file_path: 文件路径
-        algorithm: 哈希算法 (md5, sha1, sha256)
+        algorithm: 哈希算法 (md5, sha1, sha256, blake2b, blake3, xxh3, crc32c)
         
     Returns:
         哈希值
@@ -57,17 +81,134 @@ def get_file_hash(file_path: str, algorithm: str = 'md5') -> str:
         hasher = hashlib.sha1()
     elif algorithm == 'sha256':
         hasher = hashlib.sha256()
+    elif algorithm == 'blake2b':
+        hasher = hashlib.blake2b(digest_size=32)
+    elif algorithm == 'blake3':
+        try:
+            from blake3 import blake3
+        except ImportError:
+            raise ValueError("blake3 未安装，无法使用 blake3 算法")
+        # blake3 自带多线程的内存映射读取
+        return blake3(max_threads=blake3.AUTO).update_mmap(file_path).hexdigest()
+    elif algorithm == 'xxh3':
+        try:
+            import xxhash
+        except ImportError:
+            raise ValueError("xxhash 未安装，无法使用 xxh3 算法")
+        hasher = xxhash.xxh3_64()
+    elif algorithm == 'crc32c':
+        try:
+            from crc32c import CRC32CHash
+        except ImportError:
+            raise ValueError("crc32c 未安装，无法使用 crc32c 算法")
+        hasher = CRC32CHash()
     else:
         raise ValueError(f"不支持的哈希算法: {algorithm}")
     
-    with open(file_path, 'rb') as f:
-        while chunk := f.read(8192):
-            hasher.update(chunk)
+    with open(file_path, 'rb', buffering=0) as f:
+        # 小文件一次读完
+        if os.fstat(f.fileno()).st_size <= HASH_SMALL_FILE_SIZE:
+            hasher.update(f.read())
+            return hasher.hexdigest()
+        
+        # Python 3.11+ 由标准库完成读取与更新循环
+        if hasattr(hashlib, 'file_digest'):
+            return hashlib.file_digest(f, lambda: hasher).hexdigest()
+        
+        # 复用同一块缓冲区读取，不为每个块分配新的 bytes
+        buffer = bytearray(HASH_CHUNK_SIZE)
+        view = memoryview(buffer)
+        while n := f.readinto(buffer):
+            hasher.update(view[:n])
     
     return hasher.hexdigest()
 
 
-def copy_file(src: str, dst: str, overwrite: bool = False) -> bool:
+def _clone_file_linux(src: str, dst: str, preserve_meta: bool) -> bool:
+    """
+    在 Linux 上通过同一对文件描述符完成复制：先尝试写时复制（FICLONE），
+    再尝试 copy_file_range 内核复制，元数据直接用源文件的 fstat 结果写到目标描述符上
+    
+    Returns:
+        是否复制成功（失败时由调用方回退到 shutil）
+    """
+    import fcntl
+    try:
+        fsrc = open(src, 'rb')
+    except OSError:
+        return False
+    
+    with fsrc:
+        in_fd = fsrc.fileno()
+        src_stat = os.fstat(in_fd)
+        if not stat.S_ISREG(src_stat.st_mode):
+            return False
+        
+        try:
+            fdst = open(dst, 'wb')
+        except OSError:
+            return False
+        
+        with fdst:
+            out_fd = fdst.fileno()
+            try:
+                fcntl.ioctl(out_fd, _FICLONE, in_fd)
+            except OSError:
+                if not hasattr(os, 'copy_file_range'):
+                    return False
+                try:
+                    remaining = src_stat.st_size
+                    while remaining > 0:
+                        copied = os.copy_file_range(in_fd, out_fd, min(remaining, COPY_RANGE_CHUNK_SIZE))
+                        if copied == 0:
+                            break
+                        remaining -= copied
+                except OSError:
+                    return False
+            
+            if preserve_meta:
+                os.fchmod(out_fd, stat.S_IMODE(src_stat.st_mode))
+                os.utime(out_fd, ns=(src_stat.st_atime_ns, src_stat.st_mtime_ns))
+    
+    return True
+
+
+def clone_file(src: str, dst: str, preserve_meta: bool = True) -> None:
+    """
+    复制文件，文件系统支持时使用写时复制（reflink），否则走内核零拷贝路径
+    
+    Args:
+        src: 源文件路径
+        dst: 目标文件路径
+        preserve_meta: 是否同时复制权限与时间戳等元数据
+        
+    Raises:
+        shutil.SameFileError: 源文件与目标文件是同一个文件
+    """
+    # 与 shutil.copy2 一致：目标是目录时复制到目录下的同名文件
+    if os.path.isdir(dst):
+        dst = os.path.join(dst, os.path.basename(src))
+    
+    # 以 'wb' 打开目标会截断文件，必须先排除源与目标相同的情况
+    try:
+        same_file = os.path.samefile(src, dst)
+    except OSError:
+        # 目标不存在（或源不存在，交给后续复制报错）
+        same_file = False
+    if same_file:
+        raise shutil.SameFileError(f"{src!r} 和 {dst!r} 是同一个文件")
+    
+    if sys.platform.startswith('linux') and _clone_file_linux(src, dst, preserve_meta):
+        return
+    
+    # copyfile 在 Linux 上使用 sendfile，在 Windows 上使用 CopyFile2
+    shutil.copyfile(src, dst)
+    if preserve_meta:
+        shutil.copystat(src, dst)
+
+
+def copy_file(src: str, dst: str, overwrite: bool = False, preserve_meta: bool = True,
+              quiet: bool = False) -> bool:
     """
     复制文件
     
@@ -75,22 +216,25 @@ def copy_file(src: str, dst: str, overwrite: bool = False) -> bool:
         src: 源文件路径
         dst: 目标文件路径
         overwrite: 是否覆盖已存在的文件
+        preserve_meta: 是否同时复制权限与时间戳等元数据
+        quiet: 成功时不记录日志（批量操作时由调用方汇总记录）
         
     Returns:
         是否成功
     """
     try:
-        if os.path.exists(dst) and not overwrite:
+        if not overwrite and os.path.exists(dst):
             logger.warning(f"目标文件已存在: {dst}")
             return False
         
-        # 确保目标目录存在
+        # 确保目标目录存在（目录通常已存在，一次 stat 即可确认）
         dst_dir = os.path.dirname(dst)
-        if dst_dir:
+        if dst_dir and not os.path.isdir(dst_dir):
             ensure_dir(dst_dir)
         
-        shutil.copy2(src, dst)
-        logger.info(f"文件复制成功: {src} -> {dst}")
+        clone_file(src, dst, preserve_meta)
+        if not quiet:
+            logger.info(f"文件复制成功: {src} -> {dst}")
         return True
         
     except Exception as e:
@@ -98,7 +242,7 @@ def copy_file(src: str, dst: str, overwrite: bool = False) -> bool:
         return False
 
 
-def move_file(src: str, dst: str, overwrite: bool = False) -> bool:
+def move_file(src: str, dst: str, overwrite: bool = False, quiet: bool = False) -> bool:
     """
     移动文件
     
@@ -106,22 +250,24 @@ def move_file(src: str, dst: str, overwrite: bool = False) -> bool:
         src: 源文件路径
         dst: 目标文件路径
         overwrite: 是否覆盖已存在的文件
+        quiet: 成功时不记录日志（批量操作时由调用方汇总记录）
         
     Returns:
         是否成功
     """
     try:
-        if os.path.exists(dst) and not overwrite:
+        if not overwrite and os.path.exists(dst):
             logger.warning(f"目标文件已存在: {dst}")
             return False
         
-        # 确保目标目录存在
+        # 确保目标目录存在（目录通常已存在，一次 stat 即可确认）
         dst_dir = os.path.dirname(dst)
-        if dst_dir:
+        if dst_dir and not os.path.isdir(dst_dir):
             ensure_dir(dst_dir)
         
         shutil.move(src, dst)
-        logger.info(f"文件移动成功: {src} -> {dst}")
+        if not quiet:
+            logger.info(f"文件移动成功: {src} -> {dst}")
         return True
         
     except Exception as e:
@@ -129,25 +275,26 @@ def move_file(src: str, dst: str, overwrite: bool = False) -> bool:
         return False
 
 
-def delete_file(file_path: str) -> bool:
+def delete_file(file_path: str, quiet: bool = False) -> bool:
     """
     删除文件
     
     Args:
         file_path: 文件路径
+        quiet: 成功时不记录日志（批量操作时由调用方汇总记录）
         
     Returns:
         是否成功
     """
     try:
-        if os.path.exists(file_path):
-            os.remove(file_path)
+        os.remove(file_path)
+        if not quiet:
             logger.info(f"文件删除成功: {file_path}")
-            return True
-        else:
-            logger.warning(f"文件不存在: {file_path}")
-            return False
-            
+        return True
+        
+    except FileNotFoundError:
+        logger.warning(f"文件不存在: {file_path}")
+        return False
     except Exception as e:
         logger.error(f"文件删除失败: {str(e)}")
         return False
@@ -163,7 +310,7 @@ def get_file_extension(file_path: str) -> str:
     Returns:
         扩展名（不含点）
     """
-    return Path(file_path).suffix.lstrip('.')
+    return os.path.splitext(file_path)[1][1:]
 
 
 def change_file_extension(file_path: str, new_ext: str) -> str:
@@ -177,8 +324,7 @@ def change_file_extension(file_path: str, new_ext: str) -> str:
     Returns:
         新文件路径
     """
-    path = Path(file_path)
-    return str(path.with_suffix(f".{new_ext.lstrip('.')}"))
+    return f"{os.path.splitext(file_path)[0]}.{new_ext.lstrip('.')}"
 
 
 def list_files(directory: str, 
@@ -197,12 +343,33 @@ def list_files(directory: str,
     """
     dir_path = Path(directory)
     
-    if recursive:
-        files = list(dir_path.rglob(pattern))
+    # 带路径的模式交给 glob 处理
+    if '/' in pattern or os.sep in pattern:
+        files = dir_path.rglob(pattern) if recursive else dir_path.glob(pattern)
+        return [str(f) for f in files if f.is_file()]
+    
+    # 模式只编译一次；"*" 匹配所有文件，不需要逐个匹配
+    if pattern == '*':
+        match = None
     else:
-        files = list(dir_path.glob(pattern))
+        match = re.compile(fnmatch.translate(os.path.normcase(pattern))).match
     
-    return [str(f) for f in files if f.is_file()]
+    # scandir 的目录项自带文件类型，不必逐个 stat
+    result = []
+    pending = [str(dir_path)]
+    while pending:
+        try:
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    if entry.is_file():
+                        if match is None or match(os.path.normcase(entry.name)):
+                            result.append(entry.path)
+                    elif recursive and entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+        except OSError:
+            continue
+    
+    return result
 
 
 def get_temp_file(prefix: str = "temp", suffix: str = "") -> str:
@@ -230,20 +397,72 @@ def clean_directory(directory: str, keep_dir: bool = True):
         directory: 目录路径
         keep_dir: 是否保留目录本身
     """
-    dir_path = Path(directory)
-    
-    if not dir_path.exists():
+    try:
+        if not keep_dir:
+            # 删除整个目录
+            shutil.rmtree(directory)
+        else:
+            # 只删除内容（目录项自带文件类型，不必逐个 stat；指向目录的符号链接只删除链接本身）
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            shutil.rmtree(entry.path)
+                        else:
+                            os.unlink(entry.path)
+                    except FileNotFoundError:
+                        # 清理过程中被其他地方删除的条目，继续处理其余条目
+                        continue
+    except FileNotFoundError:
+        # 目录本身不存在
         return
     
-    if keep_dir:
-        # 只删除内容
-        for item in dir_path.iterdir():
-            if item.is_file():
-                item.unlink()
-            elif item.is_dir():
-                shutil.rmtree(item)
-    else:
-        # 删除整个目录
-        shutil.rmtree(dir_path)
-    
     logger.info(f"目录清空完成: {directory}")
+
+
+def _json_default(obj):
+    """JSON 兜底序列化：数据模型转换为字典，NumPy 标量/数组转换为 Python 值"""
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return asdict(obj)
+    if hasattr(obj, 'dtype') and hasattr(obj, 'tolist'):
+        return obj.tolist()
+    raise TypeError(f"无法序列化的类型: {type(obj).__name__}")
+
+
+def write_json(file_path: str, data) -> None:
+    """
+    以紧凑格式写入 JSON 文件（安装了 orjson 时使用 orjson 序列化）
+    
+    数据模型（dataclass）可以直接写入，无需先调用 to_dict
+    
+    Args:
+        file_path: 文件路径
+        data: 要写入的数据
+    """
+    try:
+        import orjson
+        content = orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY, default=_json_default)
+    except ImportError:
+        content = json.dumps(
+            data, ensure_ascii=False, separators=(',', ':'), default=_json_default
+        ).encode('utf-8')
+    
+    Path(file_path).write_bytes(content)
+
+
+def read_json(file_path: str):
+    """
+    读取 JSON 文件（安装了 orjson 时使用 orjson 解析）
+    
+    Args:
+        file_path: 文件路径
+        
+    Returns:
+        解析后的数据
+    """
+    content = Path(file_path).read_bytes()
+    try:
+        import orjson
+        return orjson.loads(content)
+    except ImportError:
+        return json.loads(content)
@@ -3,7 +3,31 @@
 """
 
 from datetime import datetime, timedelta
-from typing import Union
+from typing import Optional, Union
+
+# 文件大小单位
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
+
+
+def _format_verbose(hours: int, minutes: int, secs: int) -> str:
+    """格式化为 "X小时X分钟X秒"，省略为 0 的部分"""
+    parts = []
+    if hours > 0:
+        parts.append(f"{hours}小时")
+    if minutes > 0:
+        parts.append(f"{minutes}分钟")
+    if secs > 0 or not parts:
+        parts.append(f"{secs}秒")
+    
+    return "".join(parts)
+
+
+# 时间格式 -> 格式化函数（参数为时、分、秒）
+_TIME_FORMATTERS = {
+    "HH:MM:SS": lambda h, m, s: f"{h:02d}:{m:02d}:{s:02d}",
+    "MM:SS": lambda h, m, s: f"{h * 60 + m:02d}:{s:02d}",
+    "verbose": _format_verbose,
+}
 
 
 def format_time(seconds: float, format: str = "HH:MM:SS") -> str:
@@ -17,34 +41,13 @@ def format_time(seconds: float, format: str = "HH:MM:SS") -> str:
     Returns:
         格式化的时间字符串
     """
-    if format == "HH:MM:SS":
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = int(seconds % 60)
-        return f"{hours:02d}:{minutes:02d}:{secs:02d}"
-    
-    elif format == "MM:SS":
-        minutes = int(seconds // 60)
-        secs = int(seconds % 60)
-        return f"{minutes:02d}:{secs:02d}"
-    
-    elif format == "verbose":
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = int(seconds % 60)
-        
-        parts = []
-        if hours > 0:
-            parts.append(f"{hours}小时")
-        if minutes > 0:
-            parts.append(f"{minutes}分钟")
-        if secs > 0 or not parts:
-            parts.append(f"{secs}秒")
-        
-        return "".join(parts)
-    
-    else:
+    formatter = _TIME_FORMATTERS.get(format)
+    if formatter is None:
         raise ValueError(f"不支持的格式: {format}")
+    
+    hours, rem = divmod(int(seconds // 1), 3600)
+    minutes, secs = divmod(rem, 60)
+    return formatter(hours, minutes, secs)
 
 
 def format_size(bytes: int, precision: int = 2) -> str:
@@ -58,16 +61,13 @@ def format_size(bytes: int, precision: int = 2) -> str:
     Returns:
         格式化的大小字符串
     """
-    units = ['B', 'KB', 'MB', 'GB', 'TB', 'PB']
-    
-    size = float(bytes)
+    # 每个单位相差 2^10，由二进制位数直接得到单位
     unit_index = 0
+    if bytes >= 1024:
+        unit_index = min((int(bytes).bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+    size = bytes / (1 << (unit_index * 10))
     
-    while size >= 1024 and unit_index < len(units) - 1:
-        size /= 1024
-        unit_index += 1
-    
-    return f"{size:.{precision}f} {units[unit_index]}"
+    return f"{size:.{precision}f} {_SIZE_UNITS[unit_index]}"
 
 
 def format_number(number: Union[int, float], 
@@ -84,13 +84,20 @@ def format_number(number: Union[int, float],
     Returns:
         格式化的数字字符串
     """
+    # 不需要分隔符时直接不分组
+    grouping = "," if thousand_sep else ""
+    
     if isinstance(number, int):
         # 整数
-        return f"{number:,}".replace(",", thousand_sep)
+        formatted = f"{number:{grouping}d}"
     else:
         # 浮点数
-        formatted = f"{number:,.{precision}f}"
-        return formatted.replace(",", thousand_sep)
+        formatted = f"{number:{grouping}.{precision}f}"
+    
+    # 默认分隔符就是逗号，无需替换
+    if thousand_sep == "," or not thousand_sep:
+        return formatted
+    return formatted.replace(",", thousand_sep)
 
 
 def format_datetime(dt: datetime, format: str = "%Y-%m-%d %H:%M:%S") -> str:
@@ -169,15 +176,35 @@ def parse_time(time_str: str) -> float:
     Returns:
         秒数
     """
-    parts = time_str.split(':')
+    colons = time_str.count(':')
+    first = time_str.find(':')
     
-    if len(parts) == 3:
+    if colons == 2:
         # HH:MM:SS
-        hours, minutes, seconds = map(int, parts)
-        return hours * 3600 + minutes * 60 + seconds
-    elif len(parts) == 2:
+        second = time_str.find(':', first + 1)
+        return (int(time_str[:first]) * 3600 + int(time_str[first + 1:second]) * 60
+                + int(time_str[second + 1:]))
+    elif colons == 1:
         # MM:SS
-        minutes, seconds = map(int, parts)
-        return minutes * 60 + seconds
+        return int(time_str[:first]) * 60 + int(time_str[first + 1:])
     else:
         raise ValueError(f"无效的时间格式: {time_str}")
+
+
+def parse_frame_rate(rate: str) -> Optional[float]:
+    """
+    解析 ffprobe 的帧率字符串
+    
+    Args:
+        rate: 帧率字符串（如 "30000/1001"、"25"）
+        
+    Returns:
+        帧率，格式无效或分母为 0（如 "0/0"）时返回None
+    """
+    num, _, den = rate.partition('/')
+    try:
+        num = float(num)
+        den = float(den) if den else 1.0
+    except ValueError:
+        return None
+    return num / den if den else None
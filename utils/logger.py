@@ -14,26 +14,37 @@ def setup_logger():
     # 移除默认处理器
     logger.remove()
     
-    # 控制台输出
+    # 调试模式下异常日志附带完整调用栈与变量值，正常运行时省去这部分开销
+    debug = getattr(config, 'DEBUG', False)
+    
+    # 控制台输出（enqueue：由后台线程写出，调用方只需入队）
     logger.add(
         sys.stderr,
         format=config.LOG_FORMAT,
         level=config.LOG_LEVEL,
-        colorize=True
+        colorize=True,
+        enqueue=True,
+        backtrace=debug,
+        diagnose=debug
     )
     
-    # 文件输出
+    # 文件输出（轮转与压缩也在后台线程中进行）
     log_dir = Path(config.LOG_DIR)
     log_dir.mkdir(parents=True, exist_ok=True)
     
+    # LOG_SERIALIZE 开启时文件日志按行写入 JSON 记录，便于工具处理
     logger.add(
         config.LOG_FILE,
         format=config.LOG_FORMAT,
+        serialize=getattr(config, 'LOG_SERIALIZE', False),
         level=config.LOG_LEVEL,
         rotation=f"{config.LOG_MAX_SIZE} MB",
         retention=config.LOG_BACKUP_COUNT,
         compression="zip",
-        encoding="utf-8"
+        encoding="utf-8",
+        enqueue=True,
+        backtrace=debug,
+        diagnose=debug
     )
     
     logger.info("日志系统初始化完成")